@@ -1,21 +1,39 @@
 import argparse
+import sys
 
 from ...src.backup_reinit import generate_backup_archive
+from ...src.backup_snapshots import generate_incremental_backup
+from ...src.instrumentation import add_trace_arguments, trace_command
 
 
 def main(
     local_terraform_user_config_dir_path: str,
     terraform_modules_dir: str,
-) -> None:
+    incremental: bool = False,
+    max_workers: int = 8,
+) -> bool:
     """Generates instantaneous project configurations backup .zip archive and uploads
     it to the AWS Organization's Management account's purpose-made S3 bucket.
 
     Args:
         local_terraform_user_config_dir_path (str): Path to the user configs directory.
         terraform_modules_dir (str): Path to the terraform modules directory.
+        incremental (bool, default=False): Upload an incremental, content-addressed
+            snapshot instead of a full .zip archive
+        max_workers (int, default=8): Maximum number of concurrent hashes/uploads
+            for incremental snapshots
+
+    Returns:
+        (bool): True if the backup was uploaded successfully
     """
+    if incremental:
+        return generate_incremental_backup(
+            config_dir_path=local_terraform_user_config_dir_path,
+            tf_modules_dir=terraform_modules_dir,
+            max_workers=max_workers,
+        )
 
-    generate_backup_archive(
+    return generate_backup_archive(
         config_dir_path=local_terraform_user_config_dir_path,
         tf_modules_dir=terraform_modules_dir,
     )
@@ -33,9 +51,26 @@ if __name__ == "__main__":
         "terraform_modules_dir",
         help="Path to Terraform modules directory",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Upload an incremental, content-addressed snapshot",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent hashes/uploads (incremental only)",
+    )
+
+    add_trace_arguments(parser)
 
     args = parser.parse_args()
-    main(
-        args.local_terraform_user_config_dir_path,
-        args.terraform_modules_dir,
-    )
+    with trace_command("configs_backup", args.trace, args.profile):
+        ok = main(
+            args.local_terraform_user_config_dir_path,
+            args.terraform_modules_dir,
+            incremental=args.incremental,
+            max_workers=args.workers,
+        )
+    sys.exit(0 if ok else 1)
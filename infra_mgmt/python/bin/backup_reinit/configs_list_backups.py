@@ -0,0 +1,91 @@
+import argparse
+from typing import Optional
+
+from ...src.backup_index import (
+    find_backup,
+    read_backup_index,
+    rebuild_backup_index,
+)
+from ...src.backup_reinit import get_backup_s3_client
+from ...src.instrumentation import add_trace_arguments, trace_command
+from ...src.terraform.config import load_terraform_user_config
+
+
+def main(
+    local_terraform_user_config_dir_path: str,
+    terraform_modules_dir: str,
+    timestamp: Optional[str] = None,
+    rebuild_index: bool = False,
+) -> None:
+    """Lists the project configurations backups in the AWS Organization's Management
+    account's purpose-made S3 bucket, from the bucket's backup index.
+
+    Args:
+        local_terraform_user_config_dir_path (str): Path to the user configs directory.
+        terraform_modules_dir (str): Path to the terraform modules directory.
+        timestamp (str, optional): Only show the most recent backup of each kind
+            taken at or before this timestamp
+        rebuild_index (bool, default=False): Rebuild the backup index from a full
+            listing of the bucket first
+    """
+    tuc = load_terraform_user_config(
+        config_dir_path=local_terraform_user_config_dir_path,
+        tf_modules_dir=terraform_modules_dir,
+    )
+    bucket_name = tuc.header.backup.bucket_name
+    s3_client = get_backup_s3_client(tuc)
+
+    if rebuild_index:
+        index = rebuild_backup_index(s3_client, bucket_name)
+    else:
+        index = read_backup_index(s3_client, bucket_name)
+
+    entries = index.entries
+    if timestamp is not None:
+        entries = [
+            x
+            for x in [
+                find_backup(index, timestamp, kind) for kind in ["archive", "snapshot"]
+            ]
+            if x is not None
+        ]
+    if not entries:
+        print(f"No backups found in `{bucket_name}`.")
+        return
+    for entry in entries:
+        print(f"{entry.timestamp}  {entry.kind:<8}  {entry.size:>12}  {entry.key}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Lists project configurations backups."
+    )
+    parser.add_argument(
+        "local_terraform_user_config_dir_path",
+        help="Path to Terraform user configuration directory",
+    )
+    parser.add_argument(
+        "terraform_modules_dir",
+        help="Path to Terraform modules directory",
+    )
+    parser.add_argument(
+        "--at",
+        default=None,
+        help="Only show the latest backups taken at or before this timestamp",
+    )
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Rebuild the backup index from a full listing of the bucket",
+    )
+
+    add_trace_arguments(parser)
+
+    args = parser.parse_args()
+    with trace_command("configs_list_backups", args.trace, args.profile):
+        main(
+            args.local_terraform_user_config_dir_path,
+            args.terraform_modules_dir,
+            timestamp=args.at,
+            rebuild_index=args.rebuild_index,
+        )
@@ -1,15 +1,49 @@
+import argparse
+
 from ...src.backup_reinit import purge_configs
+from ...src.instrumentation import add_trace_arguments, trace_command
 
 
-def main() -> None:
+def main(dry_run: bool = False, fast: bool = False, max_workers: int = 8) -> None:
     """Purges instantaneous project configurations.
 
     Removes all existing configurations for a current project, in order to clean out
     directories so to work on a different project.
+
+    Args:
+        dry_run (bool, default=False): Only report what would be removed
+        fast (bool, default=False): Rename folders aside and remove them in the
+            background, returning immediately
+        max_workers (int, default=8): Maximum number of paths scanned/removed
+            concurrently
     """
 
-    purge_configs()
+    purge_configs(dry_run=dry_run, fast=fast, max_workers=max_workers)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="Purges instantaneous project configurations."
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report the files and bytes that would be removed",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Rename folders aside and remove them in the background",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Maximum number of paths scanned/removed concurrently",
+    )
+
+    add_trace_arguments(parser)
+
+    args = parser.parse_args()
+    with trace_command("configs_purge", args.trace, args.profile):
+        main(dry_run=args.dry_run, fast=args.fast, max_workers=args.workers)
@@ -0,0 +1,112 @@
+import argparse
+import sys
+from typing import Optional
+
+from ...src.backup_reinit import BACKUP_CATEGORIES, reinit_project_configs
+from ...src.backup_snapshots import reinit_project_configs_from_snapshot
+from ...src.instrumentation import add_trace_arguments, trace_command
+
+
+def main(
+    local_terraform_user_config_dir_path: str,
+    timestamp: Optional[str] = None,
+    snapshot: bool = False,
+    max_workers: int = 8,
+    account: Optional[str] = None,
+    category: Optional[str] = None,
+    member_path: Optional[str] = None,
+) -> bool:
+    """Pulls backup configs for project and puts them back in their configuration
+    "places".
+
+    Args:
+        local_terraform_user_config_dir_path (str): Path to the user configs
+            directory, holding the `reinit.yaml` config.
+        timestamp (str, optional): Restore the most recent backup taken at or before
+            this timestamp, defaults to the latest backup
+        snapshot (bool, default=False): Restore an incremental snapshot instead of a
+            full .zip archive
+        max_workers (int, default=8): Maximum number of concurrent downloads
+        account (str, optional): Only restore contents belonging to this account
+        category (str, optional): Only restore contents of this category
+        member_path (str, optional): Only restore this backed-up path, or the paths
+            under this folder
+
+    Returns:
+        (bool): True if the backup was restored successfully
+    """
+    if snapshot:
+        return reinit_project_configs_from_snapshot(
+            config_dir_path=local_terraform_user_config_dir_path,
+            timestamp=timestamp,
+            max_workers=max_workers,
+            account=account,
+            category=category,
+            member_path=member_path,
+        )
+    return reinit_project_configs(
+        config_dir_path=local_terraform_user_config_dir_path,
+        timestamp=timestamp,
+        max_workers=max_workers,
+        account=account,
+        category=category,
+        member_path=member_path,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Restores project configurations from a backup."
+    )
+    parser.add_argument(
+        "local_terraform_user_config_dir_path",
+        help="Path to Terraform user configuration directory",
+    )
+    parser.add_argument(
+        "--at",
+        default=None,
+        help="Restore the latest backup taken at or before this timestamp",
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Restore an incremental snapshot instead of a full .zip archive",
+    )
+    parser.add_argument(
+        "--account",
+        default=None,
+        help="Only restore contents belonging to this account",
+    )
+    parser.add_argument(
+        "--category",
+        choices=sorted(set(BACKUP_CATEGORIES.values())),
+        default=None,
+        help="Only restore contents of this category",
+    )
+    parser.add_argument(
+        "--path",
+        default=None,
+        help="Only restore this backed-up path (e.g., `.config`), relative to the "
+        "backup's root",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent downloads",
+    )
+
+    add_trace_arguments(parser)
+
+    args = parser.parse_args()
+    with trace_command("configs_reinit", args.trace, args.profile):
+        ok = main(
+            args.local_terraform_user_config_dir_path,
+            timestamp=args.at,
+            snapshot=args.snapshot,
+            max_workers=args.workers,
+            account=args.account,
+            category=args.category,
+            member_path=args.path,
+        )
+    sys.exit(0 if ok else 1)
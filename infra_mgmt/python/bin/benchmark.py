@@ -0,0 +1,90 @@
+import argparse
+import sys
+from typing import List, Optional
+
+from ..src.benchmark import RESULTS_PATH, SCALES, run_benchmarks
+
+
+def main(
+    scales: List[str],
+    repeats: int = 3,
+    results_path: str = RESULTS_PATH,
+    work_dir: Optional[str] = None,
+    record: bool = True,
+    fail_on_regression: bool = False,
+) -> bool:
+    """Benchmarks user config loading and Terraform config generation against
+    synthetic organizations, printing and recording the results.
+
+    Args:
+        scales (List[str]): Names of the synthetic organization scales to run
+        repeats (int, default=3): Number of timed repetitions per case
+        results_path (str, optional): Path to results JSON-lines file
+        work_dir (str, optional): Directory fixtures are generated in and kept,
+            defaults to a temporary directory removed afterwards
+        record (bool, default=True): Append the results to the results file
+        fail_on_regression (bool, default=False): Fail if any case regressed against
+            the last recorded results
+
+    Returns:
+        (bool): False if failing on regressions and any were found
+    """
+    regressions = run_benchmarks(
+        scale_names=scales,
+        repeats=repeats,
+        results_path=results_path,
+        work_dir=work_dir,
+        record=record,
+    )
+    return not (fail_on_regression and regressions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks user config loading and Terraform config generation "
+        "against synthetic organizations."
+    )
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        choices=list(SCALES),
+        default=list(SCALES),
+        help="Synthetic organization scales to run",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=3,
+        help="Number of timed repetitions per case",
+    )
+    parser.add_argument(
+        "--results",
+        default=RESULTS_PATH,
+        help="JSON-lines file results are appended to and compared against",
+    )
+    parser.add_argument(
+        "--work-dir",
+        default=None,
+        help="Generate (and keep) fixtures in this directory",
+    )
+    parser.add_argument(
+        "--no-record",
+        action="store_true",
+        help="Do not append the results to the results file",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit non-zero if any case regressed against the last recorded results",
+    )
+
+    args = parser.parse_args()
+    ok = main(
+        args.scales,
+        repeats=args.repeats,
+        results_path=args.results,
+        work_dir=args.work_dir,
+        record=not args.no_record,
+        fail_on_regression=args.fail_on_regression,
+    )
+    sys.exit(0 if ok else 1)
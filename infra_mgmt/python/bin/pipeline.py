@@ -0,0 +1,115 @@
+import argparse
+import sys
+from typing import List, Optional
+
+from ..src.instrumentation import add_trace_arguments, trace_command
+from ..src.pipeline import (
+    STAGE_NAMES,
+    build_bootstrap_stages,
+    format_pipeline_summary,
+    get_pipeline_paths,
+    get_pipeline_state_path,
+    run_pipeline,
+)
+
+
+def main(
+    local_terraform_user_config_dir_path: str,
+    terraform_dir: str,
+    package_build_dir: str,
+    stages: Optional[List[str]] = None,
+    force: bool = False,
+    dry_run: bool = False,
+    confirm: bool = True,
+    max_workers: int = 4,
+) -> bool:
+    """Runs the bootstrap pipeline, skipping stages whose inputs are unchanged, and
+    prints a summary table.
+
+    Args:
+        local_terraform_user_config_dir_path (str): Path to Terraform user
+            configuration directory.
+        terraform_dir (str): Path to the Terraform directory
+        package_build_dir (str): Path to directory where packages are built
+        stages (List[str], optional): Stages to run, along with every stage they
+            depend on, defaults to every stage
+        force (bool, default=False): Run stages even if their inputs are unchanged
+        dry_run (bool, default=False): Only report which stages are stale
+        confirm (bool, default=True): Ask for confirmation of the org and CICD plans
+        max_workers (int, default=4): Maximum number of accounts processed
+            concurrently
+
+    Returns:
+        (bool): True if no stage failed
+    """
+    paths = get_pipeline_paths(
+        local_terraform_user_config_dir_path, terraform_dir, package_build_dir
+    )
+    results = run_pipeline(
+        stages=build_bootstrap_stages(paths, max_workers=max_workers, confirm=confirm),
+        state_path=get_pipeline_state_path(terraform_dir),
+        targets=stages,
+        force=force,
+        dry_run=dry_run,
+    )
+    print("\n" + format_pipeline_summary(results))
+    return all(x.status not in ["failed", "blocked"] for x in results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Runs the bootstrap pipeline, skipping stages whose inputs are "
+        "unchanged and running independent stages concurrently."
+    )
+    parser.add_argument(
+        "local_terraform_user_config_dir_path",
+        help="Path to Terraform user configuration directory",
+    )
+    parser.add_argument("terraform_dir", help="Path to the Terraform directory")
+    parser.add_argument(
+        "package_build_dir", help="Path to directory where packages are built"
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGE_NAMES,
+        default=None,
+        help="Only run these stages (and the stages they depend on)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run stages even if their inputs are unchanged",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report which stages are stale",
+    )
+    parser.add_argument(
+        "--yes",
+        action="store_true",
+        help="Apply the org and CICD plans without asking for confirmation",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Maximum number of accounts processed concurrently",
+    )
+
+    add_trace_arguments(parser)
+
+    args = parser.parse_args()
+    with trace_command("pipeline", args.trace, args.profile):
+        ok = main(
+            args.local_terraform_user_config_dir_path,
+            args.terraform_dir,
+            args.package_build_dir,
+            stages=args.stages,
+            force=args.force,
+            dry_run=args.dry_run,
+            confirm=not args.yes,
+            max_workers=args.workers,
+        )
+    sys.exit(0 if ok else 1)
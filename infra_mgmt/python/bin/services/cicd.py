@@ -1,5 +1,6 @@
 import argparse
 
+from ...src.instrumentation import add_trace_arguments, trace_command
 from ...src.services.python_package.config import apply_all_cicd_services
 
 
@@ -8,12 +9,16 @@ def main(
     terraform_modules_dir: str,
     account_tf_output_dir: str,
     package_build_dir: str,
+    consolidated: bool = False,
+    max_workers: int = 4,
 ):
     apply_all_cicd_services(
         config_dir_path=local_terraform_user_config_dir_path,
         tf_modules_dir=terraform_modules_dir,
         acc_tf_output_dir=account_tf_output_dir,
         package_build_dir=package_build_dir,
+        consolidated=consolidated,
+        max_workers=max_workers,
     )
 
 
@@ -36,11 +41,28 @@ if __name__ == "__main__":
     parser.add_argument(
         "package_build_dir", help="Path to directory where packages are built"
     )
+    parser.add_argument(
+        "--consolidated",
+        action="store_true",
+        help="Discover all accounts in parallel, confirm one consolidated plan and "
+        "apply accounts concurrently",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Maximum number of accounts processed concurrently (--consolidated)",
+    )
+
+    add_trace_arguments(parser)
 
     args = parser.parse_args()
-    main(
-        args.local_terraform_user_config_dir_path,
-        args.terraform_modules_dir,
-        args.account_tf_output_dir,
-        args.package_build_dir,
-    )
+    with trace_command("cicd", args.trace, args.profile):
+        main(
+            args.local_terraform_user_config_dir_path,
+            args.terraform_modules_dir,
+            args.account_tf_output_dir,
+            args.package_build_dir,
+            consolidated=args.consolidated,
+            max_workers=args.workers,
+        )
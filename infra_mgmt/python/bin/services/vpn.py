@@ -0,0 +1,129 @@
+import argparse
+import sys
+from typing import List, Optional
+
+from ...src.instrumentation import add_trace_arguments, trace_command
+from ...src.services.vpn.config import format_vpn_results, generate_vpn_profiles
+
+
+def main(
+    local_terraform_user_config_dir_path: str,
+    terraform_modules_dir: str,
+    account_tf_output_dir: str,
+    certs_dir: str,
+    output_dir: str,
+    accounts: Optional[List[str]] = None,
+    profile: Optional[str] = None,
+    region: Optional[str] = None,
+    max_workers: int = 8,
+    force: bool = False,
+) -> bool:
+    """Generates the client VPN profile of every user with VPN access and a client
+    certificate, rewriting only profiles whose inputs changed and removing those of
+    users who lost access.
+
+    Args:
+        local_terraform_user_config_dir_path (str): Path to Terraform user
+            configuration directory.
+        terraform_modules_dir (str): Path to Terraform modules directory
+        account_tf_output_dir (str): Path to accounts Terraform output directory
+        certs_dir (str): Path to the `.client_vpn_configs` directory
+        output_dir (str): Path to directory profiles are written to
+        accounts (List[str], optional): Only generate these accounts' profiles
+        profile (str, optional): AWS profile role assumption into accounts starts
+            from, defaults to the `org_main` profile in header.yaml
+        region (str, optional): AWS region of the endpoints, defaults to the
+            `org_main` region in header.yaml
+        max_workers (int, default=8): Maximum number of concurrent exports/profiles
+        force (bool, default=False): Rewrite every profile, ignoring the manifests
+
+    Returns:
+        (bool): True if every account's profiles were generated
+    """
+    results = generate_vpn_profiles(
+        config_dir_path=local_terraform_user_config_dir_path,
+        tf_modules_dir=terraform_modules_dir,
+        acc_tf_output_dir=account_tf_output_dir,
+        certs_dir=certs_dir,
+        output_dir=output_dir,
+        accounts=accounts,
+        profile=profile,
+        region=region,
+        max_workers=max_workers,
+        force=force,
+    )
+    print("\n" + format_vpn_results(results, output_dir))
+    return all(x.error is None and not x.failed for x in results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generates the client VPN profile of every user with VPN access "
+        "and a client certificate, rewriting only profiles whose inputs changed."
+    )
+    parser.add_argument(
+        "local_terraform_user_config_dir_path",
+        help="Path to Terraform user configuration directory",
+    )
+    parser.add_argument(
+        "terraform_modules_dir",
+        help="Path to Terraform modules directory",
+    )
+    parser.add_argument(
+        "account_tf_output_dir",
+        help="Path to Terraform output directory",
+    )
+    parser.add_argument(
+        "certs_dir",
+        help="Path to the client VPN certificates (.client_vpn_configs) directory",
+    )
+    parser.add_argument(
+        "output_dir",
+        help="Path to directory VPN profiles are written to",
+    )
+    parser.add_argument(
+        "--accounts",
+        nargs="+",
+        default=None,
+        help="Only generate these accounts' profiles",
+    )
+    parser.add_argument(
+        "--aws-profile",
+        default=None,
+        help="AWS profile to assume account roles from (default: header.yaml "
+        "org_main profile)",
+    )
+    parser.add_argument(
+        "--aws-region",
+        default=None,
+        help="AWS region of the VPN endpoints (default: header.yaml org_main region)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent exports/profiles",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rewrite every profile, even if its inputs are unchanged",
+    )
+
+    add_trace_arguments(parser)
+
+    args = parser.parse_args()
+    with trace_command("vpn", args.trace, args.profile):
+        ok = main(
+            args.local_terraform_user_config_dir_path,
+            args.terraform_modules_dir,
+            args.account_tf_output_dir,
+            args.certs_dir,
+            args.output_dir,
+            accounts=args.accounts,
+            profile=args.aws_profile,
+            region=args.aws_region,
+            max_workers=args.workers,
+            force=args.force,
+        )
+    sys.exit(0 if ok else 1)
@@ -1,5 +1,7 @@
 import argparse
+from typing import Optional
 
+from ...src.instrumentation import add_trace_arguments, trace_command
 from ...src.terraform.config import generate_individual_terraform_account_modules
 
 
@@ -8,7 +10,8 @@ def main(
     terraform_modules_dir: str,
     org_output_path: str,
     accounts_tf_build_dir: str,
-    iam_inputs_path: str,
+    force: bool = False,
+    plugin_cache_dir: Optional[str] = None,
 ) -> None:
     """Generates an terraform module for individual organization accounts.
 
@@ -18,15 +21,17 @@ def main(
         terraform_modules_dir (str): Path to Terraform module directory
         org_output_path (str): Path to Terraform org_output.json file.
         accounts_tf_build_dir (str): Path to Terraform build accounts directory
-        iam_inputs_path (str): JSON file generated by the `generate_initial_iam_inputs`
-            method
+        force (bool, default=False): Re-render every account, ignoring the manifest
+        plugin_cache_dir (str, optional): Path to the Terraform plugin cache
+            directory shared by every account root module
     """
     generate_individual_terraform_account_modules(
         config_dir_path=local_terraform_user_config_dir_path,
         tf_modules_dir=terraform_modules_dir,
         org_output_path=org_output_path,
         accounts_tf_build_dir=accounts_tf_build_dir,
-        iam_inputs_path=iam_inputs_path,
+        force=force,
+        plugin_cache_dir=plugin_cache_dir,
     )
 
 
@@ -51,15 +56,25 @@ if __name__ == "__main__":
         help="Path to Terraform build accounts directory",
     )
     parser.add_argument(
-        "iam_inputs_path",
-        help="JSON file generated by the `generate_initial_iam_inputs` method",
+        "--force",
+        action="store_true",
+        help="Re-render every account, ignoring the account modules manifest",
+    )
+    parser.add_argument(
+        "--plugin-cache-dir",
+        default=None,
+        help="Path to shared Terraform plugin cache directory",
     )
 
+    add_trace_arguments(parser)
+
     args = parser.parse_args()
-    main(
-        args.local_terraform_user_config_dir_path,
-        args.terraform_modules_dir,
-        args.org_output_path,
-        args.accounts_tf_build_dir,
-        args.iam_inputs_path,
-    )
+    with trace_command("accounts", args.trace, args.profile):
+        main(
+            args.local_terraform_user_config_dir_path,
+            args.terraform_modules_dir,
+            args.org_output_path,
+            args.accounts_tf_build_dir,
+            force=args.force,
+            plugin_cache_dir=args.plugin_cache_dir,
+        )
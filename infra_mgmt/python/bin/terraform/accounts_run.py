@@ -0,0 +1,129 @@
+import argparse
+import sys
+from typing import List, Optional
+
+from ...src.instrumentation import add_trace_arguments, trace_command
+from ...src.terraform.impact import read_account_list
+from ...src.terraform.runner import (
+    ACTIONS,
+    format_run_summary,
+    run_terraform_accounts,
+)
+
+
+def main(
+    action: str,
+    accounts_tf_build_dir: str,
+    logs_dir: str,
+    output_dir: Optional[str] = None,
+    backend_hcl: Optional[str] = None,
+    accounts: Optional[List[str]] = None,
+    max_workers: int = 4,
+    dirty_only: bool = False,
+    plugin_cache_dir: Optional[str] = None,
+) -> bool:
+    """Runs a Terraform action (init/reinit/plan/apply/output) across the individual
+    account root modules in parallel and prints a summary table.
+
+    Args:
+        action (str): Terraform action to run
+        accounts_tf_build_dir (str): Path to Terraform build accounts directory
+        logs_dir (str): Path to Terraform logs directory
+        output_dir (str, optional): Path to the accounts `.output` directory
+        backend_hcl (str, optional): Path to backend.hcl file
+        accounts (List[str], optional): Subset of accounts to run against
+        max_workers (int, default=4): Maximum number of concurrent Terraform runs
+        dirty_only (bool, default=False): Only run against accounts changed since
+            they were last applied
+        plugin_cache_dir (str, optional): Path to shared plugin cache directory
+
+    Returns:
+        (bool): True if every account succeeded
+    """
+    results = run_terraform_accounts(
+        action=action,
+        accounts_tf_build_dir=accounts_tf_build_dir,
+        logs_dir=logs_dir,
+        output_dir=output_dir,
+        backend_hcl=backend_hcl,
+        accounts=accounts,
+        max_workers=max_workers,
+        dirty_only=dirty_only,
+        plugin_cache_dir=plugin_cache_dir,
+    )
+    if not results:
+        print("No accounts to run against, nothing to do.")
+        return True
+    print("\n" + format_run_summary(results))
+    return all(x.success for x in results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Runs Terraform across individual account root modules in parallel."
+    )
+    parser.add_argument("action", choices=ACTIONS, help="Terraform action to run")
+    parser.add_argument(
+        "accounts_tf_build_dir",
+        help="Path to Terraform build accounts directory",
+    )
+    parser.add_argument("logs_dir", help="Path to Terraform logs directory")
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="Path to accounts output directory (default: <accounts dir>/.output)",
+    )
+    parser.add_argument(
+        "--backend-hcl",
+        default=None,
+        help="Path to backend.hcl file (required for init/reinit)",
+    )
+    accounts_group = parser.add_mutually_exclusive_group()
+    accounts_group.add_argument(
+        "--accounts",
+        nargs="+",
+        default=None,
+        help="Only run against these accounts",
+    )
+    accounts_group.add_argument(
+        "--accounts-file",
+        default=None,
+        help="Only run against the accounts listed in this file, one per line, e.g., "
+        "as written by `impact --output`",
+    )
+    parser.add_argument(
+        "--dirty-only",
+        action="store_true",
+        help="Only run against accounts changed since they were last applied",
+    )
+    parser.add_argument(
+        "--plugin-cache-dir",
+        default=None,
+        help="Path to shared Terraform plugin cache directory",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Maximum number of concurrent Terraform runs",
+    )
+
+    add_trace_arguments(parser)
+
+    args = parser.parse_args()
+    accounts = args.accounts
+    if args.accounts_file is not None:
+        accounts = read_account_list(args.accounts_file)
+    with trace_command("accounts_run", args.trace, args.profile):
+        ok = main(
+            args.action,
+            args.accounts_tf_build_dir,
+            args.logs_dir,
+            output_dir=args.output_dir,
+            backend_hcl=args.backend_hcl,
+            accounts=accounts,
+            max_workers=args.workers,
+            dirty_only=args.dirty_only,
+            plugin_cache_dir=args.plugin_cache_dir,
+        )
+    sys.exit(0 if ok else 1)
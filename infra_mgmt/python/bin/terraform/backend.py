@@ -1,15 +1,7 @@
 import argparse
-from os import path
 
-from jinja2 import Environment, FileSystemLoader
-
-from ...src.terraform.config import load_terraform_user_config
-
-CURR_DIR = path.dirname(path.abspath(__file__))
-TERRAFORM_DIR = path.dirname(path.abspath(CURR_DIR))
-PYTHON_DIR = path.dirname(path.abspath(TERRAFORM_DIR))
-SRC_DIR = path.join(PYTHON_DIR, "src")
-TEMPLATES_DIR = path.join(SRC_DIR, "templates", "terraform", "backend")
+from ...src.instrumentation import add_trace_arguments, trace_command
+from ...src.terraform.config import generate_backend_tfvars
 
 
 def main(
@@ -26,23 +18,12 @@ def main(
         terraform_modules_dir (str): Path to Terraform module directory
         backend_terraform_dir (str): Path to backend Terrform dir
     """
-    tuc = load_terraform_user_config(
+    generate_backend_tfvars(
         config_dir_path=local_terraform_user_config_dir_path,
         tf_modules_dir=terraform_modules_dir,
+        backend_tf_dir=backend_terraform_dir,
     )
 
-    environment = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
-    template = environment.get_template("backend_tfvars.txt")
-    content = template.render(
-        profile=tuc.header.aws_profiles.backend.profile,
-        region=tuc.header.aws_profiles.backend.region,
-        bucket_name=tuc.header.backend.bucket_name,
-        table_name=tuc.header.backend.dynamodb_table_name,
-    )
-    output_path = path.join(backend_terraform_dir, "terraform.tfvars")
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(content)
-
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -57,9 +38,12 @@ if __name__ == "__main__":
         help="Path to Terraform modules directory",
     )
     parser.add_argument("backend_terraform_dir", help="Path to backend Terraform dir")
+    add_trace_arguments(parser)
+
     args = parser.parse_args()
-    main(
-        args.local_terraform_user_config_dir_path,
-        args.terraform_modules_dir,
-        args.backend_terraform_dir,
-    )
+    with trace_command("backend", args.trace, args.profile):
+        main(
+            args.local_terraform_user_config_dir_path,
+            args.terraform_modules_dir,
+            args.backend_terraform_dir,
+        )
@@ -1,5 +1,6 @@
 import argparse
 
+from ...src.instrumentation import add_trace_arguments, trace_command
 from ...src.terraform.config import (
     generate_initial_iam_inputs,
     generate_terrafrom_initial_iam_configs,
@@ -72,12 +73,15 @@ if __name__ == "__main__":
         help="Path to iam Terraform (non-root) module",
     )
 
+    add_trace_arguments(parser)
+
     args = parser.parse_args()
-    main(
-        args.local_terraform_user_config_dir_path,
-        args.terraform_modules_dir,
-        args.org_json_path,
-        args.iam_json_path,
-        args.iam_terraform_dir,
-        args.iam_module_path,
-    )
+    with trace_command("iam", args.trace, args.profile):
+        main(
+            args.local_terraform_user_config_dir_path,
+            args.terraform_modules_dir,
+            args.org_json_path,
+            args.iam_json_path,
+            args.iam_terraform_dir,
+            args.iam_module_path,
+        )
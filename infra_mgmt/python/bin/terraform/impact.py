@@ -0,0 +1,71 @@
+import argparse
+from typing import Optional
+
+from ...src.instrumentation import add_trace_arguments, trace_command
+from ...src.terraform.impact import (
+    analyze_config_impact,
+    format_config_impact,
+    write_account_list,
+)
+
+
+def main(
+    local_terraform_user_config_dir_path: str,
+    terraform_modules_dir: str,
+    accounts_tf_build_dir: str,
+    output_path: Optional[str] = None,
+) -> None:
+    """Reports the accounts affected by user config changes since they were last
+    applied, optionally writing the account set for `accounts_run --accounts-file`.
+
+    Args:
+        local_terraform_user_config_dir_path (str): Path to Terraform user configuration
+            directory.
+        terraform_modules_dir (str): Path to Terraform module directory
+        accounts_tf_build_dir (str): Path to Terraform build accounts directory
+        output_path (str, optional): Path to file the affected account names are
+            written to, one per line
+    """
+    impact = analyze_config_impact(
+        config_dir_path=local_terraform_user_config_dir_path,
+        tf_modules_dir=terraform_modules_dir,
+        accounts_tf_build_dir=accounts_tf_build_dir,
+    )
+    print(format_config_impact(impact))
+    if output_path is not None:
+        write_account_list(output_path, list(impact.accounts))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Reports the accounts affected by user config changes since they "
+        "were last applied."
+    )
+    parser.add_argument(
+        "local_terraform_user_config_dir_path",
+        help="Path to Terraform user configuration directory",
+    )
+    parser.add_argument(
+        "terraform_modules_dir",
+        help="Path to Terraform modules directory",
+    )
+    parser.add_argument(
+        "accounts_tf_build_dir",
+        help="Path to Terraform build accounts directory",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Write the affected account names to this file, one per line",
+    )
+
+    add_trace_arguments(parser)
+
+    args = parser.parse_args()
+    with trace_command("impact", args.trace, args.profile):
+        main(
+            args.local_terraform_user_config_dir_path,
+            args.terraform_modules_dir,
+            args.accounts_tf_build_dir,
+            output_path=args.output,
+        )
@@ -1,5 +1,6 @@
 import argparse
 
+from ...src.instrumentation import add_trace_arguments, trace_command
 from ...src.terraform.config import generate_org_accounts_config
 
 
@@ -45,10 +46,13 @@ if __name__ == "__main__":
         "terraform_org_dir",
         help="Path to Terraform org directory",
     )
+    add_trace_arguments(parser)
+
     args = parser.parse_args()
-    main(
-        args.local_terraform_user_config_dir_path,
-        args.terraform_modules_dir,
-        args.org_json_path,
-        args.terraform_org_dir,
-    )
+    with trace_command("org_generate_accounts", args.trace, args.profile):
+        main(
+            args.local_terraform_user_config_dir_path,
+            args.terraform_modules_dir,
+            args.org_json_path,
+            args.terraform_org_dir,
+        )
@@ -0,0 +1,61 @@
+import argparse
+import sys
+
+from ...src.instrumentation import add_trace_arguments, trace_command
+from ...src.terraform.config import validate_user_config_files
+from ...src.terraform.validation import format_validation_report
+
+
+def main(
+    local_terraform_user_config_dir_path: str,
+    terraform_modules_dir: str,
+    strict: bool = False,
+) -> bool:
+    """Validates the user configuration files, reporting every violation found.
+
+    Args:
+        local_terraform_user_config_dir_path (str): Path to Terraform user configuration
+            directory.
+        terraform_modules_dir (str): Path to Terraform modules directory
+        strict (bool, default=False): Treat warnings as failures
+
+    Returns:
+        (bool): True if the user configuration is valid
+    """
+    report = validate_user_config_files(
+        config_dir_path=local_terraform_user_config_dir_path,
+        tf_modules_dir=terraform_modules_dir,
+    )
+    print(format_validation_report(report))
+    return not (report.errors or (strict and report.warnings))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Validates the user configuration files, reporting every "
+        "violation found."
+    )
+    parser.add_argument(
+        "local_terraform_user_config_dir_path",
+        help="Path to Terraform user configuration directory",
+    )
+    parser.add_argument(
+        "terraform_modules_dir",
+        help="Path to Terraform modules directory",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Exit non-zero on warnings as well as errors",
+    )
+
+    add_trace_arguments(parser)
+
+    args = parser.parse_args()
+    with trace_command("validate", args.trace, args.profile):
+        ok = main(
+            args.local_terraform_user_config_dir_path,
+            args.terraform_modules_dir,
+            strict=args.strict,
+        )
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,222 @@
+"""Backup bucket index.
+
+Every backup upload records itself in two small objects in the backup bucket: a
+time-ordered index of every backup (`index/backups.json`) and a pointer to the most
+recent backup of each kind (`index/latest.json`). The latest backup is then found
+with a single GET, and a backup is selected by timestamp with a single GET and a
+binary search, instead of listing the whole bucket.
+
+Both objects are updated with conditional puts on the ETag read, retried when
+another backup updated them in between, so concurrent backups never drop each
+other's entries.
+"""
+
+import random
+import time
+from bisect import bisect_right
+from typing import Callable, Optional
+
+from botocore.exceptions import ClientError
+
+from infra_mgmt.python.src.services.python_package.aws import (
+    get_s3_json_object,
+    get_s3_json_object_and_etag,
+    put_s3_json_object,
+)
+from infra_mgmt.python.src.terraform.models import (
+    BackupIndex,
+    BackupIndexEntry,
+    LatestBackups,
+)
+
+BACKUP_INDEX_KEY = "index/backups.json"
+# Backup bucket object pointing at the most recent backup of each kind, maintained
+# on upload so the latest backup can be found without listing the bucket
+LATEST_BACKUP_POINTER_KEY = "index/latest.json"
+
+# Conditional index updates are retried this many times, with jittered exponential
+# backoff, before giving up
+MAX_INDEX_UPDATE_ATTEMPTS = 8
+INDEX_UPDATE_BACKOFF_SECS = 0.1
+
+
+class BackupNotFoundError(Exception):
+    pass
+
+
+class BackupIndexConflictError(Exception):
+    pass
+
+
+def read_backup_index(s3_client, bucket_name: str) -> BackupIndex:
+    """Reads the backup index, or an empty index if none exists yet."""
+    data = get_s3_json_object(s3_client, bucket_name, BACKUP_INDEX_KEY)
+    return BackupIndex() if data is None else BackupIndex.model_validate(data)
+
+
+def read_latest_backups(s3_client, bucket_name: str) -> LatestBackups:
+    """Reads the latest backup pointer, or an empty pointer if none exists yet."""
+    data = get_s3_json_object(s3_client, bucket_name, LATEST_BACKUP_POINTER_KEY)
+    return LatestBackups() if data is None else LatestBackups.model_validate(data)
+
+
+def write_backup_index(
+    s3_client, bucket_name: str, index: BackupIndex, latest: LatestBackups
+) -> None:
+    put_s3_json_object(
+        s3_client, bucket_name, BACKUP_INDEX_KEY, index.model_dump_json()
+    )
+    put_s3_json_object(
+        s3_client, bucket_name, LATEST_BACKUP_POINTER_KEY, latest.model_dump_json()
+    )
+
+
+def update_s3_json_object(
+    s3_client, bucket_name: str, s3_key: str, update: Callable[[Optional[dict]], str]
+) -> None:
+    """Read-modify-writes a JSON object with a conditional put, re-reading and
+    retrying if it was changed by another writer in between.
+
+    Args:
+        s3_client: S3 client
+        bucket_name (str): Backup bucket name
+        s3_key (str): Object key
+        update (Callable[[Optional[dict]], str]): Maps the current object (None if
+            it does not exist) to the serialized updated object
+
+    Raises:
+        BackupIndexConflictError: If every attempt conflicted with another writer
+    """
+    for attempt in range(MAX_INDEX_UPDATE_ATTEMPTS):
+        data, etag = get_s3_json_object_and_etag(s3_client, bucket_name, s3_key)
+        try:
+            put_s3_json_object(
+                s3_client,
+                bucket_name,
+                s3_key,
+                update(data),
+                if_match=etag,
+                if_none_match=etag is None,
+            )
+            return
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code not in ["PreconditionFailed", "ConditionalRequestConflict"]:
+                raise
+        time.sleep(random.uniform(0, INDEX_UPDATE_BACKOFF_SECS * 2**attempt))
+    raise BackupIndexConflictError(
+        f"s3://{bucket_name}/{s3_key} was changed by other writers on each of "
+        f"{MAX_INDEX_UPDATE_ATTEMPTS} attempts to update it."
+    )
+
+
+def record_backup(s3_client, bucket_name: str, entry: BackupIndexEntry) -> None:
+    """Records a newly uploaded backup in the backup index and, if it is the most
+    recent of its kind, the latest backup pointer.
+
+    Args:
+        s3_client: S3 client
+        bucket_name (str): Backup bucket name
+        entry (BackupIndexEntry): Uploaded backup
+    """
+
+    def add_entry(data: Optional[dict]) -> str:
+        index = BackupIndex() if data is None else BackupIndex.model_validate(data)
+        entries = [x for x in index.entries if x.key != entry.key]
+        timestamps = [x.timestamp for x in entries]
+        entries.insert(bisect_right(timestamps, entry.timestamp), entry)
+        index.entries = entries
+        return index.model_dump_json()
+
+    def point_to_entry(data: Optional[dict]) -> str:
+        latest = LatestBackups() if data is None else LatestBackups.model_validate(data)
+        current = getattr(latest, entry.kind)
+        if current is None or current.timestamp <= entry.timestamp:
+            setattr(latest, entry.kind, entry)
+        return latest.model_dump_json()
+
+    update_s3_json_object(s3_client, bucket_name, BACKUP_INDEX_KEY, add_entry)
+    update_s3_json_object(
+        s3_client, bucket_name, LATEST_BACKUP_POINTER_KEY, point_to_entry
+    )
+
+
+def find_backup(
+    index: BackupIndex, timestamp: str, kind: Optional[str] = None
+) -> Optional[BackupIndexEntry]:
+    """Finds the most recent backup taken at or before a timestamp.
+
+    Args:
+        index (BackupIndex): Backup index
+        timestamp (str): Backup timestamp, e.g., `2025-01-31T12-00-00Z`
+        kind (str, optional): Only consider backups of this kind (`archive` or
+            `snapshot`)
+
+    Returns:
+        (Optional[BackupIndexEntry]): Backup, or None if none was taken by then
+    """
+    entries = index.entries
+    if kind is not None:
+        entries = [x for x in entries if x.kind == kind]
+    pos = bisect_right([x.timestamp for x in entries], timestamp)
+    return entries[pos - 1] if pos else None
+
+
+def get_backup(
+    s3_client, bucket_name: str, kind: str, timestamp: Optional[str] = None
+) -> BackupIndexEntry:
+    """Selects a backup: the latest of a kind, or the most recent taken at or before
+    a timestamp.
+
+    Args:
+        s3_client: S3 client
+        bucket_name (str): Backup bucket name
+        kind (str): Backup kind, `archive` or `snapshot`
+        timestamp (str, optional): Backup timestamp, defaults to the latest backup
+
+    Returns:
+        (BackupIndexEntry): Selected backup
+    """
+    if timestamp is None:
+        entry = getattr(read_latest_backups(s3_client, bucket_name), kind)
+    else:
+        entry = find_backup(read_backup_index(s3_client, bucket_name), timestamp, kind)
+    if entry is None:
+        at = "" if timestamp is None else f" at or before {timestamp}"
+        raise BackupNotFoundError(f"No {kind} backup found{at} in `{bucket_name}`.")
+    return entry
+
+
+def rebuild_backup_index(s3_client, bucket_name: str) -> BackupIndex:
+    """Rebuilds the backup index and latest backup pointer from a full listing of the
+    backup bucket, e.g., for buckets holding backups made before the index existed.
+
+    Args:
+        s3_client: S3 client
+        bucket_name (str): Backup bucket name
+
+    Returns:
+        (BackupIndex): Rebuilt index
+    """
+    entries = []
+    for page in s3_client.get_paginator("list_objects_v2").paginate(Bucket=bucket_name):
+        for obj in page.get("Contents", []):
+            key = obj["Key"]
+            if "/" not in key and key.endswith(".zip"):
+                timestamp, kind = key[: -len(".zip")], "archive"
+            elif key.startswith("snapshots/") and key.endswith(".json"):
+                timestamp, kind = key[len("snapshots/") : -len(".json")], "snapshot"
+            else:
+                continue
+            entries.append(
+                BackupIndexEntry(
+                    timestamp=timestamp, key=key, kind=kind, size=obj.get("Size", 0)
+                )
+            )
+    index = BackupIndex(entries=sorted(entries, key=lambda x: x.timestamp))
+
+    latest = LatestBackups()
+    for entry in index.entries:
+        setattr(latest, entry.kind, entry)
+    write_backup_index(s3_client, bucket_name, index, latest)
+    return index
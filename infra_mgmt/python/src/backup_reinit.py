@@ -1,19 +1,39 @@
 """Backup/Reinit module."""
 
+import hashlib
 import shutil
-import tempfile
-from copy import deepcopy
+import subprocess
+import sys
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from os import listdir, mkdir, path, remove, walk
+from fnmatch import fnmatch
+from functools import partial
+from os import listdir, lstat, makedirs, path, remove, rename
+from typing import BinaryIO, List, Optional, Sequence, Tuple
 
 import yaml
 
+from infra_mgmt.python.src.backup_index import get_backup, record_backup
+from infra_mgmt.python.src.file_scan import scan_directory
+from infra_mgmt.python.src.instrumentation import span
 from infra_mgmt.python.src.services.python_package.aws import (
-    download_latest_zip_from_s3,
-    upload_zip_to_s3,
+    S3MultipartUploadWriter,
+    S3RangeReader,
+    get_boto3_session,
 )
 from infra_mgmt.python.src.terraform.config import load_terraform_user_config
-from infra_mgmt.python.src.terraform.models import ReinitConfig
+from infra_mgmt.python.src.terraform.models import (
+    BackupIndexEntry,
+    BackupManifest,
+    BackupManifestEntry,
+    BackupPathScan,
+    PurgeTarget,
+    ReinitConfig,
+    TerraformUserConfig,
+)
 
 CURR_DIR = path.dirname(path.abspath(__file__))  # infra_mgmt/python/src
 PYTHON_DIR = path.dirname(path.abspath(CURR_DIR))  # infra_mgmt/python
@@ -63,6 +83,41 @@ BACKUP_PATHS = {
     USER_CONFIGS_DIR: "all",
 }
 
+# Glob rules of paths (relative to a `BACKUP_PATHS` folder) never backed up, nor
+# even walked; a rule also matches at any depth, e.g., `<acct>/.terraform/providers`
+BACKUP_EXCLUDES = [".terraform/providers"]
+
+# Logical category of the backed-up contents of each `BACKUP_PATHS` folder, recorded
+# in backup manifests so restores can be limited to a single category
+BACKUP_CATEGORIES = {
+    GENERATED_VPN_CONFIGS_DIR: "vpn-config",
+    TF_BUILD_ACCOUNTS_OUTPUT_DIR: "account-output",
+    TF_BUILD_ACCOUNTS_DIR: "account-tfvars",
+    TF_CLIENT_VPN_CONFIGS_DIR: "vpn-cert",
+    TF_CONFIG_DIR: "config",
+    TF_LOGS_DIR: "logs",
+    TF_BACKEND_DIR: "backend",
+    TF_ORG_DIR: "org",
+    USER_CONFIGS_DIR: "user-config",
+}
+
+# Folders whose contents are filed under per-account sub-folders (or, for
+# `TF_BUILD_ACCOUNTS_OUTPUT_DIR`, per-account files)
+ACCOUNT_SCOPED_PATHS = [
+    GENERATED_VPN_CONFIGS_DIR,
+    TF_BUILD_ACCOUNTS_OUTPUT_DIR,
+    TF_BUILD_ACCOUNTS_DIR,
+    TF_CLIENT_VPN_CONFIGS_DIR,
+    TF_LOGS_DIR,
+]
+
+# Name of the backup manifest member, written last under the archive's root directory
+MANIFEST_MEMBER_NAME = ".manifest.json"
+
+# Chunk size of ranged GETs when restoring selectively, small enough that reading
+# the central directory and a few members fetches little else
+SELECTIVE_RESTORE_CHUNK_SIZE = 256 * 1024
+
 
 PURGE_PATHS = {
     GENERATED_VPN_CONFIGS_DIR: "all",
@@ -90,169 +145,474 @@ RESTORE_PATHS = [
 
 
 class RestoreError(Exception):
-    path
+    pass
 
 
-def find_files_by_name(directory, file_name):
+def find_files_by_name(
+    directory: str, file_name: str, exclude: Sequence[str] = ()
+) -> List[str]:
     """
     Finds all files with a specific name in a directory and its subdirectories,
     returning their absolute paths.
 
     Args:
         directory (str): The path to the starting directory.
-        file_name (str): The name of the file to search for.
+        file_name (str): The name (or glob pattern) of the file to search for.
+        exclude (Sequence[str], optional): Glob rules of sub-paths not to search.
 
     Returns:
         list: A list of absolute paths to the found files.
     """
-    found_files = []
-    for root, _, files in walk(directory):
-        for f in files:
-            if f == file_name:
-                absolute_path = path.abspath(path.join(root, f))
-                found_files.append(absolute_path)
-    return found_files
+    return [
+        path.abspath(entry.path)
+        for entry, _ in scan_directory(directory, exclude)
+        if fnmatch(entry.name, file_name) and entry.is_file()
+    ]
 
 
-def remove_string_from_list(my_list: list, string_to_remove: str) -> list:
-    """Removes a string from a list of strings, if it exists.
+def get_encoded_file_name(fpath: str) -> str:
+    """Encodes an absolute file path as a flat archive member name, as used for
+    files stashed by the `*<file name>` backup rule.
 
     Args:
-        my_list (list): A list of strings.
-        string_to_remove (str): The string to remove from the list.
+        fpath (str): Absolute file path
 
     Returns:
-        list: The updated list.
+        (str): Encoded name, e.g., `root__project__dir__terraform.tfvars`
     """
-    if string_to_remove in my_list:
-        my_list.remove(string_to_remove)
-    return my_list
+    return fpath.replace("/", "__")[2:]
+
 
+def discover_backup_path(bpdir: str) -> List[Tuple[str, str]]:
+    """Discovers the files and directories to back up under a `BACKUP_PATHS` folder.
 
-def zip_directory_to_temp_archive(source_directory):
+    Args:
+        bpdir (str): `BACKUP_PATHS` folder
+
+    Returns:
+        (List[Tuple[str, str]]): Source path and archive member name pairs
     """
-    Zips a given directory into an archive within a temporary directory.
-    The caller is responsible for cleaning up the returned temporary directory
-    by calling the cleanup() method on the returned object.
+    content_switch = BACKUP_PATHS[bpdir]
+    entries = []
+    if isinstance(content_switch, str):
+        if content_switch == "all":
+            base_name = path.basename(bpdir)
+            entries.append((bpdir, base_name))
+            for entry, rel_path in scan_directory(bpdir, BACKUP_EXCLUDES):
+                entries.append((entry.path, f"{base_name}/{rel_path}"))
+        elif content_switch[0] == "*":
+            fname = content_switch.split("*")[1]
+            for tfp in find_files_by_name(bpdir, fname, BACKUP_EXCLUDES):
+                entries.append((tfp, get_encoded_file_name(tfp)))
+
+    elif isinstance(content_switch, list):
+        one_level_up = path.dirname(path.abspath(bpdir))
+        sub_base_name = path.join(path.basename(one_level_up), path.basename(bpdir))
+        for fname in content_switch:
+            entries.append((path.join(bpdir, fname), path.join(sub_base_name, fname)))
+    return entries
+
+
+def discover_backup_entries(max_workers: int = 8) -> List[BackupPathScan]:
+    """Discovers the files and directories to back up under every existing
+    `BACKUP_PATHS` folder, scanning folders concurrently.
 
     Args:
-        source_directory (str): The path to the directory to be zipped.
+        max_workers (int, default=8): Maximum number of folders scanned concurrently
 
     Returns:
-        tuple: A tuple containing:
-            - str: The full path to the created zip archive.
-            - tempfile.TemporaryDirectory: The temporary directory object.
+        (List[BackupPathScan]): Discovered entries of each folder, in `BACKUP_PATHS`
+            order
     """
-    temp_dir_obj = tempfile.TemporaryDirectory()
-    temp_dir = temp_dir_obj.name
-    try:
-        archive_path_without_extension = path.join(
-            temp_dir, path.basename(source_directory)
+
+    def discover(bpdir: str) -> BackupPathScan:
+        start = time.monotonic()
+        entries = discover_backup_path(bpdir)
+        return BackupPathScan(bpdir, entries, time.monotonic() - start)
+
+    bpdirs = [x for x in BACKUP_PATHS if path.isdir(x)]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        return list(executor.map(discover, bpdirs))
+
+
+def format_backup_path_timings(scans: List[BackupPathScan]) -> str:
+    """Formats a per-`BACKUP_PATHS` folder table of discovered files and timings.
+
+    Args:
+        scans (List[BackupPathScan]): Discovered entries of each folder
+
+    Returns:
+        (str): Timings table
+    """
+    names = [path.relpath(x.backup_path, PROJECT_DIR) for x in scans]
+    width = max([len("Backup path")] + [len(x) for x in names])
+    lines = [
+        f"{'Backup path':<{width}}  {'Files':>7}  {'Bytes':>12}  {'Scan':>8}  "
+        f"{'Process':>8}",
+        f"{'-' * width}  {'-' * 7}  {'-' * 12}  {'-' * 8}  {'-' * 8}",
+    ]
+    for name, scan in zip(names, scans):
+        lines.append(
+            f"{name:<{width}}  {scan.num_files:>7}  {scan.num_bytes:>12}  "
+            f"{scan.discover_secs:>7.2f}s  {scan.process_secs:>7.2f}s"
         )
-        archive_full_path = shutil.make_archive(
-            base_name=archive_path_without_extension,
-            format="zip",
-            root_dir=path.dirname(source_directory),
-            base_dir=path.basename(source_directory),
+    return "\n".join(lines)
+
+
+def write_backup_member(
+    zf: zipfile.ZipFile, source_path: str, member_name: str
+) -> Optional[str]:
+    """Writes a file or directory to a backup archive, hashing file contents as they
+    are streamed into the archive.
+
+    Args:
+        zf (zipfile.ZipFile): Archive open for writing
+        source_path (str): Path to the file or directory
+        member_name (str): Archive member name
+
+    Returns:
+        (Optional[str]): Hex digest of the file's contents, None for directories
+    """
+    if path.isdir(source_path):
+        zf.write(source_path, member_name)
+        return None
+    zinfo = zipfile.ZipInfo.from_file(source_path, member_name)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    h = hashlib.sha256()
+    with open(source_path, "rb") as src, zf.open(zinfo, "w") as dst:
+        for chunk in iter(lambda: src.read(1024 * 1024), b""):
+            h.update(chunk)
+            dst.write(chunk)
+    return h.hexdigest()
+
+
+def write_backup_archive(
+    fileobj: BinaryIO, root_name: str, max_workers: int = 8
+) -> Tuple[BackupManifest, List[BackupPathScan]]:
+    """Writes the backup .zip archive to a file object, streaming each source file
+    straight into its archive member, followed by the backup manifest.
+
+    The file object need not be seekable, so the archive can be written directly
+    into an upload stream without staging copies on disk.
+
+    Args:
+        fileobj (BinaryIO): Writable binary file object
+        root_name (str): Name of the directory every archive member is filed under
+        max_workers (int, default=8): Maximum number of folders scanned concurrently
+
+    Returns:
+        (Tuple[BackupManifest, List[BackupPathScan]]): Manifest of the archived
+            files and directories, and the entries and timings of each folder
+    """
+    scans = discover_backup_entries(max_workers=max_workers)
+    manifest = BackupManifest(timestamp=root_name)
+    with zipfile.ZipFile(fileobj, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for scan in scans:
+            start = time.monotonic()
+            for source_path, arcname in scan.entries:
+                digest = write_backup_member(
+                    zf, source_path, path.join(root_name, arcname)
+                )
+                size = 0 if digest is None else path.getsize(source_path)
+                manifest.entries.append(describe_backup_member(arcname, size, digest))
+                if digest is not None:
+                    scan.num_files += 1
+                    scan.num_bytes += size
+            scan.process_secs = time.monotonic() - start
+        zf.writestr(
+            path.join(root_name, MANIFEST_MEMBER_NAME), manifest.model_dump_json()
         )
-        print(f"Archive created at: {archive_full_path}")
-        return archive_full_path, temp_dir_obj
-    except Exception as e:
-        # Clean up the temp directory if something goes wrong
-        temp_dir_obj.cleanup()
-        raise e
+    return manifest, scans
+
+
+def get_backup_timestamp() -> str:
+    """Returns the current datetime, formatted as a backup timestamp."""
+    return datetime.now().strftime("%Y-%m-%dT%H-%M-%SZ")
+
+
+def get_backup_s3_client(tuc: TerraformUserConfig):
+    """Returns an S3 client operating in the account holding the backup bucket.
+
+    Args:
+        tuc (TerraformUserConfig): Terraform user config
+
+    Returns:
+        S3 client
+    """
+    session = get_boto3_session(
+        profile=tuc.header.aws_profiles.identity_center.profile,
+        region=tuc.header.aws_profiles.identity_center.region,
+        account_id_to_assume=tuc.header.backup.account_id,
+    )
+    return session.client("s3")
 
 
-def generate_backup_archive(config_dir_path: str, tf_modules_dir: str) -> None:
+def generate_backup_archive(config_dir_path: str, tf_modules_dir: str) -> bool:
     """Generates instantaneous project configurations backup .zip archive and uploads
     it to the AWS Organization's Management account's purpose-made S3 bucket.
 
+    The archive is streamed into an S3 multipart upload as it is written, so no
+    copies of the backed-up files are made on disk.
+
     Args:
         config_dir_path (str): Path to the user configs directory.
         tf_modules_dir (str): Path to the terraform modules directory.
+
+    Returns:
+        (bool): True if the upload was successful
     """
-    # Create a temporary directory for building the archive contents
-    with tempfile.TemporaryDirectory() as staging_dir:
-        for bpdir in BACKUP_PATHS:
-            content_switch = BACKUP_PATHS[bpdir]
-            if path.isdir(bpdir):
-                if isinstance(content_switch, str):
-                    if content_switch == "all":
-                        source_directory = bpdir
-                        destination_directory = path.join(
-                            staging_dir, path.basename(bpdir)
-                        )
-                        shutil.copytree(source_directory, destination_directory)
-                    elif content_switch[0] == "*":
-                        fname = content_switch.split("*")[1]
-                        target_fpaths = find_files_by_name(bpdir, fname)
-                        for tfp in target_fpaths:
-                            source_file = tfp
-                            destination_file_path = path.join(
-                                staging_dir, source_file.replace("/", "__")[2:]
-                            )
-                            shutil.copy(source_file, destination_file_path)
-
-                elif isinstance(content_switch, list):
-                    one_level_up = path.dirname(path.abspath(bpdir))
-                    new_base_name = path.basename(one_level_up)
-                    new_base_dest = path.join(staging_dir, new_base_name)
-                    if not path.isdir(new_base_dest):
-                        mkdir(new_base_dest)
-                    new_sub_base_name = path.join(new_base_name, path.basename(bpdir))
-                    new_sub_base_dest = path.join(staging_dir, new_sub_base_name)
-                    if not path.isdir(new_sub_base_dest):
-                        mkdir(new_sub_base_dest)
-
-                    for fname in content_switch:
-                        source_path = path.join(bpdir, fname)
-                        dest_path = path.join(new_sub_base_dest, fname)
-                        shutil.copy(source_path, dest_path)
-
-        archive_path, archive_temp_dir_obj = zip_directory_to_temp_archive(staging_dir)
-
-        # Get the current datetime object
-        current_datetime = datetime.now()
-        formatted_datetime_string = current_datetime.strftime("%Y-%m-%dT%H-%M-%SZ")
-
-        tuc = load_terraform_user_config(
-            config_dir_path=config_dir_path, tf_modules_dir=tf_modules_dir
-        )
+    tuc = load_terraform_user_config(
+        config_dir_path=config_dir_path, tf_modules_dir=tf_modules_dir
+    )
+    formatted_datetime_string = get_backup_timestamp()
 
-        upload_zip_to_s3(
-            profile=tuc.header.aws_profiles.identity_center.profile,
-            region=tuc.header.aws_profiles.identity_center.region,
-            local_zip_path=archive_path,
-            bucket_name=tuc.header.backup.bucket_name,
-            s3_key=f"{formatted_datetime_string}.zip",
-            account_id_to_assume=tuc.header.backup.account_id,
+    bucket_name = tuc.header.backup.bucket_name
+    s3_key = f"{formatted_datetime_string}.zip"
+    try:
+        s3_client = get_backup_s3_client(tuc)
+        with span("backup_upload") as upload_span:
+            with S3MultipartUploadWriter(s3_client, bucket_name, s3_key) as writer:
+                manifest, scans = write_backup_archive(
+                    writer, formatted_datetime_string
+                )
+            upload_span.add_bytes(writer.tell())
+        record_backup(
+            s3_client,
+            bucket_name,
+            BackupIndexEntry(
+                timestamp=formatted_datetime_string,
+                key=s3_key,
+                kind="archive",
+                size=writer.tell(),
+            ),
+        )
+        files = [x for x in manifest.entries if x.digest is not None]
+        print(format_backup_path_timings(scans) + "\n")
+        print(
+            f"Successfully streamed {len(files)} files "
+            f"({sum(x.size for x in files)} bytes) to s3://{bucket_name}/{s3_key}"
         )
+        return True
+    except Exception as e:
+        print(f"An error occurred uploading to S3: {e}")
+        return False
+
+
+def get_purge_candidates(pdir: str) -> List[str]:
+    """Returns the paths a `PURGE_PATHS` entry removes, whether or not they exist.
+
+    Args:
+        pdir (str): `PURGE_PATHS` folder
+
+    Returns:
+        (List[str]): Paths to remove
+    """
+    content_switch = PURGE_PATHS[pdir]
+    if isinstance(content_switch, str):
+        return [pdir] if content_switch == "all" else []
+    return [path.join(pdir, fname) for fname in content_switch]
+
+
+def plan_purge_target(pdir: str) -> PurgeTarget:
+    """Computes the deletion set of a `PURGE_PATHS` entry, with its file count and
+    total bytes.
+
+    Args:
+        pdir (str): `PURGE_PATHS` folder
+
+    Returns:
+        (PurgeTarget): Deletion set
+    """
+    candidates = get_purge_candidates(pdir)
+    target = PurgeTarget(pdir, [x for x in candidates if path.lexists(x)])
+    for tpath in target.paths:
+        if path.isdir(tpath) and not path.islink(tpath):
+            for entry, _ in scan_directory(tpath, follow_symlinks=False):
+                if not entry.is_dir(follow_symlinks=False):
+                    target.num_files += 1
+                    target.num_bytes += entry.stat(follow_symlinks=False).st_size
+        else:
+            target.num_files += 1
+            target.num_bytes += lstat(tpath).st_size
+    return target
+
+
+def plan_purge(max_workers: int = 8) -> List[PurgeTarget]:
+    """Computes the deletion set of every `PURGE_PATHS` entry, scanning entries
+    concurrently.
+
+    Args:
+        max_workers (int, default=8): Maximum number of entries scanned concurrently
+
+    Returns:
+        (List[PurgeTarget]): Deletion sets, in `PURGE_PATHS` order
+    """
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        return list(executor.map(plan_purge_target, PURGE_PATHS))
+
+
+def format_purge_report(targets: List[PurgeTarget]) -> str:
+    """Formats a per-`PURGE_PATHS` entry table of file counts and bytes to delete.
+
+    Args:
+        targets (List[PurgeTarget]): Deletion sets
+
+    Returns:
+        (str): Report table
+    """
+    names = [path.relpath(x.purge_path, PROJECT_DIR) for x in targets]
+    width = max([len("Purge path")] + [len(x) for x in names])
+    lines = [
+        f"{'Purge path':<{width}}  {'Files':>7}  {'Bytes':>12}",
+        f"{'-' * width}  {'-' * 7}  {'-' * 12}",
+    ]
+    for name, target in zip(names, targets):
+        lines.append(f"{name:<{width}}  {target.num_files:>7}  {target.num_bytes:>12}")
+    lines.append(
+        f"\n{sum(x.num_files for x in targets)} files, "
+        f"{sum(x.num_bytes for x in targets)} bytes"
+    )
+    return "\n".join(lines)
+
+
+def remove_path(tpath: str) -> None:
+    """Removes a file, symlink or folder (recursively), if it exists.
+
+    Args:
+        tpath (str): Path to remove
+
+    Returns:
+        None
+    """
+    if path.isdir(tpath) and not path.islink(tpath):
+        shutil.rmtree(tpath)
+    elif path.lexists(tpath):
+        remove(tpath)
+
+
+def move_aside(tpath: str) -> str:
+    """Atomically renames a file or folder to a hidden sibling, to be removed later.
+
+    Args:
+        tpath (str): Path to the file or folder
+
+    Returns:
+        (str): New path
+    """
+    aside_path = get_aside_prefix(tpath) + uuid.uuid4().hex[:8]
+    rename(tpath, aside_path)
+    return aside_path
+
+
+def get_aside_prefix(tpath: str) -> str:
+    """Returns the path prefix `move_aside` renames a file or folder to, e.g.,
+    `.logs` to `.logs.purge-<id>`.
+
+    Args:
+        tpath (str): Path to the file or folder
 
-        # Clean up the temporary directory containing the archive
-        archive_temp_dir_obj.cleanup()
+    Returns:
+        (str): Path prefix
+    """
+    name = path.basename(tpath).lstrip(".")
+    return path.join(path.dirname(tpath), f".{name}.purge-")
 
 
-def purge_configs() -> None:
+def list_stale_purge_paths() -> List[str]:
+    """Lists the folders moved aside by earlier fast purges but never removed, e.g.,
+    because their background removal was interrupted.
+
+    Returns:
+        (List[str]): Paths of the moved aside folders
+    """
+    stale = set()
+    for pdir in PURGE_PATHS:
+        for tpath in get_purge_candidates(pdir):
+            prefix = get_aside_prefix(tpath)
+            parent = path.dirname(prefix)
+            if not path.isdir(parent):
+                continue
+            stale.update(
+                path.join(parent, x)
+                for x in listdir(parent)
+                if path.join(parent, x).startswith(prefix)
+                and path.isdir(path.join(parent, x))
+            )
+    return sorted(stale)
+
+
+def purge_configs(
+    dry_run: bool = False, fast: bool = False, max_workers: int = 8
+) -> List[PurgeTarget]:
     """Purges instantaneous project configurations.
 
     Removes all existing configurations for a current project, in order to clean out
-    directories so to work on a different project.
+    directories so to work on a different project. The deletion set of each
+    `PURGE_PATHS` entry is computed and reported first; the independent entries are
+    then removed in parallel. Folders left moved aside by earlier fast purges are
+    swept along with them.
+
+    Args:
+        dry_run (bool, default=False): Only report what would be removed
+        fast (bool, default=False): Rename each folder aside and remove the renamed
+            folders in a detached background process, returning immediately
+        max_workers (int, default=8): Maximum number of entries scanned/removed
+            concurrently
+
+    Returns:
+        (List[PurgeTarget]): Deletion sets
     """
-    for pdir in PURGE_PATHS:
-        content_switch = PURGE_PATHS[pdir]
-        if isinstance(content_switch, str):
-            if content_switch == "all":
-                if path.isdir(pdir):
-                    shutil.rmtree(pdir)
-                elif path.isfile(pdir):
-                    remove(pdir)
-        elif isinstance(content_switch, list):
-            for fname in content_switch:
-                cpath = path.join(pdir, fname)
-                if path.isdir(cpath):
-                    shutil.rmtree(cpath)
-                elif path.isfile(cpath):
-                    remove(cpath)
+    # Folders left moved aside by earlier fast purges are swept first
+    stale_paths = list_stale_purge_paths()
+    if stale_paths:
+        print(f"{len(stale_paths)} folders left by earlier purges:")
+        print("\n".join(f"    {path.relpath(x, PROJECT_DIR)}" for x in stale_paths))
+        if not dry_run and not fast:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                # A still running background removal may race the sweep
+                list(
+                    executor.map(
+                        partial(shutil.rmtree, ignore_errors=True), stale_paths
+                    )
+                )
+        print()
+
+    targets = plan_purge(max_workers=max_workers)
+    print(format_purge_report(targets))
+    if dry_run:
+        print("\nDry run, nothing removed.")
+        return targets
+
+    tpaths = [x for target in targets for x in target.paths]
+    if fast:
+        aside_paths = list(stale_paths)
+        for tpath in tpaths:
+            if path.isdir(tpath) and not path.islink(tpath):
+                aside_paths.append(move_aside(tpath))
+            else:
+                remove(tpath)
+        if aside_paths:
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "-c",
+                    "import shutil, sys\n"
+                    "for x in sys.argv[1:]:\n"
+                    "    shutil.rmtree(x, ignore_errors=True)",
+                    *aside_paths,
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            print(f"\nRemoving {len(aside_paths)} folders in the background.")
+        return targets
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        list(executor.map(remove_path, tpaths))
+    print("\nPurge complete.")
+    return targets
 
 
 def load_reinit_config(config_dir_path: str) -> ReinitConfig:
@@ -268,124 +628,380 @@ def load_reinit_config(config_dir_path: str) -> ReinitConfig:
     return ReinitConfig(**ric)
 
 
-def reinit_project_configs(
-    config_dir_path: str, tf_modules_dir: str, local_download_dir: str
-) -> None:
-    """Pulls backup configs for project and puts them back in their configuration
-    "places".
+def get_reinit_s3_client(ric: ReinitConfig):
+    """Returns an S3 client operating in the account holding the backup bucket, from
+    the reinit config (the user configs, and thus the header config, are not yet
+    restored when reinitializing a project).
+
     Args:
-        config_dir_path (str): Path to the user configs directory.
-        tf_modules_dir (str): Path to the terraform modules directory.
-        local_download_dir (str): The local directory to restore the files to.
+        ric (ReinitConfig): Reinit config
+
+    Returns:
+        S3 client
     """
-    ric = load_reinit_config(config_dir_path=config_dir_path)
+    session = get_boto3_session(
+        profile=ric.aws_profile.profile,
+        region=ric.aws_profile.region,
+        account_id_to_assume=ric.backup.account_id,
+    )
+    return session.client("s3")
 
-    # with tempfile.TemporaryDirectory() as temp_dir:
-    #     downloaded_zip_path = download_latest_zip_from_s3(
-    #         profile=ric.aws_profile.profile,
-    #         region=ric.aws_profile.region,
-    #         bucket_name=ric.backup.bucket_name,
-    #         local_download_dir=temp_dir,
-    #         account_id_to_assume=ric.backup.account_id,
-    #     )
-
-    #     if downloaded_zip_path:
-    #         with tempfile.TemporaryDirectory() as unzip_dir:
-    #             print(f"Unzipping {downloaded_zip_path} to {unzip_dir}...")
-    #             shutil.unpack_archive(downloaded_zip_path, unzip_dir)
-
-    #             # The archive contains a single directory with the backed-up files.
-    #             unzipped_items = listdir(unzip_dir)
-    #             if not unzipped_items:
-    #                 print("Error: Unzipped archive is empty.")
-    #                 return
-
-    #             source_content_dir = path.join(unzip_dir, unzipped_items[0])
-
-    #             print(
-    #                 "Restoring files from"
-    #                 f" {source_content_dir} to {local_download_dir}"
-    #             )
-    #             shutil.copytree(
-    #                 source_content_dir, local_download_dir, dirs_exist_ok=True
-    #             )
-    #             print("Restore complete.")
 
-    for restore_dir in RESTORE_PATHS:
-        print(restore_dir)
+def resolve_backup_member(member_name: str) -> Optional[Tuple[str, str]]:
+    """Resolves a backup archive member name, relative to the archive's root
+    directory, to the `RESTORE_PATHS` directory it belongs to.
+
+    Members are filed under the base name of their `RESTORE_PATHS` directory (or its
+    parent and base names, e.g., `terraform/org`), except files stashed by a
+    `*<file name>` backup rule, whose names encode their original path.
 
-    contents = listdir(local_download_dir)
-    contents.sort()
-    print("\n\ncontents:")
-    for cnt in contents:
-        print(cnt)
-    print("\n\n")
+    Args:
+        member_name (str): Archive member name, e.g., `.config/iam_users.json`
 
-    terraform_finds = []
-    restored = []
+    Returns:
+        (Optional[Tuple[str, str]]): The `RESTORE_PATHS` directory and the member's
+            path relative to it, or None if the member has no restore path
+    """
+    parts = [x for x in member_name.split("/") if x]
+    if not parts:
+        return None
+
+    if len(parts) == 1:
+        for bpdir, content_switch in BACKUP_PATHS.items():
+            if not isinstance(content_switch, str) or content_switch[0] != "*":
+                continue
+            fname = content_switch.split("*")[1]
+            if bpdir in RESTORE_PATHS and parts[0].endswith(f"__{fname}"):
+                fpath = "/" + parts[0].replace("__", "/")
+                subdir_name = path.basename(path.dirname(fpath))
+                return bpdir, path.join(subdir_name, fname)
+
+    restore_dirs = {}
     for restore_dir in RESTORE_PATHS:
-        restore_base = path.basename(restore_dir)
-        if restore_base in contents:
-            contents = remove_string_from_list(contents, restore_base)
-            source_path = path.join(local_download_dir, restore_base)
-            dest_path = restore_dir
-            if path.isdir(source_path):
-                shutil.copytree(source_path, dest_path, dirs_exist_ok=True)
-            restored.append(restore_dir)
-        elif "terraform" in restore_dir:
-            terraform_finds.append(restore_dir)
-
-    # Filter out RESTORE_PATHS that have already been used
-    restore_paths = deepcopy(RESTORE_PATHS)
-    for rd in restored:
-        restore_paths = remove_string_from_list(restore_paths, rd)
-
-    # Restore terraform/backend and terraform/org content
-    restored = []
-    for rp in restore_paths:
-        if "terraform" in rp and "backend" in rp:
-            if "terraform" in contents:
-                source_path = path.join(local_download_dir, "terraform", "backend")
-                dest_path = rp
-                if path.isdir(source_path):
-                    shutil.copytree(source_path, dest_path, dirs_exist_ok=True)
-                restored.append(rp)
-        if "terraform" in rp and "org" in rp:
-            if "terraform" in contents:
-                source_path = path.join(local_download_dir, "terraform", "org")
-                dest_path = rp
-                if path.isdir(source_path):
-                    shutil.copytree(source_path, dest_path, dirs_exist_ok=True)
-                restored.append(rp)
-
-    # Filter out `terraform` from contents at this point
-    contents = remove_string_from_list(contents, "terraform")
-
-    # Filter out RESTORE_PATHS that have already been used
-    for rd in restored:
-        restore_paths = remove_string_from_list(restore_paths, rd)
-
-    # At this point we should only have account terraform.tfvars files to process
-    if len(restore_paths) > 1:
-        raise RestoreError(
-            f"Number of remaining 'restore paths' is {len(restore_paths)}"
-        )
-    if restore_paths[0] != TF_BUILD_ACCOUNTS_DIR:
-        raise RestoreError(f"Final path to restore is not {TF_BUILD_ACCOUNTS_DIR}")
+        base_name = path.basename(restore_dir)
+        parent_name = path.basename(path.dirname(restore_dir))
+        restore_dirs[base_name] = restore_dir
+        restore_dirs[f"{parent_name}/{base_name}"] = restore_dir
+    for n in [2, 1]:
+        restore_dir = restore_dirs.get("/".join(parts[:n]))
+        if restore_dir is not None:
+            return restore_dir, "/".join(parts[n:])
+    return None
+
+
+def get_restore_destination(member_name: str) -> Optional[str]:
+    """Maps a backup archive member name, relative to the archive's root directory,
+    to the path it is restored to.
+
+    Args:
+        member_name (str): Archive member name, e.g., `.config/iam_users.json`
+
+    Returns:
+        (Optional[str]): Restore path, or None if the member has no restore path
+    """
+    resolved = resolve_backup_member(member_name)
+    if resolved is None:
+        return None
+    restore_dir, rel_path = resolved
+    dest_path = path.normpath(path.join(restore_dir, rel_path))
+    if dest_path != restore_dir and not dest_path.startswith(restore_dir + "/"):
+        raise RestoreError(f"Archive member escapes {restore_dir}: {member_name}")
+    return dest_path
+
+
+def get_backup_category(member_name: str) -> Tuple[Optional[str], Optional[str]]:
+    """Returns the logical category of a backup archive member and, for per-account
+    contents, the account it belongs to.
+
+    Args:
+        member_name (str): Archive member name, relative to the archive's root
+
+    Returns:
+        (Tuple[Optional[str], Optional[str]]): Category and account name
+    """
+    resolved = resolve_backup_member(member_name)
+    if resolved is None:
+        return None, None
+    restore_dir, rel_path = resolved
+    account = None
+    if restore_dir in ACCOUNT_SCOPED_PATHS and rel_path:
+        account = rel_path.split("/")[0]
+        if restore_dir == TF_BUILD_ACCOUNTS_OUTPUT_DIR:
+            account = path.splitext(account)[0]
+    return BACKUP_CATEGORIES.get(restore_dir), account
+
+
+def describe_backup_member(
+    member_name: str, size: int = 0, digest: Optional[str] = None
+) -> BackupManifestEntry:
+    """Describes a backup archive member as a manifest entry, with its category and
+    account derived from its name.
+
+    Args:
+        member_name (str): Archive member name, relative to the archive's root
+        size (int, default=0): Uncompressed size, in bytes
+        digest (str, optional): Contents digest, None for directories
+
+    Returns:
+        (BackupManifestEntry): Manifest entry
+    """
+    category, account = get_backup_category(member_name)
+    return BackupManifestEntry(
+        path=member_name, size=size, digest=digest, category=category, account=account
+    )
+
+
+def select_manifest_entries(
+    manifest: BackupManifest,
+    account: Optional[str] = None,
+    category: Optional[str] = None,
+    member_path: Optional[str] = None,
+) -> List[BackupManifestEntry]:
+    """Selects the backup manifest entries matching every given filter.
+
+    Args:
+        manifest (BackupManifest): Backup manifest
+        account (str, optional): Only entries belonging to this account
+        category (str, optional): Only entries of this category
+        member_path (str, optional): Only this archive member, or the members under
+            this folder, e.g., `.config` or `terraform/org/terraform.tfvars`
 
-    restore_path = restore_paths[0]
-    print("\n\n")
-    for encoded_fpath in contents:
-        if "terraform.tfvars" not in encoded_fpath:
+    Returns:
+        (List[BackupManifestEntry]): Selected entries
+    """
+    prefix = None if member_path is None else member_path.strip("/")
+    selected = []
+    for entry in manifest.entries:
+        if account is not None and entry.account != account:
+            continue
+        if category is not None and entry.category != category:
             continue
-        fpath = "/" + encoded_fpath.replace("__", "/")
-        accounts_subdir_name = path.basename(path.dirname(path.abspath(fpath)))
-        print(fpath)
-        print(f"{accounts_subdir_name}\n")
-        rdir = path.join(restore_path, accounts_subdir_name)
-        if not path.isdir(rdir):
-            mkdir(rdir)
-        source_path = path.join(local_download_dir, encoded_fpath)
-        dest_path = path.join(rdir, "terraform.tfvars")
-        shutil.copy(source_path, dest_path)
-    return contents, restore_paths
+        if prefix is not None:
+            entry_path = entry.path.strip("/")
+            if entry_path != prefix and not entry_path.startswith(prefix + "/"):
+                continue
+        selected.append(entry)
+    return selected
+
+
+def restore_file(fileobj: BinaryIO, dest_path: str) -> int:
+    """Writes a file's contents to its restore path, creating parent directories.
+
+    Args:
+        fileobj (BinaryIO): Readable binary file object of the file's contents
+        dest_path (str): Restore path
+
+    Returns:
+        (int): Number of bytes written
+    """
+    makedirs(path.dirname(dest_path), exist_ok=True)
+    with open(dest_path, "wb") as f:
+        shutil.copyfileobj(fileobj, f)
+        return f.tell()
+
+
+def get_root_name(zf: zipfile.ZipFile) -> str:
+    """Returns the name of the single root directory every archive member is filed
+    under."""
+    names = zf.namelist()
+    return names[0].partition("/")[0] if names else ""
+
+
+def get_member_info(
+    zf: zipfile.ZipFile, root_name: str, member_name: str
+) -> zipfile.ZipInfo:
+    """Returns the `ZipInfo` of an archive member named relative to the archive's
+    root directory; directory members are stored with a trailing slash."""
+    name = f"{root_name}/{member_name}"
+    return zf.NameToInfo.get(name) or zf.getinfo(name + "/")
+
+
+def read_archive_manifest(zf: zipfile.ZipFile) -> BackupManifest:
+    """Reads a backup archive's manifest; for archives predating manifests, one is
+    built from the archive's central directory, without file digests.
+
+    Args:
+        zf (zipfile.ZipFile): Archive open for reading
+
+    Returns:
+        (BackupManifest): Backup manifest
+    """
+    root_name = get_root_name(zf)
+    manifest_name = f"{root_name}/{MANIFEST_MEMBER_NAME}"
+    if manifest_name in zf.NameToInfo:
+        return BackupManifest.model_validate_json(zf.read(manifest_name))
+    manifest = BackupManifest(timestamp=root_name)
+    for info in zf.infolist():
+        member_name = info.filename.partition("/")[2]
+        if member_name:
+            size = 0 if info.is_dir() else info.file_size
+            manifest.entries.append(describe_backup_member(member_name, size))
+    return manifest
+
+
+def unpack_backup_archive(
+    fileobj: BinaryIO, members: Optional[List[str]] = None
+) -> Tuple[int, int]:
+    """Unpacks a backup .zip archive's members straight into their restore paths,
+    without an intermediate extraction directory.
+
+    Args:
+        fileobj (BinaryIO): Readable, seekable binary file object of the archive
+        members (List[str], optional): Only unpack these members (names relative to
+            the archive's root directory), defaults to every member
+
+    Returns:
+        (Tuple[int, int]): Number of files and total bytes restored
+    """
+    num_files = 0
+    num_bytes = 0
+    with zipfile.ZipFile(fileobj) as zf:
+        root_name = get_root_name(zf)
+        if members is None:
+            infos = zf.infolist()
+        else:
+            infos = [get_member_info(zf, root_name, x) for x in members]
+        for info in infos:
+            # Every member is filed under the archive's single root directory
+            member_name = info.filename.partition("/")[2]
+            if member_name == MANIFEST_MEMBER_NAME:
+                continue
+            dest_path = get_restore_destination(member_name)
+            if dest_path is None:
+                if member_name:
+                    print(f"Skipping {info.filename}: no restore path")
+                continue
+            if info.is_dir():
+                makedirs(dest_path, exist_ok=True)
+                continue
+            with zf.open(info) as member:
+                num_bytes += restore_file(member, dest_path)
+            num_files += 1
+    return num_files, num_bytes
+
+
+def select_archive_members(
+    reader: S3RangeReader,
+    account: Optional[str] = None,
+    category: Optional[str] = None,
+    member_path: Optional[str] = None,
+    max_workers: int = 8,
+) -> List[str]:
+    """Selects backup archive members from the archive's manifest, then fetches the
+    byte ranges holding the selected members, in parallel.
+
+    Only the archive's central directory, manifest and selected members are
+    downloaded.
+
+    Args:
+        reader (S3RangeReader): Reader over the archive in S3
+        account (str, optional): Only members belonging to this account
+        category (str, optional): Only members of this category
+        member_path (str, optional): Only this member, or the members under this
+            folder
+        max_workers (int, default=8): Maximum number of concurrent ranged GETs
+
+    Returns:
+        (List[str]): Selected member names, relative to the archive's root
+    """
+    with zipfile.ZipFile(reader) as zf:
+        root_name = get_root_name(zf)
+        manifest = read_archive_manifest(zf)
+        selected = [
+            x.path
+            for x in select_manifest_entries(manifest, account, category, member_path)
+        ]
+        ranges = []
+        for member_name in selected:
+            info = get_member_info(zf, root_name, member_name)
+            # Local file headers repeat the member name and may carry extra fields
+            # of their own, so allow some slack past the compressed data
+            header_size = 30 + len(info.orig_filename.encode()) + 1024
+            ranges.append(
+                (
+                    info.header_offset,
+                    info.header_offset + header_size + info.compress_size,
+                )
+            )
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        list(executor.map(lambda x: reader.prefetch(x[0], x[1], max_workers=1), ranges))
+    return selected
+
+
+def format_transfer_rate(num_bytes: int, seconds: float) -> str:
+    rate = num_bytes / seconds if seconds > 0 else 0.0
+    return f"{num_bytes} bytes in {seconds:.2f}s ({rate / 1e6:.2f} MB/s)"
+
+
+def reinit_project_configs(
+    config_dir_path: str,
+    timestamp: Optional[str] = None,
+    max_workers: int = 8,
+    account: Optional[str] = None,
+    category: Optional[str] = None,
+    member_path: Optional[str] = None,
+) -> bool:
+    """Pulls backup configs for project and puts them back in their configuration
+    "places".
+
+    The backup archive is fetched with parallel ranged GETs and its members are
+    unpacked from memory directly into their `RESTORE_PATHS` destinations. When
+    restoring selectively (by account, category and/or path), only the archive's
+    central directory, manifest and selected members are fetched.
+
+    Args:
+        config_dir_path (str): Path to the user configs directory, holding the
+            `reinit.yaml` config.
+        timestamp (str, optional): Restore the most recent backup taken at or before
+            this timestamp, defaults to the latest backup
+        max_workers (int, default=8): Maximum number of concurrent ranged GETs
+        account (str, optional): Only restore contents belonging to this account
+        category (str, optional): Only restore contents of this category, one of
+            the `BACKUP_CATEGORIES` values
+        member_path (str, optional): Only restore this archive member, or the
+            members under this folder, e.g., `.config`
+
+    Returns:
+        (bool): True if the backup was restored successfully
+    """
+    ric = load_reinit_config(config_dir_path=config_dir_path)
+    bucket_name = ric.backup.bucket_name
+    try:
+        s3_client = get_reinit_s3_client(ric)
+        entry = get_backup(s3_client, bucket_name, "archive", timestamp)
+        print(f"Restoring s3://{bucket_name}/{entry.key}...")
+
+        start = time.monotonic()
+        members = None
+        with span("backup_download", account=account) as download_span:
+            if account is None and category is None and member_path is None:
+                reader = S3RangeReader(s3_client, bucket_name, entry.key)
+                reader.prefetch(max_workers=max_workers)
+            else:
+                reader = S3RangeReader(
+                    s3_client,
+                    bucket_name,
+                    entry.key,
+                    chunk_size=SELECTIVE_RESTORE_CHUNK_SIZE,
+                )
+                members = select_archive_members(
+                    reader, account, category, member_path, max_workers=max_workers
+                )
+            download_span.add_bytes(reader.bytes_fetched)
+        download_secs = time.monotonic() - start
+    except Exception as e:
+        print(f"An error occurred downloading from S3: {e}")
+        return False
+    print(f"Downloaded {format_transfer_rate(reader.bytes_fetched, download_secs)}")
+
+    start = time.monotonic()
+    try:
+        with span("backup_unpack", account=account) as unpack_span:
+            num_files, num_bytes = unpack_backup_archive(reader, members)
+            unpack_span.add_bytes(num_bytes)
+    except Exception as e:
+        print(f"An error occurred restoring the backup: {e}")
+        return False
+    unpack_secs = time.monotonic() - start
+    print(f"Restored {num_files} files, {format_transfer_rate(num_bytes, unpack_secs)}")
+    return True
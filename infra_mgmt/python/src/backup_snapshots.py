@@ -0,0 +1,359 @@
+"""Incremental, content-addressed configuration backups.
+
+Each backed-up file is stored once in the backup bucket as a gzip-compressed blob
+keyed on the SHA-256 digest of its contents (`blobs/<digest>`), and each backup is a
+small JSON snapshot manifest (`snapshots/<timestamp>.json`) listing every backed-up
+path along with the digest of its contents. A new snapshot only uploads blobs not
+already in the bucket, so frequent backups of mostly unchanged configs are cheap.
+
+Blobs are keyed on the digest of the exact bytes uploaded, so a file that changes
+between being scanned and uploaded (e.g., a log) is recorded in the snapshot under
+the digest of the contents actually stored.
+"""
+
+import gzip
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import makedirs, path
+from typing import Dict, List, Optional, Tuple
+
+from infra_mgmt.python.src.backup_index import get_backup, record_backup
+from infra_mgmt.python.src.backup_reinit import (
+    describe_backup_member,
+    discover_backup_entries,
+    format_backup_path_timings,
+    format_transfer_rate,
+    get_backup_s3_client,
+    get_backup_timestamp,
+    get_reinit_s3_client,
+    get_restore_destination,
+    load_reinit_config,
+    restore_file,
+    select_manifest_entries,
+)
+from infra_mgmt.python.src.instrumentation import span
+from infra_mgmt.python.src.services.python_package.aws import (
+    get_s3_json_object,
+    put_s3_json_object,
+    s3_object_exists,
+)
+from infra_mgmt.python.src.terraform.config import load_terraform_user_config
+from infra_mgmt.python.src.terraform.models import (
+    BackupIndexEntry,
+    BackupManifest,
+    BackupManifestEntry,
+    BackupPathScan,
+)
+from infra_mgmt.python.src.terraform.utils import file_digest, sha256_digest
+
+BLOBS_PREFIX = "blobs/"
+SNAPSHOTS_PREFIX = "snapshots/"
+
+
+def get_blob_key(digest: str) -> str:
+    return f"{BLOBS_PREFIX}{digest}"
+
+
+def get_snapshot_key(timestamp: str) -> str:
+    return f"{SNAPSHOTS_PREFIX}{timestamp}.json"
+
+
+def build_backup_snapshot(
+    timestamp: str, max_workers: int = 8
+) -> Tuple[BackupManifest, Dict[str, List[Tuple[str, str]]], List[BackupPathScan]]:
+    """Builds a snapshot manifest of every entry in `BACKUP_PATHS`, hashing files
+    concurrently.
+
+    Args:
+        timestamp (str): Snapshot timestamp
+        max_workers (int, default=8): Maximum number of folders scanned, or files
+            hashed, concurrently
+
+    Returns:
+        (Tuple[BackupManifest, Dict[str, List[Tuple[str, str]]],
+            List[BackupPathScan]]): Snapshot manifest, a mapping of each file content
+            digest to the (source path, archive path) of every file holding that
+            content, and the entries and timings of each `BACKUP_PATHS` folder
+    """
+    scans = discover_backup_entries(max_workers=max_workers)
+
+    def describe(entry: Tuple[str, str]) -> BackupManifestEntry:
+        source_path, arcname = entry
+        if path.isdir(source_path):
+            return describe_backup_member(arcname)
+        return describe_backup_member(
+            arcname, path.getsize(source_path), file_digest(source_path)
+        )
+
+    snapshot = BackupManifest(timestamp=timestamp)
+    sources = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for scan in scans:
+            start = time.monotonic()
+            scan_entries = list(executor.map(describe, scan.entries))
+            scan.process_secs = time.monotonic() - start
+            for (source_path, arcname), entry in zip(scan.entries, scan_entries):
+                if entry.digest is not None:
+                    sources.setdefault(entry.digest, []).append((source_path, arcname))
+                    scan.num_files += 1
+                    scan.num_bytes += entry.size
+            snapshot.entries += scan_entries
+    return snapshot, sources, scans
+
+
+def upload_blob(s3_client, bucket_name: str, source_path: str) -> Tuple[str, int, int]:
+    """Uploads a file's contents, gzip-compressed, as a content-addressed blob, unless
+    a blob of the same contents is already in the bucket.
+
+    The file is read once, and the blob is keyed on the digest of the bytes read, so
+    its key always matches its contents, even if the file changed since it was
+    scanned.
+
+    Args:
+        s3_client: S3 client
+        bucket_name (str): Backup bucket name
+        source_path (str): Path to the file
+
+    Returns:
+        (Tuple[str, int, int]): Digest and size of the file's contents, and the
+            number of (compressed) bytes uploaded
+    """
+    with open(source_path, "rb") as f:
+        contents = f.read()
+    digest = sha256_digest(contents)
+    key = get_blob_key(digest)
+    if s3_object_exists(s3_client, bucket_name, key):
+        return digest, len(contents), 0
+    body = gzip.compress(contents)
+    s3_client.put_object(Bucket=bucket_name, Key=key, Body=body)
+    return digest, len(contents), len(body)
+
+
+def upload_backup_snapshot(
+    s3_client,
+    bucket_name: str,
+    snapshot: BackupManifest,
+    sources: Dict[str, List[Tuple[str, str]]],
+    max_workers: int = 8,
+) -> List[str]:
+    """Uploads the blobs missing from the backup bucket, then the snapshot manifest,
+    and records the snapshot in the backup index.
+
+    Each digest's blob is uploaded from the first of its files still holding the
+    scanned contents. Files found to have changed since they were scanned are
+    uploaded as they are now, and their snapshot entries updated to match. The
+    manifest is uploaded last, so a snapshot is never visible before every blob it
+    references.
+
+    Args:
+        s3_client: S3 client
+        bucket_name (str): Backup bucket name
+        snapshot (BackupManifest): Snapshot manifest, updated in place
+        sources (Dict[str, List[Tuple[str, str]]]): (Source path, archive path) of
+            each file holding each file content digest
+        max_workers (int, default=8): Maximum number of concurrent blob uploads
+
+    Returns:
+        (List[str]): Digests of the blobs uploaded
+    """
+    entries = {x.path: x for x in snapshot.entries}
+
+    def upload(digest: str) -> List[str]:
+        uploaded = []
+        for source_path, arcname in sources[digest]:
+            actual, size, num_bytes = upload_blob(s3_client, bucket_name, source_path)
+            if num_bytes:
+                uploaded.append(actual)
+            if actual == digest:
+                break
+            # Changed since scanned; the entry now records the contents uploaded.
+            # Every entry belongs to a single digest, so no other thread updates it.
+            entries[arcname].digest = actual
+            entries[arcname].size = size
+        return uploaded
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        uploaded = [
+            x for digests in executor.map(upload, sorted(sources)) for x in digests
+        ]
+
+    snapshot_key = get_snapshot_key(snapshot.timestamp)
+    data = snapshot.model_dump_json()
+    put_s3_json_object(s3_client, bucket_name, snapshot_key, data)
+    record_backup(
+        s3_client,
+        bucket_name,
+        BackupIndexEntry(
+            timestamp=snapshot.timestamp,
+            key=snapshot_key,
+            kind="snapshot",
+            size=len(data.encode("utf-8")),
+        ),
+    )
+    return uploaded
+
+
+def generate_incremental_backup(
+    config_dir_path: str, tf_modules_dir: str, max_workers: int = 8
+) -> bool:
+    """Generates an incremental project configurations backup snapshot in the AWS
+    Organization's Management account's purpose-made S3 bucket, uploading only file
+    contents not already backed up.
+
+    Args:
+        config_dir_path (str): Path to the user configs directory.
+        tf_modules_dir (str): Path to the terraform modules directory.
+        max_workers (int, default=8): Maximum number of concurrent hashes/uploads
+
+    Returns:
+        (bool): True if the snapshot was uploaded successfully
+    """
+    tuc = load_terraform_user_config(
+        config_dir_path=config_dir_path, tf_modules_dir=tf_modules_dir
+    )
+    timestamp = get_backup_timestamp()
+    bucket_name = tuc.header.backup.bucket_name
+
+    snapshot, sources, scans = build_backup_snapshot(timestamp, max_workers=max_workers)
+    print(format_backup_path_timings(scans) + "\n")
+    try:
+        s3_client = get_backup_s3_client(tuc)
+        with span("backup_snapshot_upload") as upload_span:
+            uploaded = upload_backup_snapshot(
+                s3_client, bucket_name, snapshot, sources, max_workers=max_workers
+            )
+            upload_span.set(blobs_uploaded=len(uploaded), blobs=len(sources))
+    except Exception as e:
+        print(f"An error occurred uploading to S3: {e}")
+        return False
+
+    print(
+        f"Successfully uploaded snapshot s3://{bucket_name}/"
+        f"{get_snapshot_key(timestamp)}: {len(snapshot.entries)} entries, "
+        f"{len(uploaded)} of {len(sources)} unique file contents uploaded"
+    )
+    return True
+
+
+def restore_backup_snapshot(
+    s3_client,
+    bucket_name: str,
+    snapshot_key: str,
+    max_workers: int = 8,
+    account: Optional[str] = None,
+    category: Optional[str] = None,
+    member_path: Optional[str] = None,
+) -> Tuple[int, int, int]:
+    """Restores the entries of a snapshot to their restore paths, fetching each
+    unique blob once, concurrently.
+
+    Args:
+        s3_client: S3 client
+        bucket_name (str): Backup bucket name
+        snapshot_key (str): Snapshot manifest key
+        max_workers (int, default=8): Maximum number of concurrent blob downloads
+        account (str, optional): Only restore entries belonging to this account
+        category (str, optional): Only restore entries of this category
+        member_path (str, optional): Only restore this entry, or the entries under
+            this folder
+
+    Returns:
+        (Tuple[int, int, int]): Number of files restored, total bytes restored, and
+            total (compressed) bytes downloaded
+    """
+    snapshot = BackupManifest.model_validate(
+        get_s3_json_object(s3_client, bucket_name, snapshot_key)
+    )
+    # Snapshots written before entries were categorized have their categories
+    # re-derived, as legacy archives do
+    snapshot.entries = [
+        (
+            describe_backup_member(x.path, x.size, x.digest)
+            if x.category is None and x.account is None
+            else x
+        )
+        for x in snapshot.entries
+    ]
+
+    dest_paths: Dict[str, List[str]] = {}
+    for entry in select_manifest_entries(snapshot, account, category, member_path):
+        dest_path = get_restore_destination(entry.path)
+        if dest_path is None:
+            print(f"Skipping {entry.path}: no restore path")
+        elif entry.digest is None:
+            makedirs(dest_path, exist_ok=True)
+        else:
+            dest_paths.setdefault(entry.digest, []).append(dest_path)
+
+    def restore_blob(digest: str) -> Tuple[int, int, int]:
+        response = s3_client.get_object(Bucket=bucket_name, Key=get_blob_key(digest))
+        body = response["Body"].read()
+        contents = gzip.decompress(body)
+        for dest_path in dest_paths[digest]:
+            restore_file(io.BytesIO(contents), dest_path)
+        return (
+            len(dest_paths[digest]),
+            len(contents) * len(dest_paths[digest]),
+            len(body),
+        )
+
+    num_files = num_bytes = num_fetched = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for files, restored, fetched in executor.map(restore_blob, sorted(dest_paths)):
+            num_files += files
+            num_bytes += restored
+            num_fetched += fetched
+    return num_files, num_bytes, num_fetched
+
+
+def reinit_project_configs_from_snapshot(
+    config_dir_path: str,
+    timestamp: Optional[str] = None,
+    max_workers: int = 8,
+    account: Optional[str] = None,
+    category: Optional[str] = None,
+    member_path: Optional[str] = None,
+) -> bool:
+    """Pulls an incremental backup snapshot for project and puts its configs back in
+    their configuration "places".
+
+    Args:
+        config_dir_path (str): Path to the user configs directory, holding the
+            `reinit.yaml` config.
+        timestamp (str, optional): Restore the most recent snapshot taken at or
+            before this timestamp, defaults to the latest snapshot
+        max_workers (int, default=8): Maximum number of concurrent blob downloads
+        account (str, optional): Only restore entries belonging to this account
+        category (str, optional): Only restore entries of this category
+        member_path (str, optional): Only restore this entry, or the entries under
+            this folder
+
+    Returns:
+        (bool): True if the snapshot was restored successfully
+    """
+    ric = load_reinit_config(config_dir_path=config_dir_path)
+    bucket_name = ric.backup.bucket_name
+    start = time.monotonic()
+    try:
+        s3_client = get_reinit_s3_client(ric)
+        entry = get_backup(s3_client, bucket_name, "snapshot", timestamp)
+        print(f"Restoring s3://{bucket_name}/{entry.key}...")
+        with span("backup_snapshot_restore", account=account) as restore_span:
+            num_files, num_bytes, num_fetched = restore_backup_snapshot(
+                s3_client,
+                bucket_name,
+                entry.key,
+                max_workers=max_workers,
+                account=account,
+                category=category,
+                member_path=member_path,
+            )
+            restore_span.add_bytes(num_fetched)
+    except Exception as e:
+        print(f"An error occurred restoring from S3: {e}")
+        return False
+    secs = time.monotonic() - start
+    print(f"Downloaded {format_transfer_rate(num_fetched, secs)}")
+    print(f"Restored {num_files} files, {format_transfer_rate(num_bytes, secs)}")
+    return True
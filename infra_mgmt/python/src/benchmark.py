@@ -0,0 +1,622 @@
+"""Benchmarks of the user-config loading and Terraform config generation code paths.
+
+Synthetic user configurations are generated at several scales (hundreds of accounts,
+thousands of users and groups, one account-services file per account), along with
+stubbed Terraform org output JSON, so the generators can be timed without AWS access.
+Each benchmark case is timed end to end and, through the `instrumentation` spans,
+per phase. Results are appended to a JSON-lines file so scaling can be tracked
+across changes: within a run, the growth of each case between scales is reported as
+an exponent (1.0 is linear, 2.0 is quadratic), and each case is compared against the
+last recorded result of the same scale.
+"""
+
+import io
+import json
+import math
+import platform
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from os import makedirs, path, remove
+from typing import Callable, Dict, List, Optional
+
+import yaml
+
+from .instrumentation import record_trace, summarize_phases
+from .terraform.cache import clear_memory_cache, get_user_config_cache_path
+from .terraform.config import (
+    generate_individual_terraform_account_modules,
+    generate_initial_iam_inputs,
+    load_terraform_user_config,
+    validate_iam,
+)
+
+CURR_DIR = path.dirname(path.abspath(__file__))  # infra_mgmt/python/src
+INFRA_MGMT_DIR = path.dirname(path.dirname(CURR_DIR))  # infra_mgmt
+
+RESULTS_PATH = path.join(
+    INFRA_MGMT_DIR, "terraform", ".logs", "benchmarks", "results.jsonl"
+)
+
+# Terraform modules referenced by the synthetic account-services configs
+MODULE_NAMES = ["cicd", "iam_users_groups", "test-webapp", "vpc-vpn", "vpc-vpn-client"]
+
+# VPC/VPN octets are single CIDR octets, so at most this many accounts get a VPC
+MAX_VPC_ACCOUNTS = 250
+
+# Growth exponents between scales above this are reported as superlinear
+SUPERLINEAR_EXPONENT = 1.5
+
+# Median times this much slower than the last recorded result are regressions
+REGRESSION_RATIO = 1.25
+
+# Cases faster than this are too noisy to compare or report exponents for
+MIN_COMPARABLE_SECONDS = 0.01
+
+
+@dataclass
+class BenchmarkScale:
+    """Size of a synthetic organization"""
+
+    name: str
+    accounts: int
+    users: int
+    groups: int
+
+
+SCALES = {
+    "small": BenchmarkScale(name="small", accounts=50, users=500, groups=100),
+    "medium": BenchmarkScale(name="medium", accounts=200, users=2000, groups=400),
+    "large": BenchmarkScale(name="large", accounts=500, users=5000, groups=1000),
+}
+
+
+@dataclass
+class BenchmarkFixture:
+    """Paths to a generated synthetic organization"""
+
+    scale: BenchmarkScale
+    config_dir: str
+    tf_modules_dir: str
+    org_output_path: str
+    iam_inputs_path: str
+    accounts_tf_build_dir: str
+
+
+@dataclass
+class BenchmarkCase:
+    """A timed code path. `setup` runs, untimed, before every repetition."""
+
+    name: str
+    run: Callable[[], None]
+    setup: Callable[[], None] = lambda: None
+
+
+@dataclass
+class BenchmarkCaseResult:
+    name: str
+    times: List[float]
+    phases: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+
+def get_account_names(num_accounts: int) -> List[str]:
+    return [f"Account-{i:04d}" for i in range(1, num_accounts + 1)]
+
+
+def get_group_names(num_groups: int) -> List[str]:
+    """Returns group names, a third each of developer, admin and read-only groups,
+    plus an `Admin-All` group."""
+    roles = ["Developer", "Admin", "ReadOnly"]
+    names = [f"Team-{i // 3 + 1:04d}-{roles[i % 3]}" for i in range(num_groups - 1)]
+    return names + ["Admin-All"]
+
+
+def generate_synthetic_user_config(
+    config_dir: str, scale: BenchmarkScale, seed: int = 0
+) -> None:
+    """Writes a synthetic user-configurations directory.
+
+    Every account has an account-services file: every other account a VPC/VPN (up to
+    `MAX_VPC_ACCOUNTS`), every third a CICD service with a few Python packages, and
+    every fifth a test webapp. Each group grants access to a handful of accounts, and
+    each user belongs to a few groups, a third of them with VPN access.
+
+    Args:
+        config_dir (str): Path to user-configurations directory to write
+        scale (BenchmarkScale): Size of the synthetic organization
+        seed (int, default=0): Random seed, so fixtures are reproducible
+    """
+    rng = random.Random(seed)
+    accounts = get_account_names(scale.accounts)
+    groups = get_group_names(scale.groups)
+    acc_serv_dir = path.join(config_dir, "account-services")
+    makedirs(acc_serv_dir, exist_ok=True)
+
+    header = {
+        "base_email": "ops@example.com",
+        "org_name": "Benchmark Org",
+        "org_alias": "bench",
+        "org_email": "org@example.com",
+        "org_prefix": "bench",
+        "aws_profiles": {
+            x: {"profile": "bench", "region": "us-west-2"}
+            for x in ["backend", "identity_center", "org_main"]
+        },
+        "backend": {"bucket_name": "bench-tfstate", "dynamodb_table_name": "bench"},
+        "parent_id": "r-bench",
+        "managed_accounts": {
+            x: ({"email": f"{x.lower()}@example.com"} if i % 2 else None)
+            for i, x in enumerate(accounts)
+        },
+    }
+    group_accounts = {
+        x: sorted(rng.sample(accounts, min(len(accounts), rng.randint(1, 5))))
+        for x in groups[:-1]
+    }
+    group_accounts["Admin-All"] = accounts
+    users = []
+    for i in range(1, scale.users + 1):
+        users.append(
+            {
+                "display_name": f"User {i}",
+                "user_name": f"user.{i:05d}",
+                "name": {"given_name": "User", "family_name": f"{i:05d}"},
+                "email": f"user.{i:05d}@example.com",
+                "groups": rng.sample(groups[:-1], min(len(groups) - 1, 3))
+                + (["Admin-All"] if i % 100 == 0 else []),
+                "vpn_access": i % 3 == 0,
+            }
+        )
+    iam = {"groups": groups, "group_accounts": group_accounts, "users": users}
+    vpc_header = {
+        "vpc_cidr_block_base": "10.0.0.0/16",
+        "subnet_cidr_block": "10.0.1.0/24",
+        "public_subnet_cidr_block_base": "10.0.2.0/24",
+        "client_cidr_block_base": "172.16.0.0/22",
+        "server_certificate": {"common_name": "", "organization": ""},
+    }
+
+    for fname, data in [
+        ("header.yaml", header),
+        ("iam.yaml", iam),
+        ("vpc-vpn-header.yaml", vpc_header),
+    ]:
+        with open(path.join(config_dir, fname), "w") as f:
+            yaml.safe_dump(data, f, sort_keys=False)
+
+    for i, acc_name in enumerate(accounts):
+        services = {}
+        if i % 3 == 0:
+            services["cicd"] = {
+                "git": "S3",
+                "packages": {
+                    "python": [
+                        {
+                            "name": f"{acc_name.lower()}-pkg-{j}",
+                            "terminal_background_color": "#1e1e1e",
+                        }
+                        for j in range(rng.randint(1, 3))
+                    ]
+                },
+            }
+        if i % 2 == 0 and i // 2 < MAX_VPC_ACCOUNTS:
+            octet = str(i // 2 + 1)
+            services["vpc-vpn"] = {
+                "account-octets": {"vpc_and_subnet": octet, "client": octet}
+            }
+        if i % 5 == 0:
+            services["test-webapp"] = {}
+        fpath = path.join(acc_serv_dir, f"{acc_name}.services.yaml")
+        with open(fpath, "w") as f:
+            yaml.safe_dump(services, f, sort_keys=False)
+
+
+def generate_stub_org_output(org_output_path: str, account_names: List[str]) -> None:
+    """Writes a stubbed Terraform org output JSON file, in `terraform output -json`
+    format, for the given accounts.
+
+    Args:
+        org_output_path (str): Path to org_output.json file to write
+        account_names (List[str]): Account names
+    """
+    ids = {x: f"{100000000000 + i}" for i, x in enumerate(account_names)}
+    outputs = {
+        "account_arns": {
+            x: f"arn:aws:organizations::000000000000:account/o-bench/{ids[x]}"
+            for x in account_names
+        },
+        "account_ids": ids,
+        "assumable_role_arns": {
+            x: f"arn:aws:iam::{ids[x]}:role/OrganizationAccountAccessRole"
+            for x in account_names
+        },
+        "landing_parent_ids": {x: "ou-bench-landing" for x in account_names},
+    }
+    makedirs(path.dirname(org_output_path), exist_ok=True)
+    with open(org_output_path, "w") as f:
+        json.dump(
+            {
+                k: {"sensitive": False, "type": ["map", "string"], "value": v}
+                for k, v in outputs.items()
+            },
+            f,
+        )
+
+
+def generate_benchmark_fixture(
+    work_dir: str, scale: BenchmarkScale, seed: int = 0
+) -> BenchmarkFixture:
+    """Generates a synthetic user configuration, Terraform modules directory and
+    stubbed org output under `<work_dir>/<scale name>`.
+
+    Args:
+        work_dir (str): Path to directory fixtures are generated in
+        scale (BenchmarkScale): Size of the synthetic organization
+        seed (int, default=0): Random seed
+
+    Returns:
+        (BenchmarkFixture): Fixture paths
+    """
+    root = path.join(work_dir, scale.name)
+    tf_dir = path.join(root, "terraform")
+    fixture = BenchmarkFixture(
+        scale=scale,
+        config_dir=path.join(root, "user_configs"),
+        tf_modules_dir=path.join(tf_dir, "modules"),
+        org_output_path=path.join(tf_dir, ".config", "org", "org_output.json"),
+        iam_inputs_path=path.join(tf_dir, ".config", "iam", "iam_users.json"),
+        accounts_tf_build_dir=path.join(tf_dir, ".build", "accounts"),
+    )
+    generate_synthetic_user_config(fixture.config_dir, scale, seed=seed)
+    for name in MODULE_NAMES:
+        makedirs(path.join(fixture.tf_modules_dir, name), exist_ok=True)
+    generate_stub_org_output(fixture.org_output_path, get_account_names(scale.accounts))
+    makedirs(path.dirname(fixture.iam_inputs_path), exist_ok=True)
+    return fixture
+
+
+def clear_user_config_cache(fixture: BenchmarkFixture) -> None:
+    """Clears the in-process and on-disk user config caches of a fixture."""
+    clear_memory_cache()
+    cache_path = get_user_config_cache_path(fixture.tf_modules_dir)
+    if path.isfile(cache_path):
+        remove(cache_path)
+
+
+def get_benchmark_cases(fixture: BenchmarkFixture) -> List[BenchmarkCase]:
+    """Returns the benchmark cases of a fixture.
+
+    Generators are timed "cold", i.e., as a fresh process with no user config cache
+    would run them; account module generation is also timed "warm", re-run against
+    an unchanged manifest.
+
+    Args:
+        fixture (BenchmarkFixture): Fixture paths
+
+    Returns:
+        (List[BenchmarkCase]): Benchmark cases
+    """
+    f = fixture
+    parsed = load_terraform_user_config(f.config_dir, f.tf_modules_dir, use_cache=False)
+
+    def load_cached_setup():
+        clear_memory_cache()
+        load_terraform_user_config(f.config_dir, f.tf_modules_dir)
+        clear_memory_cache()
+
+    def iam_inputs():
+        generate_initial_iam_inputs(
+            f.config_dir, f.tf_modules_dir, f.org_output_path, f.iam_inputs_path
+        )
+
+    def account_modules():
+        generate_individual_terraform_account_modules(
+            config_dir_path=f.config_dir,
+            tf_modules_dir=f.tf_modules_dir,
+            org_output_path=f.org_output_path,
+            accounts_tf_build_dir=f.accounts_tf_build_dir,
+        )
+
+    def account_modules_cold_setup():
+        clear_user_config_cache(f)
+        shutil.rmtree(f.accounts_tf_build_dir, ignore_errors=True)
+        makedirs(f.accounts_tf_build_dir)
+
+    def account_modules_warm_setup():
+        clear_user_config_cache(f)
+        if not path.isdir(f.accounts_tf_build_dir):
+            makedirs(f.accounts_tf_build_dir)
+            account_modules()
+        clear_user_config_cache(f)
+
+    # Account module generation reads the IAM inputs
+    iam_inputs()
+    return [
+        BenchmarkCase(
+            name="load_terraform_user_config:cold",
+            run=lambda: load_terraform_user_config(
+                f.config_dir, f.tf_modules_dir, use_cache=False
+            ),
+        ),
+        BenchmarkCase(
+            name="load_terraform_user_config:cached",
+            run=lambda: load_terraform_user_config(f.config_dir, f.tf_modules_dir),
+            setup=load_cached_setup,
+        ),
+        BenchmarkCase(
+            name="validate_iam",
+            run=lambda: validate_iam(parsed, parsed.iam),
+        ),
+        BenchmarkCase(
+            name="generate_initial_iam_inputs:cold",
+            run=iam_inputs,
+            setup=lambda: clear_user_config_cache(f),
+        ),
+        BenchmarkCase(
+            name="generate_individual_terraform_account_modules:cold",
+            run=account_modules,
+            setup=account_modules_cold_setup,
+        ),
+        BenchmarkCase(
+            name="generate_individual_terraform_account_modules:warm",
+            run=account_modules,
+            setup=account_modules_warm_setup,
+        ),
+    ]
+
+
+def run_benchmark_case(case: BenchmarkCase, repeats: int = 3) -> BenchmarkCaseResult:
+    """Times a benchmark case, recording the mean time of each phase across
+    repetitions. Output printed by the timed code is discarded.
+
+    Args:
+        case (BenchmarkCase): Benchmark case
+        repeats (int, default=3): Number of timed repetitions
+
+    Returns:
+        (BenchmarkCaseResult): Timings
+    """
+    result = BenchmarkCaseResult(name=case.name, times=[])
+    phase_totals: Dict[str, float] = {}
+    for _ in range(repeats):
+        case.setup()
+        with redirect_stdout(io.StringIO()), record_trace(case.name) as trace:
+            start = time.perf_counter()
+            case.run()
+            result.times.append(time.perf_counter() - start)
+        for phase, agg in summarize_phases(trace.spans).items():
+            if phase != case.name:
+                phase_totals[phase] = phase_totals.get(phase, 0.0) + agg["total"]
+    result.phases = {k: v / repeats for k, v in sorted(phase_totals.items())}
+    return result
+
+
+def get_scaling_exponents(
+    results: Dict[str, Dict[str, BenchmarkCaseResult]],
+) -> Dict[str, Dict[str, float]]:
+    """Estimates how each case grows between consecutive scales of a run, as the
+    exponent `k` in `time ~ size^k`, where size is the number of accounts (every scale
+    dimension grows in proportion).
+
+    Args:
+        results (Dict[str, Dict[str, BenchmarkCaseResult]]): Case results keyed on
+            scale name, then case name, with scales in ascending size
+
+    Returns:
+        (Dict[str, Dict[str, float]]): Exponents keyed on case name, then
+            `<smaller scale>-><larger scale>`
+    """
+    exponents: Dict[str, Dict[str, float]] = {}
+    scale_names = list(results)
+    for small, large in zip(scale_names, scale_names[1:]):
+        size_ratio = SCALES[large].accounts / SCALES[small].accounts
+        for case_name, small_result in results[small].items():
+            large_result = results[large].get(case_name)
+            if large_result is None or small_result.median < MIN_COMPARABLE_SECONDS:
+                continue
+            exponent = math.log(large_result.median / small_result.median) / math.log(
+                size_ratio
+            )
+            exponents.setdefault(case_name, {})[f"{small}->{large}"] = exponent
+    return exponents
+
+
+def load_benchmark_results(results_path: str) -> List[dict]:
+    """Reads recorded benchmark runs, oldest first.
+
+    Args:
+        results_path (str): Path to results JSON-lines file
+
+    Returns:
+        (List[dict]): Recorded runs
+    """
+    if not path.isfile(results_path):
+        return []
+    with open(results_path, "r", encoding="utf-8") as f:
+        return [json.loads(x) for x in f if x.strip()]
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, BenchmarkCaseResult]],
+    previous_runs: List[dict],
+) -> List[str]:
+    """Compares case medians against the last recorded run of the same scale.
+
+    Args:
+        results (Dict[str, Dict[str, BenchmarkCaseResult]]): Case results keyed on
+            scale name, then case name
+        previous_runs (List[dict]): Recorded runs, oldest first
+
+    Returns:
+        (List[str]): Descriptions of cases slower than `REGRESSION_RATIO` times their
+            last recorded median
+    """
+    regressions = []
+    for scale_name, cases in results.items():
+        previous = next(
+            (
+                run["scales"][scale_name]
+                for run in reversed(previous_runs)
+                if scale_name in run["scales"]
+                and run["scales"][scale_name]["scale"] == asdict(SCALES[scale_name])
+            ),
+            None,
+        )
+        if previous is None:
+            continue
+        for case_name, result in cases.items():
+            old = previous["cases"].get(case_name)
+            if old is None or old["median"] < MIN_COMPARABLE_SECONDS:
+                continue
+            if result.median > old["median"] * REGRESSION_RATIO:
+                regressions.append(
+                    f"{scale_name} {case_name}: {result.median:.3f}s vs "
+                    f"{old['median']:.3f}s ({result.median / old['median']:.2f}x)"
+                )
+    return regressions
+
+
+def record_benchmark_results(
+    results_path: str,
+    results: Dict[str, Dict[str, BenchmarkCaseResult]],
+    exponents: Dict[str, Dict[str, float]],
+    repeats: int,
+) -> None:
+    """Appends a benchmark run to the results JSON-lines file.
+
+    Args:
+        results_path (str): Path to results JSON-lines file
+        results (Dict[str, Dict[str, BenchmarkCaseResult]]): Case results keyed on
+            scale name, then case name
+        exponents (Dict[str, Dict[str, float]]): Output of `get_scaling_exponents`
+        repeats (int): Number of timed repetitions per case
+    """
+    run = {
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "scales": {
+            scale_name: {
+                "scale": asdict(SCALES[scale_name]),
+                "cases": {
+                    x.name: {
+                        "median": x.median,
+                        "min": x.min,
+                        "times": x.times,
+                        "phases": x.phases,
+                    }
+                    for x in cases.values()
+                },
+            }
+            for scale_name, cases in results.items()
+        },
+        "exponents": exponents,
+    }
+    makedirs(path.dirname(results_path), exist_ok=True)
+    with open(results_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run) + "\n")
+
+
+def format_benchmark_results(
+    results: Dict[str, Dict[str, BenchmarkCaseResult]],
+    exponents: Dict[str, Dict[str, float]],
+    regressions: List[str],
+) -> str:
+    """Formats a report of case timings, their phases, scaling exponents and
+    regressions.
+
+    Args:
+        results (Dict[str, Dict[str, BenchmarkCaseResult]]): Case results keyed on
+            scale name, then case name
+        exponents (Dict[str, Dict[str, float]]): Output of `get_scaling_exponents`
+        regressions (List[str]): Output of `find_regressions`
+
+    Returns:
+        (str): Report
+    """
+    lines = []
+    for scale_name, cases in results.items():
+        scale = SCALES[scale_name]
+        lines.append(
+            f"== {scale_name}: {scale.accounts} accounts, {scale.users} users, "
+            f"{scale.groups} groups"
+        )
+        width = max(len(x) for x in cases)
+        for result in cases.values():
+            lines.append(
+                f"{result.name:<{width}}  median {result.median:>8.3f}s  "
+                f"min {result.min:>8.3f}s"
+            )
+            for phase, duration in result.phases.items():
+                lines.append(f"    {phase:<{width - 4}}  {duration:>15.3f}s")
+    if exponents:
+        lines.append("\nScaling exponents (1.0 linear, 2.0 quadratic):")
+        for case_name, case_exponents in exponents.items():
+            formatted = []
+            for step, exponent in case_exponents.items():
+                flag = " (superlinear)" if exponent > SUPERLINEAR_EXPONENT else ""
+                formatted.append(f"{step} {exponent:.2f}{flag}")
+            lines.append(f"    {case_name}: {', '.join(formatted)}")
+    if regressions:
+        lines.append("\nRegressions against the last recorded results:")
+        lines += [f"    {x}" for x in regressions]
+    return "\n".join(lines)
+
+
+def run_benchmarks(
+    scale_names: List[str],
+    repeats: int = 3,
+    results_path: str = RESULTS_PATH,
+    work_dir: Optional[str] = None,
+    record: bool = True,
+) -> List[str]:
+    """Generates fixtures for, and runs, every benchmark case at each scale, then
+    prints and records the results.
+
+    Args:
+        scale_names (List[str]): Names of `SCALES` to run
+        repeats (int, default=3): Number of timed repetitions per case
+        results_path (str, optional): Path to results JSON-lines file
+        work_dir (str, optional): Directory fixtures are generated in and kept,
+            defaults to a temporary directory removed afterwards
+        record (bool, default=True): Append the results to the results file
+
+    Returns:
+        (List[str]): Regressions against the last recorded results
+    """
+    scale_names = sorted(scale_names, key=lambda x: SCALES[x].accounts)
+    fixtures_dir = work_dir or tempfile.mkdtemp(prefix="infra-mgmt-bench-")
+    results: Dict[str, Dict[str, BenchmarkCaseResult]] = {}
+    try:
+        for scale_name in scale_names:
+            print(f"Generating {scale_name} fixture in {fixtures_dir}")
+            fixture = generate_benchmark_fixture(fixtures_dir, SCALES[scale_name])
+            results[scale_name] = {}
+            for case in get_benchmark_cases(fixture):
+                print(f"    {case.name}")
+                results[scale_name][case.name] = run_benchmark_case(case, repeats)
+    finally:
+        if work_dir is None:
+            shutil.rmtree(fixtures_dir, ignore_errors=True)
+
+    exponents = get_scaling_exponents(results)
+    regressions = find_regressions(results, load_benchmark_results(results_path))
+    print("\n" + format_benchmark_results(results, exponents, regressions))
+    if record:
+        record_benchmark_results(results_path, results, exponents, repeats)
+        print(f"\nResults appended to {results_path}")
+    return regressions
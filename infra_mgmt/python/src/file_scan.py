@@ -0,0 +1,61 @@
+"""`os.scandir`-based file discovery.
+
+Walks directory trees with `os.scandir`, which returns file types (and, on most
+platforms, sizes) from the directory listing itself, pruning any sub-tree matching
+a glob exclude rule before it is entered, e.g., `.terraform/providers` caches.
+"""
+
+from fnmatch import fnmatch
+from os import DirEntry, scandir
+from typing import Iterator, List, Sequence, Tuple
+
+
+def is_excluded(rel_path: str, exclude: Sequence[str]) -> bool:
+    """Checks a relative path against glob exclude rules.
+
+    A rule matches the whole relative path, or any trailing part of it starting at a
+    path component, so `.terraform/providers` excludes `<acct>/.terraform/providers`.
+
+    Args:
+        rel_path (str): Path relative to the scanned directory
+        exclude (Sequence[str]): Glob exclude rules
+
+    Returns:
+        (bool): True if the path is excluded
+    """
+    return any(fnmatch(rel_path, x) or fnmatch(rel_path, f"*/{x}") for x in exclude)
+
+
+def scan_directory(
+    directory: str, exclude: Sequence[str] = (), follow_symlinks: bool = True
+) -> Iterator[Tuple[DirEntry, str]]:
+    """Walks a directory tree, yielding every file and sub-directory not excluded,
+    parent directories before their contents.
+
+    Args:
+        directory (str): Path to the directory to scan
+        exclude (Sequence[str], optional): Glob exclude rules, matched against paths
+            relative to `directory`
+        follow_symlinks (bool, default=True): Descend into symlinked directories
+
+    Returns:
+        (Iterator[Tuple[DirEntry, str]]): Directory entries and their paths relative
+            to `directory`
+    """
+    stack: List[Tuple[str, str]] = [(directory, "")]
+    while stack:
+        dirpath, rel_dir = stack.pop()
+        try:
+            with scandir(dirpath) as it:
+                entries = sorted(it, key=lambda x: x.name)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if exclude and is_excluded(rel_path, exclude):
+                continue
+            yield entry, rel_path
+            if entry.is_dir(follow_symlinks=follow_symlinks):
+                subdirs.append((entry.path, rel_path))
+        stack.extend(reversed(subdirs))
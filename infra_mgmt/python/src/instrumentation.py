@@ -0,0 +1,357 @@
+"""Timing and profiling instrumentation.
+
+Code is instrumented with `span` context managers naming a phase and, optionally, the
+account it concerns. Spans cost next to nothing unless tracing is enabled, normally by
+a `bin/` entry point's `--trace`/`--profile` flags or the `INFRA_MGMT_TRACE`
+environment variable (`1`, or `profile`). When tracing is enabled, every span's
+duration, bytes processed and AWS API call counts are written to a JSON trace under
+the Terraform `.logs/traces` dir once the command finishes. Profiling additionally
+runs the command's main thread under cProfile.
+
+AWS API calls are counted through a botocore event hook registered on every session
+created by `get_boto3_session`, and attributed to the innermost open span of the
+calling thread.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import wraps
+from os import makedirs, path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+CURR_DIR = path.dirname(path.abspath(__file__))  # infra_mgmt/python/src
+INFRA_MGMT_DIR = path.dirname(path.dirname(CURR_DIR))  # infra_mgmt
+
+TRACES_DIR = path.join(INFRA_MGMT_DIR, "terraform", ".logs", "traces")
+
+TRACE_ENV_VAR = "INFRA_MGMT_TRACE"
+
+# Number of functions listed, by cumulative time, when a profiled command finishes
+PROFILE_TOP_N = 25
+
+
+@dataclass
+class Span:
+    """A timed phase of a command. `start` is relative to the start of the trace."""
+
+    phase: str
+    account: Optional[str] = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    start: float = 0.0
+    duration: float = 0.0
+    bytes: int = 0
+    api_calls: Dict[str, int] = field(default_factory=dict)
+    thread: Optional[str] = None
+    id: int = 0
+    parent: Optional[int] = None
+
+    def add_bytes(self, num_bytes: int) -> None:
+        self.bytes += num_bytes
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+@dataclass
+class Trace:
+    """Spans and API call totals recorded while tracing is enabled"""
+
+    command: str
+    started_at: str
+    started: float
+    spans: List[Span] = field(default_factory=list)
+    api_calls: Dict[str, int] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+_TRACE: Optional[Trace] = None
+_LOCAL = threading.local()
+
+
+def get_span_stack() -> List[Span]:
+    """Returns the calling thread's stack of open spans."""
+    if not hasattr(_LOCAL, "stack"):
+        _LOCAL.stack = []
+    return _LOCAL.stack
+
+
+def is_tracing() -> bool:
+    return _TRACE is not None
+
+
+@contextmanager
+def span(phase: str, account: Optional[str] = None, **attrs) -> Iterator[Span]:
+    """Times a phase of a command, when tracing is enabled.
+
+    Args:
+        phase (str): Phase name, e.g., `render_account_module`
+        account (str, optional): Account the phase concerns
+        **attrs: Extra attributes recorded with the span
+
+    Returns:
+        (Iterator[Span]): The span, to which bytes and attributes can be added
+    """
+    trace = _TRACE
+    current = Span(phase=phase, account=account, attrs=attrs)
+    if trace is None:
+        yield current
+        return
+
+    stack = get_span_stack()
+    current.parent = stack[-1].id if stack else None
+    current.thread = threading.current_thread().name
+    with trace.lock:
+        trace.spans.append(current)
+        current.id = len(trace.spans)
+    stack.append(current)
+    start = time.monotonic()
+    current.start = start - trace.started
+    try:
+        yield current
+    except BaseException as e:
+        current.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        current.duration = time.monotonic() - start
+        stack.pop()
+
+
+def traced(phase: str) -> Callable:
+    """Decorates a function so every call to it is timed as a span.
+
+    Args:
+        phase (str): Phase name
+
+    Returns:
+        (Callable): Decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(phase):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count_api_call(operation: str) -> None:
+    """Counts an AWS API call against the trace and the calling thread's innermost
+    open span.
+
+    Args:
+        operation (str): `<service>:<operation>`, e.g., `s3:ListObjectsV2`
+    """
+    trace = _TRACE
+    if trace is None:
+        return
+    stack = get_span_stack()
+    with trace.lock:
+        trace.api_calls[operation] = trace.api_calls.get(operation, 0) + 1
+        if stack:
+            calls = stack[-1].api_calls
+            calls[operation] = calls.get(operation, 0) + 1
+
+
+def _count_boto3_call(event_name: str, **kwargs) -> None:
+    # Event names are `before-parameter-build.<service>.<operation>`
+    _, service, operation = event_name.split(".", 2)
+    count_api_call(f"{service}:{operation}")
+
+
+def register_api_call_counter(session):
+    """Registers the API call counter on a boto3 session, counting every call made by
+    clients created from it.
+
+    Args:
+        session (boto3.Session): boto3 session
+
+    Returns:
+        (boto3.Session): The same session
+    """
+    session.events.register("before-parameter-build", _count_boto3_call)
+    return session
+
+
+def summarize_phases(spans: List[Span]) -> Dict[str, Dict[str, Any]]:
+    """Aggregates span counts, durations, bytes and API calls by phase.
+
+    Args:
+        spans (List[Span]): Recorded spans
+
+    Returns:
+        (Dict[str, Dict[str, Any]]): Phase names mapped to their aggregates
+    """
+    phases: Dict[str, Dict[str, Any]] = {}
+    for s in spans:
+        agg = phases.setdefault(
+            s.phase, {"count": 0, "total": 0.0, "max": 0.0, "bytes": 0, "api_calls": 0}
+        )
+        agg["count"] += 1
+        agg["total"] += s.duration
+        agg["max"] = max(agg["max"], s.duration)
+        agg["bytes"] += s.bytes
+        agg["api_calls"] += sum(s.api_calls.values())
+    return phases
+
+
+def format_phase_summary(phases: Dict[str, Dict[str, Any]]) -> str:
+    """Formats a table of per-phase aggregates, slowest phases first.
+
+    Args:
+        phases (Dict[str, Dict[str, Any]]): Output of `summarize_phases`
+
+    Returns:
+        (str): Summary table
+    """
+    width = max([len("Phase")] + [len(x) for x in phases])
+    lines = [
+        f"{'Phase':<{width}}  {'Count':>5}  {'Total':>9}  {'Max':>9}  "
+        f"{'Bytes':>12}  {'API calls':>9}",
+        f"{'-' * width}  {'-' * 5}  {'-' * 9}  {'-' * 9}  {'-' * 12}  {'-' * 9}",
+    ]
+    for phase, agg in sorted(phases.items(), key=lambda x: -x[1]["total"]):
+        lines.append(
+            f"{phase:<{width}}  {agg['count']:>5}  {agg['total']:>8.2f}s  "
+            f"{agg['max']:>8.2f}s  {agg['bytes']:>12}  {agg['api_calls']:>9}"
+        )
+    return "\n".join(lines)
+
+
+def write_trace(trace: Trace, trace_dir: str) -> str:
+    """Writes a trace to `<trace_dir>/<command>-<timestamp>.json`.
+
+    Args:
+        trace (Trace): Finished trace
+        trace_dir (str): Path to traces directory
+
+    Returns:
+        (str): Path to the trace file
+    """
+    makedirs(trace_dir, exist_ok=True)
+    trace_path = path.join(trace_dir, f"{trace.command}-{trace.started_at}.json")
+    with trace.lock:
+        spans = sorted(trace.spans, key=lambda x: x.start)
+        data = {
+            "command": trace.command,
+            "started_at": trace.started_at,
+            "duration": time.monotonic() - trace.started,
+            "api_calls": dict(sorted(trace.api_calls.items())),
+            "phases": summarize_phases(spans),
+            "spans": [asdict(x) for x in spans],
+        }
+    with open(trace_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=str)
+    return trace_path
+
+
+def get_trace_env_mode() -> Optional[str]:
+    """Returns `trace`, `profile` or None, per the `INFRA_MGMT_TRACE` env var."""
+    value = os.environ.get(TRACE_ENV_VAR, "").strip().lower()
+    if value in ["", "0", "false", "no"]:
+        return None
+    return "profile" if value == "profile" else "trace"
+
+
+@contextmanager
+def record_trace(command: str) -> Iterator[Trace]:
+    """Enables tracing in-process, recording every span opened in the context under a
+    root span named after the command.
+
+    Args:
+        command (str): Command name, used as the root span's phase
+
+    Returns:
+        (Iterator[Trace]): The trace being recorded
+    """
+    global _TRACE
+    if _TRACE is not None:
+        raise RuntimeError(f"Already tracing {_TRACE.command}")
+    _TRACE = Trace(
+        command=command,
+        started_at=datetime.now().strftime("%Y%m%d-%H%M%S"),
+        started=time.monotonic(),
+    )
+    try:
+        with span(command):
+            yield _TRACE
+    finally:
+        _TRACE = None
+
+
+@contextmanager
+def trace_command(
+    command: str,
+    trace: bool = False,
+    profile: bool = False,
+    trace_dir: str = TRACES_DIR,
+) -> Iterator[None]:
+    """Traces (and optionally profiles) a whole command, writing its trace when it
+    finishes, even if it fails.
+
+    Args:
+        command (str): Command name, used as the root span's phase and in the trace
+            filename
+        trace (bool, default=False): Write a JSON trace
+        profile (bool, default=False): Also run the command under cProfile, writing
+            `<trace>.prof` and listing the costliest functions
+        trace_dir (str, optional): Path to traces directory
+
+    Returns:
+        (Iterator[None]): Context in which the command runs
+    """
+    env_mode = get_trace_env_mode()
+    profile = profile or env_mode == "profile"
+    if not (trace or profile or env_mode):
+        yield
+        return
+
+    profiler = cProfile.Profile() if profile else None
+    recorded = None
+    try:
+        with record_trace(command) as recorded:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                yield
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+    finally:
+        if recorded is not None:
+            trace_path = write_trace(recorded, trace_dir)
+            print("\n" + format_phase_summary(summarize_phases(recorded.spans)))
+            print(f"\nTrace written to {trace_path}")
+            if profiler is not None:
+                profile_path = trace_path[: -len(".json")] + ".prof"
+                profiler.dump_stats(profile_path)
+                out = io.StringIO()
+                stats = pstats.Stats(profiler, stream=out)
+                stats.sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+                print(out.getvalue())
+                print(f"Profile written to {profile_path}")
+
+
+def add_trace_arguments(parser: ArgumentParser) -> None:
+    """Adds the `--trace` and `--profile` flags to a `bin/` entry point's parser."""
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help=f"Write a JSON timing trace to {TRACES_DIR}",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Also profile the command with cProfile (implies --trace)",
+    )
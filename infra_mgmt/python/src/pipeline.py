@@ -0,0 +1,800 @@
+"""Dependency-aware runner for the bootstrap pipeline.
+
+Models the README workflow (bootstrap → backend-config → org → iam → accounts-config
+→ accounts-init → accounts-apply → accounts-services-apply) as a DAG of stages, each
+declaring the files it reads and writes. Every stage runs in the same process, so
+user configs are loaded and validated once; independent branches run concurrently;
+and a stage is skipped when its inputs are unchanged since its last successful run
+and its outputs still exist.
+
+CICD discovery is its own branch: accounts already applied are discovered while the
+changed accounts are still being applied, and only the latter are discovered once
+`accounts-apply` finishes.
+"""
+
+import json
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from os import makedirs, path, remove, replace
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .file_scan import scan_directory
+from .instrumentation import span
+from .services.python_package.config import (
+    apply_cicd_plans,
+    get_cicd_account_services,
+    plan_cicd_accounts,
+)
+from .services.python_package.models import CicdAccountPlan
+from .terraform.config import (
+    generate_backend_tfvars,
+    generate_individual_terraform_account_modules,
+    generate_initial_iam_inputs,
+    generate_org_accounts_config,
+    generate_terrafrom_initial_iam_configs,
+    load_terraform_user_config,
+)
+from .terraform.manifest import get_dirty_accounts, get_manifest_path
+from .terraform.models import PipelineStageResult, PipelineState
+from .terraform.outputs import get_account_output_path
+from .terraform.plugin_cache import get_plugin_cache_env, provision_plugin_cache
+from .terraform.runner import (
+    format_run_summary,
+    list_account_dirs,
+    run_terraform_accounts,
+    write_terraform_output,
+)
+from .terraform.utils import file_digest, json_digest
+
+STATE_FILENAME = "pipeline_state.json"
+# Saved plan of a (non-account) root module, written to the module's directory
+PLAN_FILENAME = "tfplan"
+
+# Stages, in the order of the README workflow
+STAGE_NAMES = [
+    "bootstrap",
+    "backend-config",
+    "org",
+    "iam",
+    "accounts-config",
+    "accounts-init",
+    "accounts-apply",
+    "cicd-discovery",
+    "accounts-services-apply",
+]
+
+# Paths ignored when digesting directory inputs: Terraform working state, fetched
+# outputs, the account modules manifest (its dirty list changes on every apply) and
+# in-flight atomic writes and saved plans
+DIGEST_EXCLUDES = [
+    ".terraform",
+    ".terraform.lock.hcl",
+    ".output",
+    ".manifest.json",
+    "*.tmp",
+    PLAN_FILENAME,
+]
+
+# Backend outputs written to backend.hcl, mapped to their backend.hcl keys
+BACKEND_HCL_KEYS = {
+    "bucket": "s3_bucket_name",
+    "dynamodb_table": "dynamodb_table_name",
+    "region": "region",
+    "profile": "profile",
+}
+
+
+class PipelineError(Exception):
+    pass
+
+
+@dataclass
+class Stage:
+    """A pipeline stage. `inputs` and `outputs` are evaluated lazily, when the stage
+    is about to run, since some (e.g., per-account output files) are only known once
+    upstream stages finish. A stage declaring no inputs always runs."""
+
+    name: str
+    run: Callable[[], bool]
+    deps: List[str] = field(default_factory=list)
+    inputs: Callable[[], List[str]] = list
+    outputs: Callable[[], List[str]] = list
+
+
+@dataclass
+class PipelinePaths:
+    """Paths read and written by the bootstrap pipeline, matching the Makefile"""
+
+    user_config_dir: str
+    tf_dir: str
+    package_build_dir: str
+    modules_dir: str
+    backend_dir: str
+    backend_hcl: str
+    config_dir: str
+    org_tf_dir: str
+    org_config: str
+    org_output: str
+    iam_tf_dir: str
+    iam_config: str
+    iam_output: str
+    iam_module: str
+    accounts_dir: str
+    accounts_output_dir: str
+    logs_dir: str
+    plugin_cache_dir: str
+
+
+def get_pipeline_paths(
+    user_config_dir: str, tf_dir: str, package_build_dir: str
+) -> PipelinePaths:
+    """Derives every pipeline path from the user configs, Terraform and package
+    build directories.
+
+    Args:
+        user_config_dir (str): Path to user configuration directory
+        tf_dir (str): Path to the Terraform directory (`infra_mgmt/terraform`)
+        package_build_dir (str): Path to directory where packages are built
+
+    Returns:
+        (PipelinePaths): Pipeline paths
+    """
+    config_dir = path.join(tf_dir, ".config")
+    accounts_dir = path.join(tf_dir, ".build", "accounts")
+    return PipelinePaths(
+        user_config_dir=user_config_dir,
+        tf_dir=tf_dir,
+        package_build_dir=package_build_dir,
+        modules_dir=path.join(tf_dir, "modules"),
+        backend_dir=path.join(tf_dir, "backend"),
+        backend_hcl=path.join(tf_dir, "backend", "backend.hcl"),
+        config_dir=config_dir,
+        org_tf_dir=path.join(tf_dir, "org"),
+        org_config=path.join(config_dir, "org", "org.json"),
+        org_output=path.join(config_dir, "org", "org_output.json"),
+        iam_tf_dir=path.join(tf_dir, ".build", "iam"),
+        iam_config=path.join(config_dir, "iam", "iam_users.json"),
+        iam_output=path.join(config_dir, "iam", "iam_output.json"),
+        iam_module=path.join(tf_dir, "modules", "iam_users_groups"),
+        accounts_dir=accounts_dir,
+        accounts_output_dir=path.join(accounts_dir, ".output"),
+        logs_dir=path.join(tf_dir, ".logs"),
+        plugin_cache_dir=path.join(tf_dir, ".plugin-cache"),
+    )
+
+
+def path_digest(input_path: str) -> Optional[str]:
+    """Returns the digest of a file, or of every file in a directory tree (excluding
+    `DIGEST_EXCLUDES`), or None if the path does not exist.
+
+    Args:
+        input_path (str): Path to a file or directory
+
+    Returns:
+        (Optional[str]): Hex digest
+    """
+    if not path.isdir(input_path):
+        return file_digest(input_path)
+    return json_digest(
+        {
+            rel_path: file_digest(entry.path)
+            for entry, rel_path in scan_directory(input_path, DIGEST_EXCLUDES)
+            if entry.is_file()
+        }
+    )
+
+
+def get_inputs_digest(stage: Stage) -> Optional[str]:
+    """Returns the digest of a stage's inputs, or None if it declares none."""
+    inputs = stage.inputs()
+    if not inputs:
+        return None
+    return json_digest({x: path_digest(x) for x in inputs})
+
+
+def get_pipeline_state_path(tf_dir: str) -> str:
+    return path.join(tf_dir, ".config", STATE_FILENAME)
+
+
+def load_pipeline_state(state_path: str) -> PipelineState:
+    """Loads the pipeline state, or an empty one if none exists (or it is corrupt)."""
+    if not path.isfile(state_path):
+        return PipelineState()
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            return PipelineState.model_validate_json(f.read())
+    except ValueError:
+        return PipelineState()
+
+
+def write_pipeline_state(state_path: str, state: PipelineState) -> None:
+    """Atomically writes the pipeline state."""
+    makedirs(path.dirname(state_path), exist_ok=True)
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(state.model_dump_json(indent=4))
+    replace(tmp_path, state_path)
+
+
+def is_stage_current(stage: Stage, state: PipelineState) -> bool:
+    """Checks whether a stage's inputs are unchanged since its last successful run
+    and its outputs still exist.
+
+    Args:
+        stage (Stage): Pipeline stage
+        state (PipelineState): Pipeline state
+
+    Returns:
+        (bool): True if the stage can be skipped
+    """
+    digest = get_inputs_digest(stage)
+    if digest is None or state.stages.get(stage.name) != digest:
+        return False
+    return all(path.exists(x) for x in stage.outputs())
+
+
+def select_stages(stages: Dict[str, Stage], targets: Sequence[str]) -> List[str]:
+    """Selects target stages and every stage they depend on, in dependency order.
+
+    Args:
+        stages (Dict[str, Stage]): Stages by name
+        targets (Sequence[str]): Target stage names
+
+    Returns:
+        (List[str]): Selected stage names, each after all of its dependencies
+    """
+    ordered: List[str] = []
+    visiting = set()
+
+    def visit(name: str) -> None:
+        if name in ordered:
+            return
+        if name not in stages:
+            raise PipelineError(f"Unknown stage `{name}`")
+        if name in visiting:
+            raise PipelineError(f"Dependency cycle through stage `{name}`")
+        visiting.add(name)
+        for dep in stages[name].deps:
+            visit(dep)
+        visiting.remove(name)
+        ordered.append(name)
+
+    for name in targets:
+        visit(name)
+    return ordered
+
+
+def run_pipeline(
+    stages: List[Stage],
+    state_path: str,
+    targets: Optional[Sequence[str]] = None,
+    force: bool = False,
+    dry_run: bool = False,
+) -> List[PipelineStageResult]:
+    """Runs pipeline stages as soon as their dependencies have finished, skipping
+    those whose inputs are unchanged.
+
+    A stage whose dependency failed is not run and is reported as blocked. The
+    input digest of each successful stage is recorded once it finishes.
+
+    Args:
+        stages (List[Stage]): Pipeline stages
+        state_path (str): Path to the pipeline state file
+        targets (Sequence[str], optional): Stages to run (along with everything they
+            depend on), defaults to every stage
+        force (bool, default=False): Run every selected stage, even if current
+        dry_run (bool, default=False): Only report which stages are stale
+
+    Returns:
+        (List[PipelineStageResult]): Outcomes, in dependency order
+    """
+    by_name = {x.name: x for x in stages}
+    selected = select_stages(by_name, targets or [x.name for x in stages])
+    state = load_pipeline_state(state_path)
+
+    if dry_run:
+        return [
+            PipelineStageResult(
+                stage=name,
+                status="current" if is_stage_current(by_name[name], state) else "stale",
+            )
+            for name in selected
+        ]
+
+    lock = threading.Lock()
+
+    def execute(stage: Stage) -> PipelineStageResult:
+        start = time.monotonic()
+        if not force and is_stage_current(stage, state):
+            print(f">>> {stage.name}: inputs unchanged, skipping")
+            return PipelineStageResult(
+                stage=stage.name, status="skipped", reason="inputs unchanged"
+            )
+        print(f"\n>>> {stage.name}: running...")
+        reason = None
+        try:
+            with span(f"stage:{stage.name}"):
+                success = stage.run()
+        except Exception as e:
+            success = False
+            reason = f"{type(e).__name__}: {e}"
+        duration = time.monotonic() - start
+        if success:
+            digest = get_inputs_digest(stage)
+            if digest is not None:
+                with lock:
+                    state.stages[stage.name] = digest
+                    write_pipeline_state(state_path, state)
+        status = "ran" if success else "failed"
+        print(f">>> {stage.name}: {status} ({duration:.1f}s)")
+        return PipelineStageResult(
+            stage=stage.name, status=status, duration=duration, reason=reason
+        )
+
+    results: Dict[str, PipelineStageResult] = {}
+    pending = list(selected)
+    # Stages mostly wait on Terraform and AWS, so every ready stage gets a thread
+    with ThreadPoolExecutor(max_workers=len(selected)) as executor:
+        running = {}
+        while pending or running:
+            for name in list(pending):
+                deps = by_name[name].deps
+                if not all(x in results for x in deps):
+                    continue
+                pending.remove(name)
+                failed = [x for x in deps if results[x].status in ["failed", "blocked"]]
+                if failed:
+                    results[name] = PipelineStageResult(
+                        stage=name, status="blocked", reason=f"{failed[0]} failed"
+                    )
+                    continue
+                running[executor.submit(execute, by_name[name])] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    return [results[x] for x in selected]
+
+
+def format_pipeline_summary(results: List[PipelineStageResult]) -> str:
+    """Formats a status and duration summary table of pipeline stages.
+
+    Args:
+        results (List[PipelineStageResult]): Outcomes of pipeline stages
+
+    Returns:
+        (str): Summary table
+    """
+    width = max([len("Stage")] + [len(x.stage) for x in results])
+    lines = [
+        f"{'Stage':<{width}}  {'Status':<7}  {'Duration':>9}  Reason",
+        f"{'-' * width}  {'-' * 7}  {'-' * 9}  {'-' * 6}",
+    ]
+    for res in results:
+        lines.append(
+            f"{res.stage:<{width}}  {res.status:<7}  {res.duration:>8.1f}s  "
+            f"{res.reason or ''}"
+        )
+    return "\n".join(lines)
+
+
+def run_logged(
+    commands: List[tuple], log_path: str, env: Optional[Dict[str, str]] = None
+) -> bool:
+    """Runs commands in sequence, writing their output to a log file.
+
+    Args:
+        commands (List[tuple]): Commands to run
+        log_path (str): Path to log file
+        env (Dict[str, str], optional): Environment to run the commands with
+
+    Returns:
+        (bool): True if every command succeeded
+    """
+    makedirs(path.dirname(log_path), exist_ok=True)
+    with open(log_path, "w", encoding="utf-8") as log:
+        for command in commands:
+            returncode = subprocess.run(
+                command,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                env=env,
+            ).returncode
+            if returncode != 0:
+                print(f"Failed: {' '.join(command)}, see {log_path}")
+                return False
+    return True
+
+
+def confirm_terraform_plan(name: str) -> bool:
+    """Asks the user to confirm a root module's Terraform plan.
+
+    Args:
+        name (str): Root module name
+
+    Returns:
+        (bool): True if the user confirmed the plan
+    """
+    user_input = input(f"Apply {name} plan? (only `yes` is accepted for continuing):")
+    if user_input != "yes":
+        print(f"User declined {name} plan application, stopping.")
+        return False
+    return True
+
+
+def apply_terraform_root_module(
+    name: str,
+    module_dir: str,
+    var_file: str,
+    state_key: str,
+    output_path: str,
+    paths: PipelinePaths,
+    confirm: bool = False,
+) -> bool:
+    """Initializes, plans and applies a (non-account) root module, e.g., org or IAM,
+    then writes its outputs.
+
+    The saved plan is applied, so what is applied is exactly what was planned (and,
+    if confirming, shown).
+
+    Args:
+        name (str): Root module name, used for its log file
+            (`.logs/<name>/<name>-applying.log`)
+        module_dir (str): Path to root module directory
+        var_file (str): Path to Terraform variables file
+        state_key (str): Backend state key
+        output_path (str): Path to file `terraform output -json` is written to
+        paths (PipelinePaths): Pipeline paths
+        confirm (bool, default=False): Show the plan and ask the user to confirm it
+            before applying
+
+    Returns:
+        (bool): True if the module was applied and its outputs written
+    """
+    env = get_plugin_cache_env(provision_plugin_cache(paths.plugin_cache_dir))
+    chdir = f"-chdir={module_dir}"
+    commands = [
+        (
+            "terraform",
+            chdir,
+            "init",
+            "-no-color",
+            "-input=false",
+            f"-backend-config={paths.backend_hcl}",
+            f"-backend-config=key={state_key}",
+        ),
+        (
+            "terraform",
+            chdir,
+            "plan",
+            "-no-color",
+            "-input=false",
+            f"-var-file={var_file}",
+            f"-out={PLAN_FILENAME}",
+        ),
+    ]
+    plan_path = path.join(module_dir, PLAN_FILENAME)
+    try:
+        log_path = path.join(paths.logs_dir, name, f"{name}-planning.log")
+        if not run_logged(commands, log_path, env):
+            return False
+        if confirm:
+            show = subprocess.run(
+                ("terraform", chdir, "show", "-no-color", PLAN_FILENAME),
+                capture_output=True,
+                text=True,
+                stdin=subprocess.DEVNULL,
+                env=env,
+            )
+            if show.returncode != 0:
+                print(f"Failed: terraform {chdir} show {PLAN_FILENAME}")
+                print(show.stderr)
+                return False
+            print(show.stdout)
+            if not confirm_terraform_plan(name):
+                return False
+
+        command = (
+            "terraform",
+            chdir,
+            "apply",
+            "-no-color",
+            "-input=false",
+            PLAN_FILENAME,
+        )
+        log_path = path.join(paths.logs_dir, name, f"{name}-applying.log")
+        if not run_logged([command], log_path, env):
+            return False
+    finally:
+        if path.isfile(plan_path):
+            remove(plan_path)
+    makedirs(path.dirname(output_path), exist_ok=True)
+    if not write_terraform_output(module_dir, output_path, env):
+        print(f"Failed: terraform {chdir} output -json")
+        return False
+    return True
+
+
+def write_backend_hcl(backend_dir: str, backend_hcl: str) -> bool:
+    """Writes backend.hcl from the bootstrapped backend's outputs, fetched with a
+    single `terraform output -json` call.
+
+    Args:
+        backend_dir (str): Path to backend Terraform dir
+        backend_hcl (str): Path to backend.hcl file
+
+    Returns:
+        (bool): True if the outputs were fetched and backend.hcl written
+    """
+    result = subprocess.run(
+        ("terraform", f"-chdir={backend_dir}", "output", "-json"),
+        capture_output=True,
+        text=True,
+        stdin=subprocess.DEVNULL,
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        return False
+    outputs = json.loads(result.stdout)
+    missing = [x for x in BACKEND_HCL_KEYS.values() if x not in outputs]
+    if missing:
+        print(f"Backend outputs missing: {', '.join(missing)}")
+        return False
+    width = max(len(x) for x in BACKEND_HCL_KEYS)
+    content = "".join(
+        f'{key:<{width}} = "{outputs[output]["value"]}"\n'
+        for key, output in BACKEND_HCL_KEYS.items()
+    )
+    tmp_path = backend_hcl + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    replace(tmp_path, backend_hcl)
+    return True
+
+
+def build_bootstrap_stages(
+    paths: PipelinePaths, max_workers: int = 4, confirm: bool = True
+) -> List[Stage]:
+    """Builds the bootstrap pipeline stages.
+
+    Args:
+        paths (PipelinePaths): Pipeline paths
+        max_workers (int, default=4): Maximum number of accounts Terraform runs
+            against, or CICD services are discovered for, concurrently
+        confirm (bool, default=True): Ask the user to confirm the org and CICD plans
+
+    Returns:
+        (List[Stage]): Pipeline stages
+    """
+    header_yaml = path.join(paths.user_config_dir, "header.yaml")
+    iam_yaml = path.join(paths.user_config_dir, "iam.yaml")
+    # CICD plans of accounts discovered by `cicd-discovery`
+    discovered: Dict[str, CicdAccountPlan] = {}
+
+    def load_config():
+        return load_terraform_user_config(paths.user_config_dir, paths.modules_dir)
+
+    def account_output_path(account: str) -> str:
+        return get_account_output_path(paths.accounts_output_dir, account)
+
+    def bootstrap() -> bool:
+        generate_backend_tfvars(
+            paths.user_config_dir, paths.modules_dir, paths.backend_dir
+        )
+        return True
+
+    def backend_config() -> bool:
+        return write_backend_hcl(paths.backend_dir, paths.backend_hcl)
+
+    def org() -> bool:
+        makedirs(path.dirname(paths.org_config), exist_ok=True)
+        generate_org_accounts_config(
+            paths.user_config_dir,
+            paths.modules_dir,
+            paths.org_config,
+            paths.org_tf_dir,
+        )
+        return apply_terraform_root_module(
+            "org",
+            paths.org_tf_dir,
+            paths.org_config,
+            "accounts/terraform.tfstate",
+            paths.org_output,
+            paths,
+            # The org apply creates and changes AWS accounts, so is never
+            # auto-approved unless asked to be
+            confirm=confirm,
+        )
+
+    def iam() -> bool:
+        makedirs(paths.iam_tf_dir, exist_ok=True)
+        makedirs(path.dirname(paths.iam_config), exist_ok=True)
+        generate_initial_iam_inputs(
+            paths.user_config_dir,
+            paths.modules_dir,
+            paths.org_output,
+            paths.iam_config,
+        )
+        generate_terrafrom_initial_iam_configs(
+            paths.user_config_dir,
+            paths.modules_dir,
+            paths.iam_tf_dir,
+            paths.iam_module,
+        )
+        return apply_terraform_root_module(
+            "iam",
+            paths.iam_tf_dir,
+            paths.iam_config,
+            "init_iam/terraform.tfstate",
+            paths.iam_output,
+            paths,
+        )
+
+    def accounts_config() -> bool:
+        makedirs(paths.accounts_dir, exist_ok=True)
+        generate_individual_terraform_account_modules(
+            config_dir_path=paths.user_config_dir,
+            tf_modules_dir=paths.modules_dir,
+            org_output_path=paths.org_output,
+            accounts_tf_build_dir=paths.accounts_dir,
+            plugin_cache_dir=paths.plugin_cache_dir,
+        )
+        return True
+
+    def run_accounts(action: str, accounts: Optional[List[str]] = None) -> bool:
+        results = run_terraform_accounts(
+            action=action,
+            accounts_tf_build_dir=paths.accounts_dir,
+            logs_dir=paths.logs_dir,
+            output_dir=paths.accounts_output_dir,
+            backend_hcl=paths.backend_hcl,
+            accounts=accounts,
+            max_workers=max_workers,
+            plugin_cache_dir=paths.plugin_cache_dir,
+        )
+        if results:
+            print("\n" + format_run_summary(results))
+        return all(x.success for x in results)
+
+    def accounts_init() -> bool:
+        return run_accounts("init")
+
+    def accounts_apply() -> bool:
+        # Changed accounts, and any never applied (or whose outputs went missing)
+        dirty = set(get_dirty_accounts(paths.accounts_dir))
+        accounts = [
+            x
+            for x in list_account_dirs(paths.accounts_dir)
+            if x in dirty or not path.isfile(account_output_path(x))
+        ]
+        if not accounts:
+            print("Every account is up to date, nothing to apply.")
+            return True
+        return run_accounts("apply", accounts)
+
+    def is_applied(account: str, dirty: List[str]) -> bool:
+        return account not in dirty and path.isfile(account_output_path(account))
+
+    def cicd_discovery() -> bool:
+        tuc = load_config()
+        dirty = get_dirty_accounts(paths.accounts_dir)
+        cicd_services = {
+            k: v
+            for k, v in get_cicd_account_services(tuc).items()
+            if is_applied(k, dirty)
+        }
+        for plan in plan_cicd_accounts(
+            cicd_services=cicd_services,
+            acc_tf_output_dir=paths.accounts_output_dir,
+            profile=tuc.header.aws_profiles.identity_center.profile,
+            max_workers=max_workers,
+        ):
+            discovered[plan.account_name] = plan
+        return True
+
+    def accounts_services_apply() -> bool:
+        tuc = load_config()
+        cicd_services = get_cicd_account_services(tuc)
+        if not cicd_services:
+            print("\nNo accounts with CICD package configurations, nothing to do.\n")
+            return True
+        # Accounts applied by this run are discovered now that they have outputs
+        remaining = {k: v for k, v in cicd_services.items() if k not in discovered}
+        for plan in plan_cicd_accounts(
+            cicd_services=remaining,
+            acc_tf_output_dir=paths.accounts_output_dir,
+            profile=tuc.header.aws_profiles.identity_center.profile,
+            max_workers=max_workers,
+        ):
+            discovered[plan.account_name] = plan
+        makedirs(paths.package_build_dir, exist_ok=True)
+        return apply_cicd_plans(
+            tuc=tuc,
+            cicd_services=cicd_services,
+            plans=[discovered[x] for x in cicd_services],
+            package_build_dir=paths.package_build_dir,
+            max_workers=max_workers,
+            confirm=confirm,
+        )
+
+    return [
+        Stage(
+            name="bootstrap",
+            run=bootstrap,
+            inputs=lambda: [header_yaml],
+            outputs=lambda: [path.join(paths.backend_dir, "terraform.tfvars")],
+        ),
+        Stage(
+            name="backend-config",
+            run=backend_config,
+            deps=["bootstrap"],
+            inputs=lambda: [path.join(paths.backend_dir, "terraform.tfvars")],
+            outputs=lambda: [paths.backend_hcl],
+        ),
+        Stage(
+            name="org",
+            run=org,
+            deps=["backend-config"],
+            inputs=lambda: [header_yaml, paths.backend_hcl, paths.org_tf_dir],
+            outputs=lambda: [paths.org_config, paths.org_output],
+        ),
+        Stage(
+            name="iam",
+            run=iam,
+            deps=["org"],
+            inputs=lambda: [
+                header_yaml,
+                iam_yaml,
+                paths.backend_hcl,
+                paths.org_output,
+                paths.iam_module,
+            ],
+            outputs=lambda: [paths.iam_config, paths.iam_output],
+        ),
+        Stage(
+            name="accounts-config",
+            run=accounts_config,
+            deps=["iam"],
+            inputs=lambda: [
+                paths.user_config_dir,
+                paths.modules_dir,
+                paths.org_output,
+            ],
+            outputs=lambda: [get_manifest_path(paths.accounts_dir)],
+        ),
+        Stage(
+            name="accounts-init",
+            run=accounts_init,
+            deps=["accounts-config"],
+            inputs=lambda: [paths.accounts_dir, paths.backend_hcl],
+            outputs=lambda: [
+                path.join(paths.accounts_dir, x, ".terraform")
+                for x in list_account_dirs(paths.accounts_dir)
+            ],
+        ),
+        Stage(
+            name="accounts-apply",
+            run=accounts_apply,
+            deps=["accounts-init"],
+            inputs=lambda: [paths.accounts_dir],
+            outputs=lambda: [
+                account_output_path(x) for x in list_account_dirs(paths.accounts_dir)
+            ],
+        ),
+        Stage(
+            name="cicd-discovery",
+            run=cicd_discovery,
+            deps=["accounts-config"],
+        ),
+        Stage(
+            name="accounts-services-apply",
+            run=accounts_services_apply,
+            deps=["accounts-apply", "cicd-discovery"],
+        ),
+    ]
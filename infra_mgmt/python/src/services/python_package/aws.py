@@ -1,6 +1,69 @@
-from typing import List, Optional
+import io
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
 
 import boto3
+from botocore.exceptions import ClientError
+
+from ...instrumentation import register_api_call_counter
+
+# Cached assumed-role credentials are refreshed this long before they expire
+CREDENTIALS_REFRESH_MARGIN = timedelta(minutes=5)
+
+# S3 multipart uploads require every part but the last to be at least 5 MiB
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+# Process-wide caches, shared by every thread. `_CALLER_IDENTITIES` is keyed on
+# profile; `_ASSUMED_CREDENTIALS` on (profile, region, account ID, role name).
+_CALLER_IDENTITIES: Dict[str, dict] = {}
+_ASSUMED_CREDENTIALS: Dict[Tuple[str, str, str, str], dict] = {}
+_CACHE_LOCK = threading.Lock()
+_KEY_LOCKS: Dict[tuple, threading.Lock] = {}
+
+
+def _get_key_lock(key: tuple) -> threading.Lock:
+    """Returns the lock serializing STS calls for a single cache key, so concurrent
+    callers make one round trip per key rather than one each."""
+    with _CACHE_LOCK:
+        if key not in _KEY_LOCKS:
+            _KEY_LOCKS[key] = threading.Lock()
+        return _KEY_LOCKS[key]
+
+
+def clear_session_cache() -> None:
+    """Clears the cached caller identities and assumed-role credentials."""
+    with _CACHE_LOCK:
+        _CALLER_IDENTITIES.clear()
+        _ASSUMED_CREDENTIALS.clear()
+
+
+def get_caller_identity(profile: str, base_session: boto3.Session) -> dict:
+    """
+    Gets the STS caller identity of a profile, cached for the life of the process.
+
+    Args:
+        profile: The AWS profile the session was created with.
+        base_session: A boto3 session created directly from the profile.
+
+    Returns:
+        The `sts.get_caller_identity` response.
+    """
+    key = ("identity", profile)
+    with _get_key_lock(key):
+        if profile not in _CALLER_IDENTITIES:
+            sts_client = base_session.client("sts")
+            _CALLER_IDENTITIES[profile] = sts_client.get_caller_identity()
+        return _CALLER_IDENTITIES[profile]
+
+
+def _credentials_are_fresh(credentials: dict) -> bool:
+    expiration = credentials["Expiration"]
+    if expiration.tzinfo is None:
+        expiration = expiration.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) + CREDENTIALS_REFRESH_MARGIN < expiration
 
 
 def get_boto3_session(
@@ -8,6 +71,7 @@ def get_boto3_session(
     region: str,
     account_id_to_assume: Optional[str] = None,
     role_name_to_assume: str = "OrganizationAccountAccessRole",
+    out: Optional[TextIO] = None,
 ) -> boto3.Session:
     """
     Gets a boto3 session.
@@ -15,55 +79,74 @@ def get_boto3_session(
     it assumes a role in the target account.
     If the account ID is the same as the profile's, it uses the profile directly.
 
+    The profile's caller identity and any assumed-role credentials are cached for
+    the life of the process; assumed-role credentials are reused until shortly
+    before they expire. A new `boto3.Session` is returned on every call, since
+    sessions are not safe to share between threads.
+
     Args:
         profile: The AWS profile to use for the initial session.
         region: The AWS region.
         account_id_to_assume: The ID of the account to operate in.
         role_name_to_assume: The name of the role to assume if needed.
+        out: Stream progress is printed to, defaults to stdout.
 
     Returns:
         A boto3 session.
     """
     # Create a session using the direct profile first
-    base_session = boto3.Session(profile_name=profile, region_name=region)
+    base_session = register_api_call_counter(
+        boto3.Session(profile_name=profile, region_name=region)
+    )
 
     if account_id_to_assume:
         # Check the account ID of the current session
-        sts_client = base_session.client("sts")
         try:
-            caller_identity = sts_client.get_caller_identity()
+            caller_identity = get_caller_identity(profile, base_session)
             current_account_id = caller_identity["Account"]
         except Exception as e:
-            print(f"Error getting caller identity for profile '{profile}': {e}")
+            print(
+                f"Error getting caller identity for profile '{profile}': {e}", file=out
+            )
             raise
 
         # If the target account is the same as the current one, no need to assume role
         if current_account_id == account_id_to_assume:
             print(
                 f"Already in target account {current_account_id}. Using profile"
-                f" '{profile}' directly."
+                f" '{profile}' directly.",
+                file=out,
             )
             return base_session
 
-        # If target account is different, proceed with assuming role
+        # If target account is different, proceed with assuming role, unless
+        # still-fresh credentials for the role are cached
         role_arn = f"arn:aws:iam::{account_id_to_assume}:role/{role_name_to_assume}"
-        try:
-            print(f"Assuming role {role_arn}...")
-            assumed_role_object = sts_client.assume_role(
-                RoleArn=role_arn, RoleSessionName="AssumedRoleSession"
-            )
-            credentials = assumed_role_object["Credentials"]
-
-            # Create a new session with the assumed role's temporary credentials
-            return boto3.Session(
+        key = (profile, region, account_id_to_assume, role_name_to_assume)
+        with _get_key_lock(key):
+            credentials = _ASSUMED_CREDENTIALS.get(key)
+            if credentials is None or not _credentials_are_fresh(credentials):
+                try:
+                    print(f"Assuming role {role_arn}...", file=out)
+                    sts_client = base_session.client("sts")
+                    assumed_role_object = sts_client.assume_role(
+                        RoleArn=role_arn, RoleSessionName="AssumedRoleSession"
+                    )
+                except Exception as e:
+                    print(f"Error assuming role {role_arn}: {e}", file=out)
+                    raise
+                credentials = assumed_role_object["Credentials"]
+                _ASSUMED_CREDENTIALS[key] = credentials
+
+        # Create a new session with the assumed role's temporary credentials
+        return register_api_call_counter(
+            boto3.Session(
                 aws_access_key_id=credentials["AccessKeyId"],
                 aws_secret_access_key=credentials["SecretAccessKey"],
                 aws_session_token=credentials["SessionToken"],
                 region_name=region,
             )
-        except Exception as e:
-            print(f"Error assuming role {role_arn}: {e}")
-            raise
+        )
     else:
         # If no account ID is specified, just use the base session
         return base_session
@@ -205,6 +288,371 @@ def upload_zip_to_s3(
         return False
 
 
+def s3_object_exists(s3_client, bucket_name: str, s3_key: str) -> bool:
+    """
+    Checks whether an object exists in S3 with a single HEAD request.
+
+    Args:
+        s3_client: A boto3 S3 client.
+        bucket_name: The name of the S3 bucket.
+        s3_key: The key (path) of the object.
+
+    Returns:
+        True if the object exists, False otherwise.
+    """
+    try:
+        s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ["NoSuchKey", "404"]:
+            return False
+        raise
+    return True
+
+
+def get_s3_json_object_and_etag(
+    s3_client, bucket_name: str, s3_key: str
+) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Reads and parses a JSON object from S3, along with its ETag.
+
+    Args:
+        s3_client: A boto3 S3 client.
+        bucket_name: The name of the S3 bucket.
+        s3_key: The key (path) of the object.
+
+    Returns:
+        The parsed object and its ETag, or (None, None) if the object does not exist.
+    """
+    try:
+        response = s3_client.get_object(Bucket=bucket_name, Key=s3_key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ["NoSuchKey", "404"]:
+            return None, None
+        raise
+    return json.loads(response["Body"].read()), response["ETag"]
+
+
+def get_s3_json_object(s3_client, bucket_name: str, s3_key: str) -> Optional[dict]:
+    """
+    Reads and parses a JSON object from S3.
+
+    Args:
+        s3_client: A boto3 S3 client.
+        bucket_name: The name of the S3 bucket.
+        s3_key: The key (path) of the object.
+
+    Returns:
+        The parsed object, or None if the object does not exist.
+    """
+    return get_s3_json_object_and_etag(s3_client, bucket_name, s3_key)[0]
+
+
+def put_s3_json_object(
+    s3_client,
+    bucket_name: str,
+    s3_key: str,
+    data: str,
+    if_match: Optional[str] = None,
+    if_none_match: bool = False,
+) -> None:
+    """
+    Writes a serialized JSON document to S3, optionally only if the object is
+    unchanged (`if_match`) or does not exist yet (`if_none_match`). A failed
+    condition raises a `ClientError` with code `PreconditionFailed`.
+
+    Args:
+        s3_client: A boto3 S3 client.
+        bucket_name: The name of the S3 bucket.
+        s3_key: The key (path) of the object.
+        data: The serialized JSON document.
+        if_match: Only write if the object's current ETag is this one.
+        if_none_match: Only write if the object does not exist.
+    """
+    conditions = {}
+    if if_match is not None:
+        conditions["IfMatch"] = if_match
+    if if_none_match:
+        conditions["IfNoneMatch"] = "*"
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=s3_key,
+        Body=data.encode("utf-8"),
+        ContentType="application/json",
+        **conditions,
+    )
+
+
+class S3MultipartUploadWriter:
+    """
+    Write-only, non-seekable file object streaming its contents into an S3 multipart
+    upload.
+
+    Written bytes are buffered until a full part is available, which is then
+    uploaded in the background while writing continues. At most `max_in_flight`
+    parts are held in memory, so memory use stays flat regardless of object size.
+    Used as a context manager, the upload is completed on a clean exit and aborted
+    if an exception is raised.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket_name: str,
+        s3_key: str,
+        part_size: int = MULTIPART_PART_SIZE,
+        max_in_flight: int = 4,
+    ):
+        """
+        Args:
+            s3_client: A boto3 S3 client.
+            bucket_name: The name of the S3 bucket.
+            s3_key: The key (path) of the object to upload.
+            part_size: Size in bytes of each uploaded part (but the last).
+            max_in_flight: Maximum number of parts uploading concurrently.
+        """
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.s3_key = s3_key
+        self.part_size = part_size
+        self.max_in_flight = max_in_flight
+        self.upload_id = s3_client.create_multipart_upload(
+            Bucket=bucket_name, Key=s3_key
+        )["UploadId"]
+        self.closed = False
+        self._buffer = bytearray()
+        self._position = 0
+        self._futures: List[Future] = []
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight)
+
+    def _upload_part(self, part_number: int, body: bytes) -> dict:
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket_name,
+            Key=self.s3_key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def _submit_part(self, body: bytes) -> None:
+        # Block on the oldest pending part rather than buffer without bound
+        pending = [x for x in self._futures if not x.done()]
+        if len(pending) >= self.max_in_flight:
+            pending[0].result()
+        part_number = len(self._futures) + 1
+        self._futures.append(
+            self._executor.submit(self._upload_part, part_number, body)
+        )
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("Write to a closed S3 multipart upload.")
+        self._buffer += data
+        self._position += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._submit_part(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        """Uploads any remaining buffered bytes and completes the upload."""
+        if self.closed:
+            return
+        if self._buffer or not self._futures:
+            self._submit_part(bytes(self._buffer))
+            self._buffer.clear()
+        parts = [x.result() for x in self._futures]
+        self._executor.shutdown()
+        self.s3_client.complete_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=self.s3_key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+        self.closed = True
+
+    def abort(self) -> None:
+        """Aborts the upload, discarding every part uploaded so far."""
+        if self.closed:
+            return
+        self._executor.shutdown(cancel_futures=True)
+        self.s3_client.abort_multipart_upload(
+            Bucket=self.bucket_name, Key=self.s3_key, UploadId=self.upload_id
+        )
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self.abort()
+            return
+        try:
+            self.close()
+        except Exception:
+            self.abort()
+            raise
+
+
+class S3RangeReader(io.RawIOBase):
+    """
+    Read-only, seekable file object over an S3 object, fetched in fixed-size chunks
+    with ranged GETs.
+
+    Chunks are fetched on demand as they are read, or ahead of time and in parallel
+    with `prefetch`. Fetched chunks are kept in memory, so each byte is downloaded
+    at most once. `prefetch` may be called from several threads at once; a chunk
+    already being fetched by another thread is waited on rather than refetched.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket_name: str,
+        s3_key: str,
+        chunk_size: int = MULTIPART_PART_SIZE,
+    ):
+        """
+        Args:
+            s3_client: A boto3 S3 client.
+            bucket_name: The name of the S3 bucket.
+            s3_key: The key (path) of the object to read.
+            chunk_size: Size in bytes of each ranged GET.
+        """
+        super().__init__()
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.s3_key = s3_key
+        self.chunk_size = chunk_size
+        self.size = s3_client.head_object(Bucket=bucket_name, Key=s3_key)[
+            "ContentLength"
+        ]
+        self.bytes_fetched = 0
+        self._position = 0
+        self._chunks: Dict[int, bytes] = {}
+        # Chunks being fetched, each with an event set once its fetch ends
+        self._fetching: Dict[int, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _fetch_chunk(self, index: int) -> bytes:
+        start = index * self.chunk_size
+        end = min(self.size, start + self.chunk_size) - 1
+        response = self.s3_client.get_object(
+            Bucket=self.bucket_name, Key=self.s3_key, Range=f"bytes={start}-{end}"
+        )
+        return response["Body"].read()
+
+    def _claim_chunks(self, indexes: Iterable[int]) -> Dict[int, threading.Event]:
+        """Claims the chunks neither fetched nor being fetched, for the caller to
+        fetch with `_fetch_claimed_chunk`."""
+        with self._lock:
+            claimed = {
+                x: threading.Event()
+                for x in indexes
+                if x not in self._chunks and x not in self._fetching
+            }
+            self._fetching.update(claimed)
+        return claimed
+
+    def _release_chunks(self, claimed: Dict[int, threading.Event]) -> None:
+        """Releases claimed chunks that were never fetched, e.g., because their
+        fetches were cancelled after another failed."""
+        with self._lock:
+            for index, event in claimed.items():
+                if self._fetching.get(index) is event:
+                    del self._fetching[index]
+                    event.set()
+
+    def _fetch_claimed_chunk(self, index: int) -> bytes:
+        chunk = None
+        try:
+            chunk = self._fetch_chunk(index)
+        finally:
+            with self._lock:
+                if chunk is not None:
+                    self._chunks[index] = chunk
+                    self.bytes_fetched += len(chunk)
+                self._fetching.pop(index).set()
+        return chunk
+
+    def _get_chunk(self, index: int) -> bytes:
+        while True:
+            with self._lock:
+                chunk = self._chunks.get(index)
+                fetching = self._fetching.get(index)
+            if chunk is not None:
+                return chunk
+            if fetching is not None:
+                # Retried if the other thread's fetch failed
+                fetching.wait()
+            elif self._claim_chunks([index]):
+                return self._fetch_claimed_chunk(index)
+
+    def prefetch(
+        self, start: int = 0, end: Optional[int] = None, max_workers: int = 8
+    ) -> None:
+        """
+        Fetches every chunk overlapping a byte range, in parallel.
+
+        Args:
+            start: First byte of the range.
+            end: Byte after the last byte of the range, defaults to the object size.
+            max_workers: Maximum number of concurrent ranged GETs.
+        """
+        end = self.size if end is None else min(end, self.size)
+        if end <= start:
+            return
+        claimed = self._claim_chunks(
+            range(start // self.chunk_size, (end - 1) // self.chunk_size + 1)
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                list(executor.map(self._fetch_claimed_chunk, claimed))
+        finally:
+            self._release_chunks(claimed)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        elif whence == io.SEEK_END:
+            self._position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+        if self._position < 0:
+            raise ValueError("Negative seek position")
+        return self._position
+
+    def readinto(self, b) -> int:
+        view = memoryview(b).cast("B")
+        num_read = 0
+        while num_read < len(view) and self._position < self.size:
+            index, offset = divmod(self._position, self.chunk_size)
+            chunk = self._get_chunk(index)
+            n = min(len(view) - num_read, len(chunk) - offset)
+            view[num_read : num_read + n] = chunk[offset : offset + n]
+            num_read += n
+            self._position += n
+        return num_read
+
+
 def download_latest_zip_from_s3(
     profile: str,
     region: str,
@@ -215,6 +663,9 @@ def download_latest_zip_from_s3(
     """
     Downloads the most recently uploaded .zip archive from a given S3 bucket.
 
+    The archive is located with a single read of the bucket's latest backup
+    pointer, when one exists.
+
     Args:
         profile: The AWS profile to use.
         region: The AWS region.
@@ -229,18 +680,28 @@ def download_latest_zip_from_s3(
         session = get_boto3_session(profile, region, account_id_to_assume)
         s3_client = session.client("s3")
 
-        # List all objects in the bucket
-        paginator = s3_client.get_paginator("list_objects_v2")
-        pages = paginator.paginate(Bucket=bucket_name)
-        all_objects = [obj for page in pages for obj in page.get("Contents", [])]
-
-        if not all_objects:
-            print(f"No objects found in bucket '{bucket_name}'.")
-            return None
-
-        # Find the most recently modified object
-        latest_object = max(all_objects, key=lambda obj: obj["LastModified"])
-        latest_object_key = latest_object["Key"]
+        # Imported here, as the backup index module imports this one
+        from ...backup_index import LATEST_BACKUP_POINTER_KEY
+
+        # Read the latest backup pointer, falling back to a full bucket scan for
+        # buckets predating the pointer
+        latest = get_s3_json_object(s3_client, bucket_name, LATEST_BACKUP_POINTER_KEY)
+        if latest and latest.get("archive"):
+            latest_object_key = latest["archive"]["key"]
+        else:
+            all_objects = [
+                obj
+                for page in s3_client.get_paginator("list_objects_v2").paginate(
+                    Bucket=bucket_name
+                )
+                for obj in page.get("Contents", [])
+                if obj["Key"].endswith(".zip")
+            ]
+            if not all_objects:
+                print(f"No objects found in bucket '{bucket_name}'.")
+                return None
+            latest_object = max(all_objects, key=lambda obj: obj["LastModified"])
+            latest_object_key = latest_object["Key"]
         print(f"Found latest object: '{latest_object_key}'")
 
         # Download the file
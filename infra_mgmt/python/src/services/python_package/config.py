@@ -28,38 +28,44 @@ RULE 1: If `<git-repo-A>` is a folder in S3 bucket, but there is no `<git-repo-A
 
 """
 
-import json
 import os
 import shutil
 import subprocess
+import sys
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed
 from os import listdir, makedirs, path
 from pathlib import Path
+from typing import Dict, List, Optional, TextIO, Tuple
 
-from jinja2 import Environment, FileSystemLoader
-
+from ...instrumentation import span, traced
+from ...templating import get_template
 from ...terraform.config import load_terraform_user_config
-from ...terraform.models import CICDConfigModel
+from ...terraform.models import CICDConfigModel, TerraformUserConfig
+from ...terraform.outputs import TerraformOutputError, load_account_outputs
 from .aws import get_boto3_session, list_codeartifact_packages, list_s3_folders
-from .models import CicdMetadata, PythonPackageInput
+from .models import CicdAccountPlan, CicdMetadata, PythonPackageInput
 from .utils import generate_pastel_hex
 
 CURR_DIR = path.dirname(path.abspath(__file__))  # python_packages dir
-TEMPLATES_DIR = path.join(
-    CURR_DIR, "..", "..", "templates", "services", "cicd", "packages", "python"
-)
+TEMPLATES_PREFIX = "services/cicd/packages/python"
+TEMPLATES_DIR = path.join(CURR_DIR, "..", "..", "templates", TEMPLATES_PREFIX)
 
 
 def get_account_cicd_metadata(
     account_name: str, acc_tf_output_dir: str
 ) -> CicdMetadata:
-    acc_tf_output_path = path.join(acc_tf_output_dir, account_name + ".json")
-    acc_output = json.load(open(acc_tf_output_path, "r"))
+    acc_output = load_account_outputs(acc_tf_output_dir, account_name)
+    if acc_output.target_account_id is None or acc_output.codeartifact_region is None:
+        raise TerraformOutputError(
+            f"Terraform outputs of account {account_name} have no CICD outputs; has "
+            "the account been applied since its CICD service was configured?"
+        )
     return CicdMetadata(
-        codeartifact_domain=acc_output["codeartifact_domain_name"]["value"],
-        codeartifact_domain_owner=acc_output["target_account_id"]["value"],
-        codeartifact_repo=acc_output["codeartifact_repository_name"]["value"],
-        codeartifact_region=acc_output["codeartifact_region"]["value"]["name"],
-        git_s3_bucket=acc_output["s3_git_bucket_name"]["value"],
+        codeartifact_domain=acc_output.codeartifact_domain_name,
+        codeartifact_domain_owner=acc_output.target_account_id,
+        codeartifact_repo=acc_output.codeartifact_repository_name,
+        codeartifact_region=acc_output.codeartifact_region["name"],
+        git_s3_bucket=acc_output.s3_git_bucket_name,
     )
 
 
@@ -87,6 +93,7 @@ def list_git_and_codeartifact_repos(cicd_meta: CicdMetadata, profile: str):
     return pruned_s3_folders, ca_packs
 
 
+@traced("render_python_package")
 def populate_python_package_contents(
     template_input: PythonPackageInput, package_destination_folder_path: str
 ):
@@ -111,10 +118,9 @@ def populate_python_package_contents(
         makedirs(name=dir_path, exist_ok=True)
 
     # Render templates
-    environment = Environment(loader=FileSystemLoader(path.join(TEMPLATES_DIR)))
     template_filenames = [x for x in listdir(TEMPLATES_DIR) if ".jinja2" in x]
     for tf in template_filenames:
-        template = environment.get_template(tf)
+        template = get_template(f"{TEMPLATES_PREFIX}/{tf}")
         content = template.render(config=template_input)
         content_filename = tf.replace(".jinja2", "")
         if content_filename in [
@@ -146,14 +152,14 @@ def populate_python_package_contents(
     module_path = path.join(src_dir, template_input.docker_compose_service_name)
     makedirs(module_path)
     Path(path.join(module_path, "__init__.py")).touch()
-    template = environment.get_template("src.core")
+    template = get_template(f"{TEMPLATES_PREFIX}/src.core")
     content = template.render(config=template_input)
     core_fpath = path.join(module_path, "core.py")
     with open(core_fpath, "w", encoding="utf-8") as f:
         f.write(content)
     # - tests
     Path(path.join(tests_dir, "__init__.py")).touch()
-    template = environment.get_template("test.core")
+    template = get_template(f"{TEMPLATES_PREFIX}/test.core")
     content = template.render(config=template_input)
     test_core_fpath = path.join(tests_dir, "test_core.py")
     with open(test_core_fpath, "w", encoding="utf-8") as f:
@@ -168,7 +174,8 @@ def initialize_and_push_git_repository(
     aws_region: str,
     aws_account_id_to_assume: str,
     aws_role_to_assume: str = "OrganizationAccountAccessRole",
-):
+    log_path: Optional[str] = None,
+) -> bool:
     """
     Initializes a Git repository, adds an S3 remote, commits, and pushes the initial
     content using dynamically assumed AWS credentials.
@@ -181,24 +188,65 @@ def initialize_and_push_git_repository(
         aws_region: The AWS region for the session.
         aws_account_id_to_assume: The target AWS account ID.
         aws_role_to_assume: The role to assume in the target account.
+        log_path: If given, progress and command output are appended to this file
+            instead of being printed.
+
+    Returns:
+        True if every command succeeded, False otherwise.
     """
-    print("Attempting to get temporary credentials...")
+    if log_path is None:
+        return _initialize_and_push_git_repository(
+            directory_path,
+            s3_bucket_with_key,
+            commit_message,
+            aws_profile,
+            aws_region,
+            aws_account_id_to_assume,
+            aws_role_to_assume,
+            out=sys.stdout,
+        )
+    with open(log_path, "a", encoding="utf-8") as log:
+        return _initialize_and_push_git_repository(
+            directory_path,
+            s3_bucket_with_key,
+            commit_message,
+            aws_profile,
+            aws_region,
+            aws_account_id_to_assume,
+            aws_role_to_assume,
+            out=log,
+        )
+
+
+@traced("git_init_and_push")
+def _initialize_and_push_git_repository(
+    directory_path: str,
+    s3_bucket_with_key: str,
+    commit_message: str,
+    aws_profile: str,
+    aws_region: str,
+    aws_account_id_to_assume: str,
+    aws_role_to_assume: str,
+    out: TextIO,
+) -> bool:
+    print("Attempting to get temporary credentials...", file=out)
     session = get_boto3_session(
         profile=aws_profile,
         region=aws_region,
         account_id_to_assume=aws_account_id_to_assume,
         role_name_to_assume=aws_role_to_assume,
+        out=out,
     )
     if not session:
-        print("Failed to create boto3 session. Aborting.")
-        return
+        print("Failed to create boto3 session. Aborting.", file=out)
+        return False
 
     credentials = session.get_credentials()
     if not credentials:
-        print("Failed to get temporary credentials. Aborting.")
-        return
+        print("Failed to get temporary credentials. Aborting.", file=out)
+        return False
 
-    print("Successfully obtained temporary credentials.")
+    print("Successfully obtained temporary credentials.", file=out)
 
     # Set up the environment for the subprocess with temporary credentials
     env = os.environ.copy()
@@ -211,7 +259,7 @@ def initialize_and_push_git_repository(
         del env["AWS_PROFILE"]
 
     s3_remote_url = f"s3://{s3_bucket_with_key}"
-    print(f"Using S3 remote URL: {s3_remote_url}")
+    print(f"Using S3 remote URL: {s3_remote_url}", file=out)
 
     commands = [
         ("poetry", "install"),
@@ -234,44 +282,51 @@ def initialize_and_push_git_repository(
                 cwd=directory_path,
                 env=env,
             )
-            print(f"Successfully executed: {' '.join(command)}")
+            print(f"Successfully executed: {' '.join(command)}", file=out)
             if result.stdout:
-                print(result.stdout)
+                print(result.stdout, file=out)
         except subprocess.CalledProcessError as e:
-            print(f"Error executing: {' '.join(command)}")
-            print(f"Return code: {e.returncode}")
+            print(f"Error executing: {' '.join(command)}", file=out)
+            print(f"Return code: {e.returncode}", file=out)
             if e.stderr:
-                print(f"Stderr:\n{e.stderr}")
+                print(f"Stderr:\n{e.stderr}", file=out)
             if e.stdout:
-                print(f"Stdout:\n{e.stdout}")
-            return
+                print(f"Stdout:\n{e.stdout}", file=out)
+            return False
         except FileNotFoundError:
             print(
                 f"Error: '{command[0]}' command not found. Is it installed and in your"
-                " PATH?"
+                " PATH?",
+                file=out,
             )
-            return
+            return False
+    return True
 
 
-def apply_account_cicd_services(
-    ccm: CICDConfigModel,
-    acc_name: str,
-    acc_tf_output_dir: str,
-    profile: str,
-    organization_name: str,
-    organization_email: str,
-    package_build_dir: str,
-):
+def plan_account_cicd_services(
+    ccm: CICDConfigModel, acc_name: str, acc_tf_output_dir: str, profile: str
+) -> CicdAccountPlan:
+    """Discovers an account's current Git S3 folders and CodeArtifact packages and
+    determines which locally configured packages require initialization.
 
-    tf_cicd_meta = get_account_cicd_metadata(
-        account_name=acc_name, acc_tf_output_dir=acc_tf_output_dir
-    )
+    Args:
+        ccm (CICDConfigModel): Account's CICD service config
+        acc_name (str): Account name
+        acc_tf_output_dir (str): Path to accounts Terraform output directory
+        profile (str): AWS profile used to assume a role in the account
 
-    curr_s3_folders, curr_ca_packs = list_git_and_codeartifact_repos(
-        cicd_meta=tf_cicd_meta, profile=profile
-    )
+    Returns:
+        (CicdAccountPlan): Account's CICD plan
+    """
+    with span("cicd_discovery", account=acc_name):
+        tf_cicd_meta = get_account_cicd_metadata(
+            account_name=acc_name, acc_tf_output_dir=acc_tf_output_dir
+        )
+
+        curr_s3_folders, curr_ca_packs = list_git_and_codeartifact_repos(
+            cicd_meta=tf_cicd_meta, profile=profile
+        )
 
-    # Generate preview/plan and check with user
     do_not_require_init = []
     require_init = []
     local_config_packs = []
@@ -282,79 +337,250 @@ def apply_account_cicd_services(
         else:
             require_init.append(pack.name)
 
-    msg = f"\n\n\n----------------------- CICD Plan for Account: {acc_name} ---------"
-    msg += "---------------\n"
+    return CicdAccountPlan(
+        account_name=acc_name,
+        cicd_meta=tf_cicd_meta,
+        s3_folders=curr_s3_folders,
+        codeartifact_packages=curr_ca_packs,
+        local_config_packages=local_config_packs,
+        do_not_require_init=do_not_require_init,
+        require_init=require_init,
+    )
+
+
+def format_cicd_plan(plan: CicdAccountPlan) -> str:
+    """Formats an account's CICD plan for review by the user."""
+    msg = f"\n\n\n----------------------- CICD Plan for Account: {plan.account_name} "
+    msg += "------------------------\n"
     msg += "Current S3 Folders:\n"
-    msg += "\n".join(curr_s3_folders) + "\n\n"
+    msg += "\n".join(plan.s3_folders) + "\n\n"
 
     msg += "Current CodeArtifact Packages:\n"
-    msg += "\n".join(curr_ca_packs) + "\n\n"
+    msg += "\n".join(plan.codeartifact_packages) + "\n\n"
 
     msg += "Packages in local config:\n"
-    msg += "\n".join(local_config_packs) + "\n\n"
+    msg += "\n".join(plan.local_config_packages) + "\n\n"
 
     msg += "DO NOT require initialization:\n"
-    msg += "\n".join(do_not_require_init) + "\n\n"
+    msg += "\n".join(plan.do_not_require_init) + "\n\n"
 
     msg += "REQUIRE initialization:"
-    if len(require_init) > 0:
-        msg += "\n" + "\n".join(require_init) + "\n\n"
+    if len(plan.require_init) > 0:
+        msg += "\n" + "\n".join(plan.require_init) + "\n\n"
     else:
         msg += " None\n\n"
+    return msg
 
-    print(msg)
 
-    if len(require_init) == 0:
-        print("\nNothing to change, skipping.\n")
-    else:
-        expected_input = "yes"
-        user_input = input("Apply CICD plan? (only `yes` is accepted for continuing):")
-        if user_input != expected_input:
-            print("User declined plan application, stopping.")
-        else:
-            # Apply Plan
-            for pack_name in require_init:
-                print(f"Applying plan for package {pack_name}")
-                pack = ccm.get_package_config(name=pack_name)
-                hypen_pack_name = pack.name
-                underscore_pack_name = pack.name.replace("-", "_")
-                pack_build_dir = path.join(package_build_dir, underscore_pack_name)
-                s3_bucket_with_key = f"{tf_cicd_meta.git_s3_bucket}/{hypen_pack_name}"
-                makedirs(pack_build_dir)
-                ppi = PythonPackageInput(
-                    dev_container_name=f"{hypen_pack_name}-dev-container",
-                    docker_compose_service_name=underscore_pack_name,
-                    terminal_background_color=generate_pastel_hex(),
-                    organization_name=organization_name,
-                    organization_email=organization_email,
-                    package_name=hypen_pack_name,
-                    codeartifact=tf_cicd_meta,
-                )
-                populate_python_package_contents(
-                    template_input=ppi, package_destination_folder_path=pack_build_dir
-                )
-                initialize_and_push_git_repository(
-                    directory_path=pack_build_dir,
-                    s3_bucket_with_key=s3_bucket_with_key,
-                    commit_message="automated init commit",
-                    aws_profile=profile,
-                    aws_region=ppi.codeartifact.codeartifact_region,
-                    aws_account_id_to_assume=ppi.codeartifact.codeartifact_domain_owner,
-                )
+def confirm_cicd_plan() -> bool:
+    expected_input = "yes"
+    user_input = input("Apply CICD plan? (only `yes` is accepted for continuing):")
+    if user_input != expected_input:
+        print("User declined plan application, stopping.")
+        return False
+    return True
 
 
-def apply_all_cicd_services(
-    config_dir_path: str,
-    tf_modules_dir: str,
+def render_cicd_plan_packages(
+    plan: CicdAccountPlan,
+    ccm: CICDConfigModel,
+    organization_name: str,
+    organization_email: str,
+    package_build_dir: str,
+) -> List[Tuple[str, str, str, str]]:
+    """Renders every package in an account's CICD plan that requires initialization
+    from templates.
+
+    Args:
+        plan (CicdAccountPlan): Account's CICD plan
+        ccm (CICDConfigModel): Account's CICD service config
+        organization_name (str): Organization name used in package templates
+        organization_email (str): Organization email used in package templates
+        package_build_dir (str): Path to directory where packages are built
+
+    Returns:
+        (List[Tuple[str, str, str, str]]): (package name, package build dir, S3 git
+            bucket with key, log path) of each rendered package
+    """
+    tf_cicd_meta = plan.cicd_meta
+    with span("cicd_render_packages", account=plan.account_name):
+        rendered: List[Tuple[str, str, str, str]] = []
+        for pack_name in plan.require_init:
+            print(f"Rendering package {pack_name}")
+            pack = ccm.get_package_config(name=pack_name)
+            hypen_pack_name = pack.name
+            underscore_pack_name = pack.name.replace("-", "_")
+            pack_build_dir = path.join(package_build_dir, underscore_pack_name)
+            s3_bucket_with_key = f"{tf_cicd_meta.git_s3_bucket}/{hypen_pack_name}"
+            makedirs(pack_build_dir)
+            ppi = PythonPackageInput(
+                dev_container_name=f"{hypen_pack_name}-dev-container",
+                docker_compose_service_name=underscore_pack_name,
+                terminal_background_color=generate_pastel_hex(),
+                organization_name=organization_name,
+                organization_email=organization_email,
+                package_name=hypen_pack_name,
+                codeartifact=tf_cicd_meta,
+            )
+            populate_python_package_contents(
+                template_input=ppi, package_destination_folder_path=pack_build_dir
+            )
+            log_path = path.join(package_build_dir, f"{underscore_pack_name}.log")
+            rendered.append((pack_name, pack_build_dir, s3_bucket_with_key, log_path))
+    return rendered
+
+
+def submit_cicd_package_pushes(
+    executor: Executor,
+    plan: CicdAccountPlan,
+    rendered: List[Tuple[str, str, str, str]],
+    profile: str,
+) -> Dict[Future, Tuple[str, str, str]]:
+    """Submits the subprocess chain (`poetry install`, `black`, git init and push) of
+    every rendered package in an account's CICD plan to an executor.
+
+    Args:
+        executor (Executor): Executor the chains run in, which bounds how many run
+            concurrently
+        plan (CicdAccountPlan): Account's CICD plan
+        rendered (List[Tuple[str, str, str, str]]): Packages rendered by
+            `render_cicd_plan_packages`
+        profile (str): AWS profile used to assume a role in the account
+
+    Returns:
+        (Dict[Future, Tuple[str, str, str]]): Futures mapped to their (account name,
+            package name, log path)
+    """
+    tf_cicd_meta = plan.cicd_meta
+    return {
+        executor.submit(
+            initialize_and_push_git_repository,
+            directory_path=pack_build_dir,
+            s3_bucket_with_key=s3_bucket_with_key,
+            commit_message="automated init commit",
+            aws_profile=profile,
+            aws_region=tf_cicd_meta.codeartifact_region,
+            aws_account_id_to_assume=tf_cicd_meta.codeartifact_domain_owner,
+            log_path=log_path,
+        ): (plan.account_name, pack_name, log_path)
+        for pack_name, pack_build_dir, s3_bucket_with_key, log_path in rendered
+    }
+
+
+def collect_cicd_package_pushes(
+    futures: Dict[Future, Tuple[str, str, str]],
+) -> Dict[str, Dict[str, bool]]:
+    """Waits for submitted package subprocess chains, reporting each as it finishes.
+
+    Args:
+        futures (Dict[Future, Tuple[str, str, str]]): Futures returned by
+            `submit_cicd_package_pushes`
+
+    Returns:
+        (Dict[str, Dict[str, bool]]): Account names mapped to their package names,
+            mapped to whether they were pushed
+    """
+    results: Dict[str, Dict[str, bool]] = {}
+    for future in as_completed(futures):
+        acc_name, pack_name, log_path = futures[future]
+        try:
+            pushed = future.result()
+        except Exception as e:
+            with open(log_path, "a", encoding="utf-8") as log:
+                print(f"Error initializing package: {e}", file=log)
+            pushed = False
+        results.setdefault(acc_name, {})[pack_name] = pushed
+        status = "pushed" if pushed else "FAILED"
+        print(f"Package {pack_name} ({acc_name}): {status}, see {log_path}")
+    return results
+
+
+def apply_cicd_plan(
+    plan: CicdAccountPlan,
+    ccm: CICDConfigModel,
+    profile: str,
+    organization_name: str,
+    organization_email: str,
+    package_build_dir: str,
+    max_workers: int = 4,
+) -> Dict[str, bool]:
+    """Initializes and pushes every package in an account's CICD plan that requires
+    initialization.
+
+    Runs as a two stage pipeline: every package is first rendered from templates,
+    then the independent subprocess chains (`poetry install`, `black`, git init and
+    push) run in parallel. Each package's subprocess output is written to
+    `<package_build_dir>/<package>.log` rather than printed.
+
+    Args:
+        plan (CicdAccountPlan): Account's CICD plan
+        ccm (CICDConfigModel): Account's CICD service config
+        profile (str): AWS profile used to assume a role in the account
+        organization_name (str): Organization name used in package templates
+        organization_email (str): Organization email used in package templates
+        package_build_dir (str): Path to directory where packages are built
+        max_workers (int, default=4): Maximum number of packages whose subprocess
+            chains run concurrently
+
+    Returns:
+        (Dict[str, bool]): Package names mapped to whether they were pushed
+    """
+    # Stage 1: render all packages
+    rendered = render_cicd_plan_packages(
+        plan=plan,
+        ccm=ccm,
+        organization_name=organization_name,
+        organization_email=organization_email,
+        package_build_dir=package_build_dir,
+    )
+
+    # Stage 2: run the independent subprocess chains in parallel
+    if not rendered:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = submit_cicd_package_pushes(executor, plan, rendered, profile)
+        return collect_cicd_package_pushes(futures).get(plan.account_name, {})
+
+
+def apply_account_cicd_services(
+    ccm: CICDConfigModel,
+    acc_name: str,
     acc_tf_output_dir: str,
+    profile: str,
+    organization_name: str,
+    organization_email: str,
     package_build_dir: str,
 ):
-    tuc = load_terraform_user_config(
-        config_dir_path=config_dir_path, tf_modules_dir=tf_modules_dir
+    # Generate preview/plan and check with user
+    plan = plan_account_cicd_services(
+        ccm=ccm, acc_name=acc_name, acc_tf_output_dir=acc_tf_output_dir, profile=profile
     )
+    print(format_cicd_plan(plan))
+
+    if len(plan.require_init) == 0:
+        print("\nNothing to change, skipping.\n")
+    elif confirm_cicd_plan():
+        apply_cicd_plan(
+            plan=plan,
+            ccm=ccm,
+            profile=profile,
+            organization_name=organization_name,
+            organization_email=organization_email,
+            package_build_dir=package_build_dir,
+        )
+
+
+def get_cicd_account_services(tuc: TerraformUserConfig) -> Dict[str, CICDConfigModel]:
+    """Returns the CICD service config of every account that defines packages.
 
-    account_services = tuc.account_services
-    for acc_serv in account_services:
+    Args:
+        tuc (TerraformUserConfig): Instantiated `TerraformUserConfig` model
+
+    Returns:
+        (Dict[str, CICDConfigModel]): Account names mapped to their CICD configs
+    """
+    cicd_services = {}
+    for acc_serv in tuc.account_services:
         for service in acc_serv.services:
             if isinstance(service, CICDConfigModel):
                 if isinstance(service.packages, type(None)):
@@ -363,13 +589,182 @@ def apply_all_cicd_services(
                         "package configurations, skipping."
                     )
                     continue
-                else:
-                    apply_account_cicd_services(
-                        ccm=service,
-                        acc_name=acc_serv.account_name,
-                        acc_tf_output_dir=acc_tf_output_dir,
-                        profile=tuc.header.aws_profiles.identity_center.profile,
-                        organization_name=tuc.header.org_name,
-                        organization_email=tuc.header.org_email,
-                        package_build_dir=package_build_dir,
-                    )
+                cicd_services[acc_serv.account_name] = service
+    return cicd_services
+
+
+def plan_cicd_accounts(
+    cicd_services: Dict[str, CICDConfigModel],
+    acc_tf_output_dir: str,
+    profile: str,
+    max_workers: int = 4,
+) -> List[CicdAccountPlan]:
+    """Discovers the CICD plans of several accounts in parallel.
+
+    Args:
+        cicd_services (Dict[str, CICDConfigModel]): Account names mapped to their
+            CICD configs
+        acc_tf_output_dir (str): Path to accounts Terraform output directory
+        profile (str): AWS profile used to assume a role in each account
+        max_workers (int, default=4): Maximum number of accounts discovered
+            concurrently
+
+    Returns:
+        (List[CicdAccountPlan]): Account plans, in `cicd_services` order
+    """
+    if not cicd_services:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        return list(
+            executor.map(
+                lambda acc_name: plan_account_cicd_services(
+                    ccm=cicd_services[acc_name],
+                    acc_name=acc_name,
+                    acc_tf_output_dir=acc_tf_output_dir,
+                    profile=profile,
+                ),
+                cicd_services,
+            )
+        )
+
+
+def apply_cicd_plans(
+    tuc: TerraformUserConfig,
+    cicd_services: Dict[str, CICDConfigModel],
+    plans: List[CicdAccountPlan],
+    package_build_dir: str,
+    max_workers: int = 4,
+    confirm: bool = True,
+) -> bool:
+    """Presents a consolidated CICD plan and, once confirmed, applies each account's
+    plan concurrently.
+
+    Args:
+        tuc (TerraformUserConfig): Instantiated `TerraformUserConfig` model
+        cicd_services (Dict[str, CICDConfigModel]): Account names mapped to their
+            CICD configs
+        plans (List[CicdAccountPlan]): Discovered account plans
+        package_build_dir (str): Path to directory where packages are built
+        max_workers (int, default=4): Maximum number of package subprocess chains
+            run concurrently, across all accounts
+        confirm (bool, default=True): Ask the user to confirm the plan first
+
+    Returns:
+        (bool): False if the user declined the plan or an account failed to apply
+    """
+    for plan in plans:
+        print(format_cicd_plan(plan))
+
+    plans = [x for x in plans if len(x.require_init) > 0]
+    if not plans:
+        print("\nNothing to change, skipping.\n")
+        return True
+    print(
+        "Accounts requiring package initialization: "
+        f"{', '.join(x.account_name for x in plans)}\n"
+    )
+    if confirm and not confirm_cicd_plan():
+        return False
+
+    # Every account's packages share one executor, so at most `max_workers`
+    # subprocess chains run at once across all accounts
+    ok = True
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {}
+        for plan in plans:
+            try:
+                rendered = render_cicd_plan_packages(
+                    plan=plan,
+                    ccm=cicd_services[plan.account_name],
+                    organization_name=tuc.header.org_name,
+                    organization_email=tuc.header.org_email,
+                    package_build_dir=package_build_dir,
+                )
+            except Exception as e:
+                ok = False
+                print(f"Error applying CICD plan for account {plan.account_name}: {e}")
+                continue
+            futures.update(
+                submit_cicd_package_pushes(
+                    executor,
+                    plan,
+                    rendered,
+                    profile=tuc.header.aws_profiles.identity_center.profile,
+                )
+            )
+        for acc_name, results in collect_cicd_package_pushes(futures).items():
+            ok = ok and all(results.values())
+            print(f"Applied CICD plan for account {acc_name}")
+    return ok
+
+
+def apply_all_cicd_services_consolidated(
+    tuc: TerraformUserConfig,
+    acc_tf_output_dir: str,
+    package_build_dir: str,
+    max_workers: int = 4,
+) -> None:
+    """Reconciles CICD services across all accounts with a single confirmation.
+
+    Discovery (S3 and CodeArtifact listings) runs for every CICD account in
+    parallel, a consolidated plan is presented, and, once confirmed, each account's
+    plan is applied concurrently.
+
+    Args:
+        tuc (TerraformUserConfig): Instantiated `TerraformUserConfig` model
+        acc_tf_output_dir (str): Path to accounts Terraform output directory
+        package_build_dir (str): Path to directory where packages are built
+        max_workers (int, default=4): Maximum number of accounts discovered, and
+            package subprocess chains run, concurrently
+    """
+    cicd_services = get_cicd_account_services(tuc)
+    if not cicd_services:
+        print("\nNo accounts with CICD package configurations, nothing to do.\n")
+        return
+
+    plans = plan_cicd_accounts(
+        cicd_services=cicd_services,
+        acc_tf_output_dir=acc_tf_output_dir,
+        profile=tuc.header.aws_profiles.identity_center.profile,
+        max_workers=max_workers,
+    )
+    apply_cicd_plans(
+        tuc=tuc,
+        cicd_services=cicd_services,
+        plans=plans,
+        package_build_dir=package_build_dir,
+        max_workers=max_workers,
+    )
+
+
+def apply_all_cicd_services(
+    config_dir_path: str,
+    tf_modules_dir: str,
+    acc_tf_output_dir: str,
+    package_build_dir: str,
+    consolidated: bool = False,
+    max_workers: int = 4,
+):
+    tuc = load_terraform_user_config(
+        config_dir_path=config_dir_path, tf_modules_dir=tf_modules_dir
+    )
+
+    if consolidated:
+        apply_all_cicd_services_consolidated(
+            tuc=tuc,
+            acc_tf_output_dir=acc_tf_output_dir,
+            package_build_dir=package_build_dir,
+            max_workers=max_workers,
+        )
+        return
+
+    for acc_name, service in get_cicd_account_services(tuc).items():
+        apply_account_cicd_services(
+            ccm=service,
+            acc_name=acc_name,
+            acc_tf_output_dir=acc_tf_output_dir,
+            profile=tuc.header.aws_profiles.identity_center.profile,
+            organization_name=tuc.header.org_name,
+            organization_email=tuc.header.org_email,
+            package_build_dir=package_build_dir,
+        )
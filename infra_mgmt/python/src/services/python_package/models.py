@@ -1,5 +1,7 @@
 """Services models module."""
 
+from typing import List
+
 from pydantic import BaseModel
 
 # from ...terraform.models import TerraformUserConfig
@@ -25,3 +27,17 @@ class PythonPackageInput(BaseModel):
     @property
     def git_repo_path_with_key(self) -> str:
         return f"{self.codeartifact.git_s3_bucket}/{self.package_name}"
+
+
+class CicdAccountPlan(BaseModel):
+    """CICD reconciliation plan for a single account, formed from the packages in its
+    services config and those already found in its Git S3 bucket and CodeArtifact
+    repo."""
+
+    account_name: str
+    cicd_meta: CicdMetadata
+    s3_folders: List[str]
+    codeartifact_packages: List[str]
+    local_config_packages: List[str]
+    do_not_require_init: List[str]
+    require_init: List[str]
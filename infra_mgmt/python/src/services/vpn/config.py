@@ -0,0 +1,461 @@
+"""VPN client profile generation.
+
+Replaces the `vpn-configs-all` Makefile loop, which ran two `terraform output`
+subprocesses, an `sts assume-role` and an `ec2 export-client-vpn-client-configuration`
+for every user. Instead:
+
+1. Each account's endpoint ID and account ID are read from the cached Terraform
+   outputs written on apply (`.build/accounts/.output/<acct>.json`)
+2. Each endpoint's base client configuration is exported once per account,
+   concurrently, through a cached (assumed-role) session; see `get_boto3_session`
+3. Every user's `.ovpn` profile is stamped out from its account's base configuration
+   and the user's certificate/key (`.client_vpn_configs/<acct>/<user>.{crt,key}`),
+   concurrently
+
+Regeneration is incremental: a manifest in each account's output directory records
+the digests of every profile's inputs (base config, certificate and key) and of the
+written profile, so only profiles whose inputs changed, or whose file was modified
+or deleted, are rewritten. Profiles of users who no longer have VPN access to an
+account, per `iam.yaml`, are removed.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from os import makedirs, path, replace
+from typing import Dict, List, Optional, Set, Tuple
+
+from ...instrumentation import span
+from ...terraform.access import build_access_index
+from ...terraform.config import load_terraform_user_config
+from ...terraform.outputs import TerraformOutputError, load_account_outputs
+from ...terraform.utils import file_digest, json_digest, sha256_digest
+from ..python_package.aws import get_boto3_session
+from .models import (
+    VpnAccountResult,
+    VpnClientCert,
+    VpnEndpoint,
+    VpnProfileManifestEntry,
+    VpnProfilesManifest,
+)
+
+MANIFEST_FILENAME = ".manifest.json"
+
+
+class VpnConfigError(Exception):
+    pass
+
+
+def get_vpn_endpoint(account_name: str, acc_tf_output_dir: str) -> VpnEndpoint:
+    """Reads an account's client VPN endpoint from its cached Terraform outputs.
+
+    Args:
+        account_name (str): Account name
+        acc_tf_output_dir (str): Path to accounts Terraform output directory
+
+    Returns:
+        (VpnEndpoint): Account's client VPN endpoint
+
+    Raises:
+        VpnConfigError: If the outputs are missing or have no VPN endpoint
+    """
+    try:
+        outputs = load_account_outputs(acc_tf_output_dir, account_name)
+    except TerraformOutputError as e:
+        raise VpnConfigError(str(e)) from e
+    if outputs.client_vpn_endpoint_id is None or outputs.target_account_id is None:
+        raise VpnConfigError(
+            f"Terraform outputs of account {account_name} have no VPN outputs; has "
+            "the account been applied since its VPC/VPN was configured?"
+        )
+    return VpnEndpoint(
+        account_name=account_name,
+        account_id=outputs.target_account_id,
+        endpoint_id=outputs.client_vpn_endpoint_id,
+    )
+
+
+def list_vpn_client_certs(certs_dir: str) -> Dict[str, List[VpnClientCert]]:
+    """Lists the client certificate/key pairs in the VPN certs directory.
+
+    Args:
+        certs_dir (str): Path to the `.client_vpn_configs` directory
+
+    Returns:
+        (Dict[str, List[VpnClientCert]]): Account names mapped to their users'
+            certificates, sorted by user name
+    """
+    certs = {}
+    if not path.isdir(certs_dir):
+        return certs
+    with os.scandir(certs_dir) as acc_entries:
+        acc_dirs = sorted(x.path for x in acc_entries if x.is_dir())
+    for acc_dir in acc_dirs:
+        with os.scandir(acc_dir) as entries:
+            fnames = {x.name for x in entries if x.is_file()}
+        users = sorted(
+            x[: -len(".key")]
+            for x in fnames
+            if x.endswith(".key") and x[: -len(".key")] + ".crt" in fnames
+        )
+        if users:
+            certs[path.basename(acc_dir)] = [
+                VpnClientCert(
+                    user_name=x,
+                    cert_path=path.join(acc_dir, x + ".crt"),
+                    key_path=path.join(acc_dir, x + ".key"),
+                )
+                for x in users
+            ]
+    return certs
+
+
+def export_vpn_base_config(endpoint: VpnEndpoint, profile: str, region: str) -> str:
+    """Exports a client VPN endpoint's base client configuration.
+
+    Args:
+        endpoint (VpnEndpoint): Account's client VPN endpoint
+        profile (str): AWS profile role assumption into the account starts from
+        region (str): AWS region of the endpoint
+
+    Returns:
+        (str): Base client configuration, without client certificate and key
+    """
+    with span("vpn_export_base_config", account=endpoint.account_name) as s:
+        session = get_boto3_session(profile, region, endpoint.account_id)
+        ec2_client = session.client("ec2")
+        response = ec2_client.export_client_vpn_client_configuration(
+            ClientVpnEndpointId=endpoint.endpoint_id
+        )
+        base_config = response["ClientConfiguration"]
+        s.add_bytes(len(base_config))
+        return base_config
+
+
+def render_vpn_profile(base_config: str, cert: str, key: str) -> str:
+    """Appends a client certificate and key to a base client configuration, laid out
+    as the `vpn-config` Makefile target lays them out.
+
+    Args:
+        base_config (str): Endpoint's base client configuration
+        cert (str): Client certificate PEM
+        key (str): Client private key PEM
+
+    Returns:
+        (str): Client profile (`.ovpn`) contents
+    """
+    return (
+        base_config.rstrip("\n")
+        + "\n\n<cert>\n"
+        + cert
+        + "\n</cert>\n\n<key>\n"
+        + key
+        + "\n</key>\n"
+    )
+
+
+def write_vpn_profile(profile_path: str, content: str) -> None:
+    """Atomically writes a client profile, readable by its owner only since it holds
+    the client's private key.
+
+    Args:
+        profile_path (str): Path to `.ovpn` file
+        content (str): Client profile contents
+    """
+    tmp_path = profile_path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(content)
+    replace(tmp_path, profile_path)
+
+
+def stamp_vpn_profile(base_config: str, cert: VpnClientCert, profile_path: str) -> str:
+    """Writes a user's client profile from their account's base configuration.
+
+    Args:
+        base_config (str): Endpoint's base client configuration
+        cert (VpnClientCert): User's client certificate and key
+        profile_path (str): Path to `.ovpn` file
+
+    Returns:
+        (str): Written client profile contents
+    """
+    with open(cert.cert_path, "r") as f:
+        cert_pem = f.read()
+    with open(cert.key_path, "r") as f:
+        key_pem = f.read()
+    content = render_vpn_profile(base_config, cert_pem, key_pem)
+    write_vpn_profile(profile_path, content)
+    return content
+
+
+def load_vpn_profiles_manifest(account_output_dir: str) -> VpnProfilesManifest:
+    """Loads an account's VPN profiles manifest, or an empty one if none exists.
+
+    Args:
+        account_output_dir (str): Path to directory the account's profiles are
+            written to
+
+    Returns:
+        (VpnProfilesManifest): Manifest
+    """
+    manifest_path = path.join(account_output_dir, MANIFEST_FILENAME)
+    if not path.isfile(manifest_path):
+        return VpnProfilesManifest()
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return VpnProfilesManifest.model_validate_json(f.read())
+
+
+def write_vpn_profiles_manifest(
+    account_output_dir: str, manifest: VpnProfilesManifest
+) -> None:
+    """Atomically writes an account's VPN profiles manifest.
+
+    Args:
+        account_output_dir (str): Path to directory the account's profiles are
+            written to
+        manifest (VpnProfilesManifest): Manifest to write
+    """
+    manifest_path = path.join(account_output_dir, MANIFEST_FILENAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(manifest.model_dump_json(indent=4))
+    replace(tmp_path, manifest_path)
+
+
+def list_vpn_profiles(account_output_dir: str) -> List[str]:
+    """Lists the user names of the profiles in an account's output directory."""
+    if not path.isdir(account_output_dir):
+        return []
+    with os.scandir(account_output_dir) as entries:
+        return sorted(
+            x.name[: -len(".ovpn")]
+            for x in entries
+            if x.is_file() and x.name.endswith(".ovpn")
+        )
+
+
+def remove_vpn_profiles(
+    account_output_dir: str,
+    manifest: VpnProfilesManifest,
+    keep: Set[str],
+) -> List[str]:
+    """Removes an account's profiles, and their manifest entries, other than those of
+    the given users.
+
+    Args:
+        account_output_dir (str): Path to directory the account's profiles are
+            written to
+        manifest (VpnProfilesManifest): Account's manifest, updated in place
+        keep (Set[str]): User names whose profiles are kept
+
+    Returns:
+        (List[str]): User names whose profiles were removed
+    """
+    removed = []
+    existing = set(manifest.profiles) | set(list_vpn_profiles(account_output_dir))
+    for user_name in sorted(existing - keep):
+        profile_path = path.join(account_output_dir, user_name + ".ovpn")
+        if path.isfile(profile_path):
+            os.remove(profile_path)
+        manifest.profiles.pop(user_name, None)
+        removed.append(user_name)
+    return removed
+
+
+def generate_vpn_profiles(
+    config_dir_path: str,
+    tf_modules_dir: str,
+    acc_tf_output_dir: str,
+    certs_dir: str,
+    output_dir: str,
+    accounts: Optional[List[str]] = None,
+    profile: Optional[str] = None,
+    region: Optional[str] = None,
+    max_workers: int = 8,
+    force: bool = False,
+) -> List[VpnAccountResult]:
+    """Generates the client VPN profile of every user with VPN access to an account
+    and a client certificate for it, to `<output_dir>/<acct>/<user>.ovpn`, rewriting
+    only profiles whose inputs changed and removing those of users who lost access.
+
+    Args:
+        config_dir_path (str): Absolute path to user-configurations directory
+        tf_modules_dir (str): Absolute path to Terraform modules directory
+        acc_tf_output_dir (str): Path to accounts Terraform output directory
+        certs_dir (str): Path to the `.client_vpn_configs` directory
+        output_dir (str): Path to directory profiles are written to
+        accounts (List[str], optional): Only generate these accounts' profiles
+        profile (str, optional): AWS profile role assumption into accounts starts
+            from, defaults to the `org_main` profile in header.yaml
+        region (str, optional): AWS region of the endpoints, defaults to the
+            `org_main` region in header.yaml
+        max_workers (int, default=8): Maximum number of concurrent exports/profiles
+        force (bool, default=False): Rewrite every profile, ignoring the manifests
+
+    Returns:
+        (List[VpnAccountResult]): Outcome of each account, sorted by account name
+    """
+    tuc = load_terraform_user_config(
+        config_dir_path=config_dir_path, tf_modules_dir=tf_modules_dir
+    )
+    profile = profile or tuc.header.aws_profiles.org_main.profile
+    region = region or tuc.header.aws_profiles.org_main.region
+    access = build_access_index(tuc.iam)
+
+    # Accounts with client certificates, or with profiles left from earlier runs
+    certs = list_vpn_client_certs(certs_dir)
+    acc_names = set(certs)
+    if path.isdir(output_dir):
+        with os.scandir(output_dir) as entries:
+            acc_names |= {x.name for x in entries if x.is_dir()}
+    if accounts is not None:
+        missing = [x for x in accounts if x not in acc_names]
+        if missing:
+            print(f"No client certificates found for: {', '.join(missing)}")
+        acc_names &= set(accounts)
+
+    results = {x: VpnAccountResult(account_name=x) for x in sorted(acc_names)}
+    manifests = {}
+    eligible = {}
+    for acc_name, result in results.items():
+        acc_output_dir = path.join(output_dir, acc_name)
+        manifests[acc_name] = load_vpn_profiles_manifest(acc_output_dir)
+        vpn_user_names = {x.user_name for x in access.get_vpn_users(acc_name)}
+        eligible[acc_name] = [
+            x for x in certs.get(acc_name, []) if x.user_name in vpn_user_names
+        ]
+        result.removed = remove_vpn_profiles(
+            acc_output_dir,
+            manifests[acc_name],
+            keep={x.user_name for x in eligible[acc_name]},
+        )
+
+    endpoints = {}
+    for acc_name in [x for x in results if eligible[x]]:
+        try:
+            endpoints[acc_name] = get_vpn_endpoint(acc_name, acc_tf_output_dir)
+        except VpnConfigError as e:
+            results[acc_name].error = str(e)
+
+    def export(acc_name: str) -> Tuple[str, Optional[str]]:
+        try:
+            return acc_name, export_vpn_base_config(
+                endpoints[acc_name], profile, region
+            )
+        except Exception as e:
+            results[acc_name].error = f"Failed to export base configuration: {e}"
+            return acc_name, None
+
+    def sync(acc_name: str, base_digest: str, base_config: str, cert: VpnClientCert):
+        profile_path = path.join(output_dir, acc_name, cert.user_name + ".ovpn")
+        inputs = json_digest(
+            [base_digest, file_digest(cert.cert_path), file_digest(cert.key_path)]
+        )
+        previous = manifests[acc_name].profiles.get(cert.user_name)
+        if (
+            not force
+            and previous is not None
+            and previous.inputs == inputs
+            and file_digest(profile_path) == previous.output
+        ):
+            results[acc_name].unchanged.append(cert.user_name)
+            return
+        with span("vpn_stamp_profile", account=acc_name) as s:
+            content = stamp_vpn_profile(base_config, cert, profile_path)
+            s.add_bytes(len(content))
+        manifests[acc_name].profiles[cert.user_name] = VpnProfileManifestEntry(
+            inputs=inputs, output=sha256_digest(content)
+        )
+        if previous is None:
+            results[acc_name].added.append(cert.user_name)
+        else:
+            results[acc_name].updated.append(cert.user_name)
+
+    base_configs = {}
+    if endpoints:
+        workers = min(max_workers, len(endpoints))
+        print(f"Exporting base VPN configurations of {len(endpoints)} account(s)...")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            base_configs = dict(x for x in executor.map(export, endpoints) if x[1])
+
+    jobs = []
+    for acc_name, base_config in base_configs.items():
+        base_digest = sha256_digest(base_config)
+        manifest = manifests[acc_name]
+        if manifest.base_config not in [None, base_digest]:
+            print(f"{acc_name}: base VPN configuration changed")
+        manifest.endpoint_id = endpoints[acc_name].endpoint_id
+        manifest.base_config = base_digest
+        makedirs(path.join(output_dir, acc_name), exist_ok=True)
+        jobs += [(acc_name, base_digest, base_config, x) for x in eligible[acc_name]]
+    print(f"Checking {len(jobs)} VPN profile(s)...")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(sync, *x): x for x in jobs}
+        for future, (acc_name, _, _, cert) in futures.items():
+            # A missing or unreadable cert/key only fails that user's profile
+            try:
+                future.result()
+            except Exception as e:
+                results[acc_name].failed[cert.user_name] = str(e)
+
+    for acc_name, result in results.items():
+        for names in [result.added, result.updated, result.unchanged]:
+            names.sort()
+        acc_output_dir = path.join(output_dir, acc_name)
+        if not path.isdir(acc_output_dir):
+            continue
+        if manifests[acc_name].profiles or list_vpn_profiles(acc_output_dir):
+            write_vpn_profiles_manifest(acc_output_dir, manifests[acc_name])
+        else:
+            # No profiles left, e.g., the account's VPN was removed
+            manifest_path = path.join(acc_output_dir, MANIFEST_FILENAME)
+            if path.isfile(manifest_path):
+                os.remove(manifest_path)
+            if not os.listdir(acc_output_dir):
+                os.rmdir(acc_output_dir)
+    return list(results.values())
+
+
+def format_vpn_results(results: List[VpnAccountResult], output_dir: str) -> str:
+    """Formats a summary of added, updated and removed VPN profiles.
+
+    Args:
+        results (List[VpnAccountResult]): Outcome of each account
+        output_dir (str): Path to directory profiles were written to
+
+    Returns:
+        (str): Summary
+    """
+    lines = []
+    for result in results:
+        counts = (
+            f"{len(result.added)} added, {len(result.updated)} updated, "
+            f"{len(result.removed)} removed, {len(result.unchanged)} unchanged"
+        )
+        if result.failed:
+            counts += f", {len(result.failed)} failed"
+        if result.error is not None:
+            counts += f" - ERROR: {result.error}"
+        lines.append(f"{result.account_name}: {counts}")
+        for user_name, error in sorted(result.failed.items()):
+            lines.append(f"    FAILED {user_name}: {error}")
+        for label, names in [
+            ("added", result.added),
+            ("updated", result.updated),
+            ("removed", result.removed),
+        ]:
+            if names:
+                lines.append(f"    {label}: {', '.join(names)}")
+    added = sum(len(x.added) for x in results)
+    updated = sum(len(x.updated) for x in results)
+    removed = sum(len(x.removed) for x in results)
+    unchanged = sum(len(x.unchanged) for x in results)
+    failed = sum(len(x.failed) for x in results)
+    lines.append(
+        f"\nVPN profiles in {output_dir}: {added} added, {updated} updated, "
+        f"{removed} removed, {unchanged} unchanged"
+        + (f", {failed} failed" if failed else "")
+    )
+    if added or updated:
+        lines.append("Please distribute new/updated files securely to their users.")
+    return "\n".join(lines)
@@ -0,0 +1,49 @@
+"""VPN client profile models."""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class VpnEndpoint(BaseModel):
+    """Client VPN endpoint of an account, read from the account's Terraform outputs"""
+
+    account_name: str
+    account_id: str
+    endpoint_id: str
+
+
+class VpnClientCert(BaseModel):
+    """Client certificate and key generated by an account's `vpn_clients.tf`"""
+
+    user_name: str
+    cert_path: str
+    key_path: str
+
+
+class VpnProfileManifestEntry(BaseModel):
+    """Digests of a client profile's inputs (base config, cert and key) and of the
+    written profile"""
+
+    inputs: str
+    output: str
+
+
+class VpnProfilesManifest(BaseModel):
+    """Profiles generated for an account, as of the last run"""
+
+    endpoint_id: Optional[str] = None
+    base_config: Optional[str] = None
+    profiles: Dict[str, VpnProfileManifestEntry] = {}
+
+
+class VpnAccountResult(BaseModel):
+    """Outcome of generating the VPN client profiles of a single account"""
+
+    account_name: str
+    added: List[str] = []
+    updated: List[str] = []
+    removed: List[str] = []
+    unchanged: List[str] = []
+    failed: Dict[str, str] = {}  # User names mapped to why their profile failed
+    error: Optional[str] = None
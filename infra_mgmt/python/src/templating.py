@@ -0,0 +1,71 @@
+"""Shared Jinja2 template registry.
+
+Every template under `src/templates` is loaded and compiled once per process, into a
+single environment shared by all generators. Compiled templates are also kept in
+Jinja2's on-disk bytecode cache, so cold starts of each `python -m` entry point skip
+template compilation.
+"""
+
+from functools import lru_cache
+from os import path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+CURR_DIR = path.dirname(path.abspath(__file__))  # infra_mgmt/python/src
+TEMPLATES_DIR = path.join(CURR_DIR, "templates")
+
+# Only files with these suffixes are Jinja2 templates; other files under
+# `src/templates` (e.g., zsh configs) are copied verbatim
+TEMPLATE_SUFFIXES = (".txt", ".jinja2", ".core")
+
+# Bytecode cache files are written to a per-user directory in the system temp dir
+BYTECODE_CACHE_PATTERN = "infra_mgmt_%s.cache"
+
+
+def is_template(name: str) -> bool:
+    return name.endswith(TEMPLATE_SUFFIXES)
+
+
+@lru_cache(maxsize=None)
+def get_template_environment() -> Environment:
+    """Returns the process-wide template environment, with every template under
+    `src/templates` already compiled.
+
+    Returns:
+        (Environment): Shared Jinja2 environment; template names are paths relative
+            to `src/templates`, e.g., `terraform/org/org_tf_vars.txt`
+    """
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        bytecode_cache=FileSystemBytecodeCache(pattern=BYTECODE_CACHE_PATTERN),
+        cache_size=-1,
+    )
+    for name in environment.list_templates(filter_func=is_template):
+        environment.get_template(name)
+    return environment
+
+
+def get_template(name: str) -> Template:
+    """Returns a compiled template from the shared registry.
+
+    Args:
+        name (str): Template path relative to `src/templates`
+
+    Returns:
+        (Template): Compiled template
+    """
+    return get_template_environment().get_template(name)
+
+
+def get_template_source(name: str) -> str:
+    """Returns the raw source of a template in the shared registry.
+
+    Args:
+        name (str): Template path relative to `src/templates`
+
+    Returns:
+        (str): Template source
+    """
+    environment = get_template_environment()
+    source, _, _ = environment.loader.get_source(environment, name)
+    return source
@@ -0,0 +1,56 @@
+"""Index of the users with access to each account.
+
+Access to an account is granted through the groups mapped to it in
+`iam.group_accounts`. Rather than scanning every user's groups for each account,
+the index inverts the mapping once, in a single pass over the users, so each
+account's users, VPN users and reviewer emails are dict lookups.
+"""
+
+from typing import Dict, Set
+
+from .models import AccessIndex, IamConfigModel
+
+
+def is_reviewer_group(group: str) -> bool:
+    """Whether members of a group are added to review/build notification lists.
+
+    Args:
+        group (str): Group name
+
+    Returns:
+        (bool): True for developer and admin groups
+    """
+    lc_group = group.lower()
+    return "developer" in lc_group or "admin" in lc_group
+
+
+def build_access_index(iam: IamConfigModel) -> AccessIndex:
+    """Builds the index of the users with access to each account.
+
+    Users are listed in the order they are configured in, once per account.
+    Reviewer emails are those of users granted access to an account through a
+    developer or admin group.
+
+    Args:
+        iam (IamConfigModel): Instantiated `IamConfigModel` model
+
+    Returns:
+        (AccessIndex): Account names mapped to their users, VPN users and reviewer
+            emails
+    """
+    index = AccessIndex()
+    reviewer_emails: Dict[str, Set[str]] = {}
+    for user in iam.users:
+        acc_names = set()
+        for group in user.groups:
+            group_accounts = iam.group_accounts.get(group) or []
+            acc_names.update(group_accounts)
+            if is_reviewer_group(group):
+                for acc_name in group_accounts:
+                    reviewer_emails.setdefault(acc_name, set()).add(user.email)
+        for acc_name in acc_names:
+            index.users.setdefault(acc_name, []).append(user)
+            if user.vpn_access:
+                index.vpn_users.setdefault(acc_name, []).append(user)
+    index.reviewer_emails = {k: sorted(v) for k, v in reviewer_emails.items()}
+    return index
@@ -0,0 +1,121 @@
+"""Persistent cache of the validated `TerraformUserConfig` model.
+
+The cache is keyed on a digest of every user configuration file, the Terraform
+modules directory listing and the model/loader sources, and is stored as a
+serialized pydantic dump under the Terraform `.config` directory. Repeat loads with
+unchanged inputs skip YAML parsing and cross-validation entirely.
+"""
+
+import json
+from os import listdir, makedirs, path, replace
+from typing import Dict, Optional
+
+from .models import TerraformUserConfig
+from .utils import file_digest, json_digest
+
+CURR_DIR = path.dirname(path.abspath(__file__))
+
+CACHE_FILENAME = "user_config_cache.json"
+
+# Source files whose changes invalidate cached configs
+CACHE_SOURCES = [
+    path.join(CURR_DIR, "models.py"),
+    path.join(CURR_DIR, "config.py"),
+    path.join(CURR_DIR, "validation.py"),
+    path.join(CURR_DIR, "access.py"),
+]
+
+# In-process cache of serialized configs, keyed on cache key. Configs are stored
+# serialized so every caller gets its own (mutable) model instance.
+_MEMORY_CACHE: Dict[str, str] = {}
+
+
+def get_user_config_cache_path(tf_modules_dir: str) -> str:
+    """Returns the cache file path, in the `.config` directory sitting next to the
+    Terraform modules directory.
+
+    Args:
+        tf_modules_dir (str): Absolute path to Terraform modules directory
+
+    Returns:
+        (str): Cache file path
+    """
+    tf_dir = path.dirname(path.abspath(tf_modules_dir))
+    return path.join(tf_dir, ".config", CACHE_FILENAME)
+
+
+def get_user_config_cache_key(config_dir_path: str, tf_modules_dir: str) -> str:
+    """Computes the cache key of a user configuration.
+
+    Args:
+        config_dir_path (str): Absolute path to user-configurations directory
+        tf_modules_dir (str): Absolute path to Terraform modules directory
+
+    Returns:
+        (str): Hex digest of every input the loaded config depends on
+    """
+    inputs = {}
+    for fname in ["header.yaml", "iam.yaml", "vpc-vpn-header.yaml"]:
+        inputs[fname] = file_digest(path.join(config_dir_path, fname))
+    acc_serv_dir = path.join(config_dir_path, "account-services")
+    if path.isdir(acc_serv_dir):
+        for fname in sorted(listdir(acc_serv_dir)):
+            inputs[f"account-services/{fname}"] = file_digest(
+                path.join(acc_serv_dir, fname)
+            )
+    inputs["modules"] = sorted(listdir(tf_modules_dir))
+    inputs["sources"] = [file_digest(x) for x in CACHE_SOURCES]
+    return json_digest(inputs)
+
+
+def read_cached_user_config(
+    cache_path: str, cache_key: str
+) -> Optional[TerraformUserConfig]:
+    """Reads a cached `TerraformUserConfig` model, if one exists for the cache key.
+
+    Args:
+        cache_path (str): Cache file path
+        cache_key (str): Cache key of the user configuration
+
+    Returns:
+        (Optional[TerraformUserConfig]): Cached model, or None on a cache miss
+    """
+    if cache_key in _MEMORY_CACHE:
+        return TerraformUserConfig.model_validate_json(_MEMORY_CACHE[cache_key])
+    if not path.isfile(cache_path):
+        return None
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("key") != cache_key:
+            return None
+        tuc = TerraformUserConfig.model_validate(cached["config"])
+    except (ValueError, KeyError):
+        # Corrupt or stale-format cache files are treated as a miss
+        return None
+    _MEMORY_CACHE[cache_key] = tuc.model_dump_json()
+    return tuc
+
+
+def write_cached_user_config(
+    cache_path: str, cache_key: str, tuc: TerraformUserConfig
+) -> None:
+    """Atomically writes a validated `TerraformUserConfig` model to the cache.
+
+    Args:
+        cache_path (str): Cache file path
+        cache_key (str): Cache key of the user configuration
+        tuc (TerraformUserConfig): Validated model
+    """
+    _MEMORY_CACHE[cache_key] = tuc.model_dump_json()
+    makedirs(path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"key": cache_key, "config": tuc.model_dump(mode="json")}, f)
+    replace(tmp_path, cache_path)
+
+
+def clear_memory_cache() -> None:
+    """Clears the in-process cache, so the next load reads the cache file (or parses
+    the user configuration) as a fresh process would."""
+    _MEMORY_CACHE.clear()
@@ -1,12 +1,25 @@
 import json
-from os import listdir, makedirs, path, rmdir
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from os import listdir, makedirs, path, remove, rmdir
+from typing import Dict, List, Optional, Tuple
 
 import yaml
-from jinja2 import Environment, FileSystemLoader
-
+from pydantic import ValidationError
+
+from ..instrumentation import span, traced
+from ..templating import get_template, get_template_source
+from .access import build_access_index
+from .cache import (
+    get_user_config_cache_key,
+    get_user_config_cache_path,
+    read_cached_user_config,
+    write_cached_user_config,
+)
+from .manifest import load_account_modules_manifest, write_account_modules_manifest
 from .models import (
+    AccessIndex,
     Account,
+    AccountModuleManifestEntry,
     AccountServicesConfig,
     AccountsList,
     AccountVpcVpnOctets,
@@ -16,13 +29,18 @@ from .models import (
     InitIamParam,
     TerraformUserConfig,
     TestWebAppConfigModel,
+    ValidationReport,
     VpcVpnHeaderConfigModel,
     VpnVpcConfigModel,
 )
-from .utils import quiet_terraform_output_json, rearrange_quiet_terraform_output_dict
+from .plugin_cache import provision_plugin_cache
+from .outputs import load_org_outputs
+from .utils import file_digest, json_digest, sha256_digest
+from .validation import validate_iam_config
+
+TEMPLATES_PREFIX = "terraform"
 
-CURR_DIR = path.dirname(path.abspath(__file__))
-TEMPLATES_DIR = path.join(CURR_DIR, "..", "templates", "terraform")
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class ConfigError(Exception):
@@ -79,6 +97,34 @@ def get_account_services_config_paths(
     ]
 
 
+def load_yaml_file(filepath: str):
+    """Parses a YAML file, using the LibYAML-backed loader when it is available."""
+    with open(filepath, "r") as f:
+        return yaml.load(f, Loader=YAML_LOADER)
+
+
+def load_account_services_configs(
+    account_services_config_dir: str, max_workers: int = 8
+) -> Dict[str, dict]:
+    """Parses every account-services config file exactly once, concurrently.
+
+    Args:
+        account_services_config_dir (str): Absolute path to the
+            user-configurations/account-services directory
+        max_workers (int, default=8): Maximum number of files parsed concurrently
+
+    Returns:
+        (Dict[str, dict]): Each key is an account-services config filename, mapped to
+            the file's parsed contents.
+    """
+    fnames, fpaths = get_account_services_config_paths(account_services_config_dir)
+    if not fnames:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(fpaths))) as executor:
+        configs = list(executor.map(load_yaml_file, fpaths))
+    return {fname: config or {} for fname, config in zip(fnames, configs)}
+
+
 def get_configured_modules_by_account(account_services_config_dir: str) -> dict:
     """Returns a dictionary of filepath: list of named services, used in later cross-
     validation checks.
@@ -91,23 +137,22 @@ def get_configured_modules_by_account(account_services_config_dir: str) -> dict:
         (dict): Each key is an absolute filepath to an account-services config file,
             each key is mapped to a list of services defined in that file.
     """
-    _, filepaths = get_account_services_config_paths(account_services_config_dir)
-    data = {}
-    for fp in filepaths:
-        config = yaml.safe_load(open(fp, "r"))
-        data[fp] = list(config.keys())
-    return data
+    configs = load_account_services_configs(account_services_config_dir)
+    return {
+        path.join(account_services_config_dir, fname): list(config.keys())
+        for fname, config in configs.items()
+    }
 
 
 def validate_account_names(
-    account_services_config_dir: str, header_config: HeaderConfigModel
+    account_services_configs: Dict[str, dict], header_config: HeaderConfigModel
 ) -> None:
     """Validates account names encoded in account-services filenames match those found
     in the head.yaml user config file.
 
     Args:
-        account_services_config_dir (str): Absolute path to the
-            user-configurations/account-services directory
+        account_services_configs (Dict[str, dict]): Parsed account-services configs,
+            keyed on filename, as returned by `load_account_services_configs`
         header_config (HeaderConfigModel): Instantiated header configuration model from
             user configuration header.yaml file.
 
@@ -117,8 +162,7 @@ def validate_account_names(
     Raises:
         ConfigError: If account names do not match.
     """
-    filenames, _ = get_account_services_config_paths(account_services_config_dir)
-    for fname in filenames:
+    for fname in account_services_configs:
         account_name = fname.split(".services.yaml")[0]
         if account_name not in header_config.managed_accounts:
             msg = f"No account named {account_name} found in header.yaml config"
@@ -126,14 +170,14 @@ def validate_account_names(
 
 
 def validate_account_services_modules(
-    account_services_config_dir: str, modules_dir: str
+    account_services_configs: Dict[str, dict], modules_dir: str
 ) -> None:
     """Validates services included in all account-services config file against those
     defined in the Terraform modules dir.
 
     Args:
-        account_services_config_dir (str): Absolute path to the
-            user-configurations/account-services directory
+        account_services_configs (Dict[str, dict]): Parsed account-services configs,
+            keyed on filename, as returned by `load_account_services_configs`
         modules_dir (str): Absolute path to Terraform modules directory
 
     Returns:
@@ -143,32 +187,31 @@ def validate_account_services_modules(
         ConfigError: If services in configs don't match those found in Terraform modules
             directory.
     """
-    configs = get_configured_modules_by_account(account_services_config_dir)
-    modules = listdir(modules_dir)
+    modules = set(listdir(modules_dir))
     invalid = {}
-    for filepath, config_models in configs.items():
-        for cm in config_models:
+    for fname, config in account_services_configs.items():
+        for cm in config:
             if "ignore" in cm:
                 continue
             if cm not in modules:
-                if filepath not in invalid.keys():
-                    invalid[filepath] = []
-                invalid[filepath].append(cm)
+                invalid.setdefault(fname, []).append(cm)
 
     if len(invalid.keys()) > 0:
         msg = "Invalid module(s) defined in account-services configs.\n"
         msg += "The following listed modules, listed under their config\n"
-        msg += "filepath, do not exist:\n"
-        for fp in invalid.keys():
-            msg += f"\t{fp}: {', '.join(invalid[fp])}\n"
+        msg += "filename, do not exist:\n"
+        for fname in invalid.keys():
+            msg += f"\t{fname}: {', '.join(invalid[fname])}\n"
         raise ConfigError(msg)
 
 
 def validate_account_services(
-    account_services_config_dir: str, header_config: HeaderConfigModel, modules_dir: str
+    account_services_configs: Dict[str, dict],
+    header_config: HeaderConfigModel,
+    modules_dir: str,
 ) -> None:
-    validate_account_names(account_services_config_dir, header_config)
-    validate_account_services_modules(account_services_config_dir, modules_dir)
+    validate_account_names(account_services_configs, header_config)
+    validate_account_services_modules(account_services_configs, modules_dir)
 
 
 def form_account_services_config(
@@ -179,6 +222,9 @@ def form_account_services_config(
 ) -> List[AccountServicesConfig]:
     """Forms the `account_services` attribute of the `TerraformUserConfig` model.
 
+    Each account-services config file is parsed exactly once; the parsed contents are
+    shared between validation and model construction.
+
     Args:
         account_services_config_dir (str): Absolute path to the
             user-configurations/account-services directory
@@ -192,13 +238,11 @@ def form_account_services_config(
         (List[AccountServicesConfig]): `account_services` attribute of the
             `TerraformUserConfig` model
     """
-    validate_account_services(account_services_config_dir, header_config, modules_dir)
-
-    fnames, fpaths = get_account_services_config_paths(account_services_config_dir)
+    acc_serv_configs = load_account_services_configs(account_services_config_dir)
+    validate_account_services(acc_serv_configs, header_config, modules_dir)
 
     acc_serv_config = []
-    for idx, fname in enumerate(fnames):
-        acc_config = yaml.safe_load(open(fpaths[idx], "r"))
+    for fname, acc_config in acc_serv_configs.items():
         acc_name = fname.split(".services.yaml")[0]
         services = []
         for service in acc_config.keys():
@@ -270,6 +314,7 @@ def validate_iam(tuc: TerraformUserConfig, iam: IamConfigModel) -> None:
         1. Group names in group <> accounts map match those in groups list
         2. Account names in group <> accounts map match those listed in header.yaml
         3. Group names assigned to users match those in groups list
+        4. Group names and user names are unique
 
     Args:
         tuc (TerraformUserConfig): Instantiated `TerraformUserConfig` model
@@ -279,42 +324,80 @@ def validate_iam(tuc: TerraformUserConfig, iam: IamConfigModel) -> None:
         None
 
     Raises:
-        ConfigError: If any of the three checks fail.
+        ConfigError: If any of the checks fail, listing every failure.
     """
+    report = validate_iam_config(tuc.header, iam)
+    if report.errors:
+        raise ConfigError(
+            "Invalid IAM user configurations:\n"
+            + "\n".join(f"\t{x.message}" for x in report.errors)
+        )
 
-    # 1. Group names in group <> accounts map match those in groups list
-    group_names = iam.groups
-    for group in iam.group_accounts.keys():
-        if group not in group_names:
-            raise ConfigError(
-                f"Group {group} in group <> accounts map does not exist in main groups"
-                " list."
-            )
 
-    # 2. Account names in group <> accounts map match those listed in header.yaml
-    header_acc_names = list(tuc.header.managed_accounts.keys())
-    for group, group_accounts in iam.group_accounts.items():
-        for acc in group_accounts:
-            if acc not in header_acc_names:
-                raise ConfigError(
-                    f"Account {acc} for group {group} not in managed-accounts list. "
-                    f"Expecting one of {', '.join(header_acc_names)}"
-                )
+def validate_user_config_files(
+    config_dir_path: str, tf_modules_dir: str
+) -> ValidationReport:
+    """Validates the user configuration YAML files, collecting every violation
+    rather than stopping at the first.
 
-    # 3. Group names assigned to users match those in groups list
-    for user in iam.users:
-        for group in user.groups:
-            if group not in group_names:
-                raise ConfigError(
-                    f"Group {group} assigned to user {user.display_name} does not "
-                    "exist in group list."
-                )
+    Args:
+        config_dir_path (str): Absolute path to user-configurations directory
+        tf_modules_dir (str): Absolute path to Terraform modules directory
 
+    Returns:
+        (ValidationReport): Every violation found
+    """
+    report = ValidationReport()
+    models = {}
+    for fname, model in [
+        ("header.yaml", HeaderConfigModel),
+        ("iam.yaml", IamConfigModel),
+        ("vpc-vpn-header.yaml", VpcVpnHeaderConfigModel),
+    ]:
+        try:
+            models[fname] = model(**load_yaml_file(path.join(config_dir_path, fname)))
+        except (OSError, yaml.YAMLError, TypeError, ValidationError) as e:
+            report.add("schema", f"{fname}: {e}")
+    head = models.get("header.yaml")
+    iam = models.get("iam.yaml")
+    vpc_vpn_head = models.get("vpc-vpn-header.yaml")
+
+    if head is not None and iam is not None:
+        with span("validate_iam"):
+            report.extend(validate_iam_config(head, iam))
+    if head is None or vpc_vpn_head is None:
+        return report
+
+    try:
+        acc_servs = form_account_services_config(
+            account_services_config_dir=path.join(config_dir_path, "account-services"),
+            header_config=head,
+            modules_dir=tf_modules_dir,
+            vpc_vpn_head_config=vpc_vpn_head,
+        )
+    except ConfigError as e:
+        report.add("account_services", str(e).strip())
+        return report
+    except (OSError, yaml.YAMLError, TypeError, KeyError, ValidationError) as e:
+        report.add("schema", f"account-services: {e}")
+        return report
+
+    if iam is not None:
+        tuc = TerraformUserConfig(
+            header=head, iam=iam, vpc_header=vpc_vpn_head, account_services=acc_servs
+        )
+        try:
+            validate_unique_vpc_vpn_octet_assigments(tuc)
+        except ConfigError as e:
+            report.add("vpc_vpn_octets", str(e))
+    return report
 
-def load_terraform_user_config(
+
+def parse_terraform_user_config(
     config_dir_path: str, tf_modules_dir: str
 ) -> TerraformUserConfig:
-    """Loads the `TerraformUserConfig` model for later use in configuration processes.
+    """Parses and validates the `TerraformUserConfig` model from the user
+    configuration YAML files, bypassing the config cache.
 
     Args:
         config_dir_path (str): Absolute path to user-configurations directory
@@ -328,27 +411,88 @@ def load_terraform_user_config(
     vpc_header_path = path.join(config_dir_path, "vpc-vpn-header.yaml")
     acc_serv_dir = path.join(config_dir_path, "account-services")
 
-    head = HeaderConfigModel(**yaml.safe_load(open(header_path, "r")))
+    with span("parse_user_config"):
+        head = HeaderConfigModel(**load_yaml_file(header_path))
 
-    iam = IamConfigModel(**yaml.safe_load(open(iam_path, "r")))
-    vpc_vpn_head = VpcVpnHeaderConfigModel(**yaml.safe_load(open(vpc_header_path, "r")))
+        iam = IamConfigModel(**load_yaml_file(iam_path))
+        vpc_vpn_head = VpcVpnHeaderConfigModel(**load_yaml_file(vpc_header_path))
 
-    acc_servs = form_account_services_config(
-        account_services_config_dir=acc_serv_dir,
-        header_config=head,
-        modules_dir=tf_modules_dir,
-        vpc_vpn_head_config=vpc_vpn_head,
-    )
-    tuc = TerraformUserConfig(
-        header=head, iam=iam, vpc_header=vpc_vpn_head, account_services=acc_servs
-    )
+        acc_servs = form_account_services_config(
+            account_services_config_dir=acc_serv_dir,
+            header_config=head,
+            modules_dir=tf_modules_dir,
+            vpc_vpn_head_config=vpc_vpn_head,
+        )
+        tuc = TerraformUserConfig(
+            header=head, iam=iam, vpc_header=vpc_vpn_head, account_services=acc_servs
+        )
 
-    validate_iam(tuc, iam)
-    validate_unique_vpc_vpn_octet_assigments(tuc)
+    with span("validate_user_config"):
+        validate_iam(tuc, iam)
+        validate_unique_vpc_vpn_octet_assigments(tuc)
 
     return tuc
 
 
+def load_terraform_user_config(
+    config_dir_path: str, tf_modules_dir: str, use_cache: bool = True
+) -> TerraformUserConfig:
+    """Loads the `TerraformUserConfig` model for later use in configuration processes.
+
+    Validated models are cached under the Terraform `.config` directory, keyed on a
+    digest of the user configuration files, so repeat loads with unchanged inputs
+    skip YAML parsing and validation.
+
+    Args:
+        config_dir_path (str): Absolute path to user-configurations directory
+        tf_modules_dir (str): Absolute path to Terraform modules directory
+        use_cache (bool, default=True): Whether to read and write the config cache
+
+    Returns:
+        (TerraformUserConfig): Instantiated `TerraformUserConfig` model
+    """
+    with span("load_user_config") as load_span:
+        if not use_cache:
+            load_span.set(cache="disabled")
+            return parse_terraform_user_config(config_dir_path, tf_modules_dir)
+
+        cache_path = get_user_config_cache_path(tf_modules_dir)
+        cache_key = get_user_config_cache_key(config_dir_path, tf_modules_dir)
+        tuc = read_cached_user_config(cache_path, cache_key)
+        load_span.set(cache="miss" if tuc is None else "hit")
+        if tuc is None:
+            tuc = parse_terraform_user_config(config_dir_path, tf_modules_dir)
+            write_cached_user_config(cache_path, cache_key, tuc)
+        return tuc
+
+
+@traced("generate_backend_tfvars")
+def generate_backend_tfvars(
+    config_dir_path: str, tf_modules_dir: str, backend_tf_dir: str
+) -> None:
+    """Generates a terraform.tfvars file in the Terraform backend dir that defines
+    Terraform variables for the state backend.
+
+    Args:
+        config_dir_path (str): Absolute path to user-configurations directory
+        tf_modules_dir (str): Absolute path to Terraform modules directory
+        backend_tf_dir (str): Path to backend Terraform dir
+    """
+    tuc = load_terraform_user_config(config_dir_path, tf_modules_dir)
+
+    template = get_template(f"{TEMPLATES_PREFIX}/backend/backend_tfvars.txt")
+    content = template.render(
+        profile=tuc.header.aws_profiles.backend.profile,
+        region=tuc.header.aws_profiles.backend.region,
+        bucket_name=tuc.header.backend.bucket_name,
+        table_name=tuc.header.backend.dynamodb_table_name,
+    )
+    output_path = path.join(backend_tf_dir, "terraform.tfvars")
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+@traced("generate_org_accounts_config")
 def generate_org_accounts_config(
     config_dir_path: str,
     tf_modules_dir: str,
@@ -393,8 +537,7 @@ def generate_org_accounts_config(
     with open(org_json_path, "w") as f:
         json.dump(accounts_config, f, indent=4)
 
-    environment = Environment(loader=FileSystemLoader(path.join(TEMPLATES_DIR, "org")))
-    template = environment.get_template("org_tf_vars.txt")
+    template = get_template(f"{TEMPLATES_PREFIX}/org/org_tf_vars.txt")
     content = template.render(
         aws_profile_name=tuc.header.aws_profiles.identity_center.profile,
         aws_region=tuc.header.aws_profiles.identity_center.region,
@@ -412,18 +555,12 @@ def get_org_accounts_info(org_output_path: str) -> AccountsList:
         org_output_path (str): Path to Terraform org_output.json file.
 
     Returns:
-        (List[Account]): List of instantiated Account models
+        (AccountsList): Accounts, indexed on account name; see `load_org_outputs`
     """
-    quiet_dict = quiet_terraform_output_json(org_output_path)
-    accounts_info = rearrange_quiet_terraform_output_dict(quiet_dict)
-    accounts = []
-    for name, info in accounts_info.items():
-        info["name"] = name
-        accounts.append(Account(**info))
-
-    return AccountsList(accounts=accounts)
+    return load_org_outputs(org_output_path)
 
 
+@traced("generate_initial_iam_inputs")
 def generate_initial_iam_inputs(
     config_dir_path: str,
     tf_modules_dir: str,
@@ -483,6 +620,7 @@ def generate_initial_iam_inputs(
         json.dump(iam_config, f, indent=4)
 
 
+@traced("generate_terrafrom_initial_iam_configs")
 def generate_terrafrom_initial_iam_configs(
     config_dir_path: str,
     tf_modules_dir: str,
@@ -505,14 +643,12 @@ def generate_terrafrom_initial_iam_configs(
         config_dir_path=config_dir_path, tf_modules_dir=tf_modules_dir
     )
 
-    environment = Environment(loader=FileSystemLoader(path.join(TEMPLATES_DIR, "iam")))
-
     # Get relative path from `iam_root_path` to `iam_module_path` b/c Terraform
     # does not allow absolute paths to sources in module blocks
     rel_path = path.relpath(iam_module_path, initial_iam_terraform_dir)
 
     # Write main.tf file
-    template = environment.get_template("iam_main_tf.txt")
+    template = get_template(f"{TEMPLATES_PREFIX}/iam/iam_main_tf.txt")
     init_iam_params = InitIamParam(
         profile=tuc.header.aws_profiles.identity_center.profile,
         region=tuc.header.aws_profiles.identity_center.region,
@@ -524,14 +660,14 @@ def generate_terrafrom_initial_iam_configs(
         f.write(content)
 
     # Write variables.tf
-    template = environment.get_template("iam_variables_tf.txt")
+    template = get_template(f"{TEMPLATES_PREFIX}/iam/iam_variables_tf.txt")
     content = template.render()
     init_iam_vars_path = path.join(initial_iam_terraform_dir, "variables.tf")
     with open(init_iam_vars_path, "w", encoding="utf-8") as f:
         f.write(content)
 
     # Write output.tf
-    template = environment.get_template("iam_output_tf.txt")
+    template = get_template(f"{TEMPLATES_PREFIX}/iam/iam_output_tf.txt")
     content = template.render()
     init_iam_out_path = path.join(initial_iam_terraform_dir, "output.tf")
     with open(init_iam_out_path, "w", encoding="utf-8") as f:
@@ -539,28 +675,169 @@ def generate_terrafrom_initial_iam_configs(
 
 
 def get_review_build_emails_in_account(
-    iam_inputs_path: str, account: Account
+    access: AccessIndex, account: Account
 ) -> List[str]:
     """Fetches a list of user emails to be added to 'reviewer' subscription list.
 
     Args:
-        iam_inputs_path (str): JSON file generated by the `generate_initial_iam_inputs`
-            method
+        access (AccessIndex): Index of the users with access to each account, from
+            `build_access_index`
         account (Account): An `Account` object pulled from the JSON file generated by
             the `get_org_accounts_info` method
 
     Returns:
-        (List[str]): List of email addresses
+        (List[str]): Sorted email addresses of the users granted access to the account
+            through a developer or admin group
+    """
+    return access.get_reviewer_emails(account.name)
+
+
+def get_account_config_slice(
+    tuc: TerraformUserConfig, account_name: str, access: Optional[AccessIndex] = None
+) -> dict:
+    """Collects the parts of a user configuration an individual account's root module
+    depends on, so config changes can be mapped to the accounts they affect.
+
+    Users are included if any of their groups grants access to the account through
+    `iam.group_accounts`.
+
+    Args:
+        tuc (TerraformUserConfig): Instantiated `TerraformUserConfig` model
+        account_name (str): Account name
+        access (AccessIndex, optional): Index of the users with access to each
+            account, built from `tuc` if not given
+
+    Returns:
+        (dict): JSON-serializable config slice, keyed on config section
+    """
+    if access is None:
+        access = build_access_index(tuc.iam)
+    try:
+        services = tuc.get_services_for_account(account_name)
+    except ValueError:
+        services = []
+    users = {
+        x.user_name: x.model_dump(mode="json") for x in access.get_users(account_name)
+    }
+    return {
+        "header": tuc.header.model_dump(
+            mode="json", include={"org_prefix", "org_name", "org_alias", "aws_profiles"}
+        ),
+        "vpc_header": tuc.vpc_header.model_dump(mode="json"),
+        "services": [x.model_dump(mode="json") for x in services],
+        "users": users,
+        "reviewers": access.get_reviewer_emails(account_name),
+    }
+
+
+def get_account_module_templates(
+    tuc: TerraformUserConfig, acc: Account, access: AccessIndex
+) -> Dict[str, Tuple[str, dict]]:
+    """Collects the templates, and the variables they are rendered with, that make up
+    an individual account's root Terraform module.
+
+    Args:
+        tuc (TerraformUserConfig): Instantiated `TerraformUserConfig` model
+        acc (Account): An `Account` object pulled from the JSON file generated by
+            the `get_org_accounts_info` method
+        access (AccessIndex): Index of the users with access to each account, from
+            `build_access_index`
+
+    Returns:
+        (Dict[str, Tuple[str, dict]]): Each key is a filename in the account's root
+            module, mapped to a (template name, template variables) pair
     """
-    emails = []
-    iam_input = json.load(open(iam_inputs_path, "r"))
-    for user in iam_input["users"]:
-        for group in user["groups"]:
-            if "developer" in group.lower() or "admin" in group.lower():
+    cicd = False
+    git_type = None
+    github = None
+    vpc = False
+    test_webapp = False
+    services = tuc.get_services_for_account(acc.name)
+    for service in services:
+        if isinstance(service, CICDConfigModel):
+            cicd = True
+            git_type = service.git
+            if git_type == "GitHub":
+                github = service.github
+        if isinstance(service, VpnVpcConfigModel):
+            vpc = True
+            vpc_config = service
+        if isinstance(service, TestWebAppConfigModel):
+            test_webapp = True
+
+    # --- Main Configs (main.tf, variables.tf, etc.) ---
+    service_flags = dict(
+        cicd=cicd,
+        git_type=git_type,
+        vpc=vpc,
+        test_webapp=test_webapp,
+    )
+    files = {
+        "main.tf": (
+            f"{TEMPLATES_PREFIX}/accounts/account_main_tf.txt",
+            dict(
+                org_main_region=tuc.header.aws_profiles.org_main.region,
+                org_main_profile=tuc.header.aws_profiles.org_main.profile,
+                id_center_region=tuc.header.aws_profiles.identity_center.region,
+                id_center_profile=tuc.header.aws_profiles.identity_center.profile,
+                **service_flags,
+            ),
+        ),
+        "variables.tf": (
+            f"{TEMPLATES_PREFIX}/accounts/account_variables_tf.txt",
+            dict(**service_flags),
+        ),
+        "output.tf": (
+            f"{TEMPLATES_PREFIX}/accounts/account_output_tf.txt",
+            dict(**service_flags),
+        ),
+    }
+
+    # --- TFVARS File ---
+    s3_git_bucket_name = f"{tuc.header.org_prefix}-{acc.name.lower()}-s3-git-bucket"
+    codeartifact_domain_name = f"{tuc.header.org_prefix}-{acc.name.lower()}-ca-domain-1"
+    codeartifact_repository_name = (
+        f"{tuc.header.org_prefix}-{acc.name.lower()}-ca-repo-1"
+    )
+    codebuild_project_name = f"{tuc.header.org_prefix}-{acc.name.lower()}-build-1"
+    emails = get_review_build_emails_in_account(access=access, account=acc)
+    files["terraform.tfvars"] = (
+        f"{TEMPLATES_PREFIX}/accounts/account_tfvars.txt",
+        dict(
+            target_accound_id=acc.account_ids,
+            s3_git_bucket_name=s3_git_bucket_name,
+            review_notification_emails=emails,
+            build_notification_emails=emails,
+            codeartifact_domain_name=codeartifact_domain_name,
+            codeartifact_repository_name=codeartifact_repository_name,
+            codebuild_project_name=codebuild_project_name,
+            vpc_cidr_block=vpc_config.vpc_cidr_block if vpc else None,
+            subnet_cidr_block=vpc_config.subnet_cidr_block if vpc else None,
+            public_subnet_cidr_block=(
+                vpc_config.public_subnet_cidr_block if vpc else None
+            ),
+            client_vpn_endpoint_client_cidr_block=(
+                vpc_config.client_cidr if vpc else None
+            ),
+            cert_common_name=tuc.vpc_header.server_certificate.common_name,
+            cert_organization=tuc.vpc_header.server_certificate.organization,
+            account_alias=acc.name,
+            github=github,
+            **service_flags,
+        ),
+    )
 
-                emails.append(user["email"])
-    emails = list(set(emails))
-    return emails
+    # --- VPN Client Certificate Generation ---
+    # Find all users who have access to this account and have vpn_access enabled
+    if vpc:
+        vpn_users = access.get_vpn_users(acc.name)
+        if vpn_users:
+            files["vpn_clients.tf"] = (
+                f"{TEMPLATES_PREFIX}/accounts/account_vpn_clients_tf.txt",
+                dict(vpn_users=vpn_users, account_alias=acc.name),
+            )
+
+    return files
 
 
 def generate_individual_terraform_account_modules(
@@ -568,166 +845,116 @@ def generate_individual_terraform_account_modules(
     tf_modules_dir: str,
     org_output_path: str,
     accounts_tf_build_dir: str,
-    iam_inputs_path: str,
     overwrite: bool = False,
-) -> None:
+    force: bool = False,
+    plugin_cache_dir: Optional[str] = None,
+) -> List[str]:
     """Generates individual root Terraform modules for each AWS account managed by the
     Organization's management account.
 
+    A manifest of each account's rendering inputs and rendered files is kept in the
+    accounts build directory. Accounts whose inputs are unchanged, and whose rendered
+    files are intact, are skipped; files whose content is unchanged are not
+    rewritten, so their mtimes are preserved.
+
     Args:
         config_dir_path (str): Absolute path to user-configurations directory
         tf_modules_dir (str): Absolute path to Terraform modules directory
         org_output_path (str): Path to Terraform org_output.json file.
         accounts_tf_build_dir (str): Path to Terraform build accounts directory
-        iam_inputs_path (str): JSON file generated by the `generate_initial_iam_inputs`
-            method
         overwrite (bool, default=False): Determines whether to overwrite a folder
             upon creation if one of the same name already exists.
+        force (bool, default=False): Re-render every account, ignoring the manifest.
+        plugin_cache_dir (str, optional): Path to the Terraform plugin cache
+            directory shared by every account root module, provisioned if missing
 
     Returns:
-        None
+        (List[str]): Accounts with changes not yet applied ("dirty" accounts)
     """
     tuc = load_terraform_user_config(
         config_dir_path=config_dir_path, tf_modules_dir=tf_modules_dir
     )
+    if plugin_cache_dir is not None:
+        provision_plugin_cache(plugin_cache_dir)
 
     accounts = get_org_accounts_info(org_output_path)
-    environment = Environment(
-        loader=FileSystemLoader(path.join(TEMPLATES_DIR, "accounts"))
-    )
+    access = build_access_index(tuc.iam)
+    manifest = load_account_modules_manifest(accounts_tf_build_dir)
+    template_digests = {}
+    changed = []
     for acc in accounts.accounts:
+        with span("render_account_module", account=acc.name) as render_span:
+            # Create account module path and ensure directory exists
+            acc_module_path = path.join(accounts_tf_build_dir, acc.name)
+            config_makedirs(acc_module_path, overwrite)
+
+            files = get_account_module_templates(tuc, acc, access)
+            for template_name, _ in files.values():
+                if template_name not in template_digests:
+                    template_digests[template_name] = sha256_digest(
+                        get_template_source(template_name)
+                    )
+            inputs_digest = json_digest(
+                {
+                    fname: [template_name, template_digests[template_name], variables]
+                    for fname, (template_name, variables) in files.items()
+                }
+            )
 
-        # Create account module path and ensure directory exists
-        acc_module_path = path.join(accounts_tf_build_dir, acc.name)
-        config_makedirs(acc_module_path, overwrite)
-
-        # --- Main Configs (main.tf, variables.tf, etc.) ---
-        cicd = False
-        git_type = None
-        github = None
-        vpc = False
-        test_webapp = False
-        services = tuc.get_services_for_account(acc.name)
-        for service in services:
-            if isinstance(service, CICDConfigModel):
-                cicd = True
-                git_type = service.git
-                if git_type == "GitHub":
-                    github = service.github
-            if isinstance(service, VpnVpcConfigModel):
-                vpc = True
-                vpc_config = service
-            if isinstance(service, TestWebAppConfigModel):
-                test_webapp = True
-
-        # Write main.tf file
-        template = environment.get_template("account_main_tf.txt")
-        content = template.render(
-            org_main_region=tuc.header.aws_profiles.org_main.region,
-            org_main_profile=tuc.header.aws_profiles.org_main.profile,
-            id_center_region=tuc.header.aws_profiles.identity_center.region,
-            id_center_profile=tuc.header.aws_profiles.identity_center.profile,
-            cicd=cicd,
-            git_type=git_type,
-            vpc=vpc,
-            test_webapp=test_webapp,
-        )
-        acc_main_path = path.join(acc_module_path, "main.tf")
-        with open(acc_main_path, "w", encoding="utf-8") as f:
-            f.write(content)
-
-        # Write variables.tf
-        template = environment.get_template("account_variables_tf.txt")
-        content = template.render(
-            cicd=cicd,
-            git_type=git_type,
-            vpc=vpc,
-            test_webapp=test_webapp,
-        )
-        acc_vars_path = path.join(acc_module_path, "variables.tf")
-        with open(acc_vars_path, "w", encoding="utf-8") as f:
-            f.write(content)
-
-        # Write output.tf
-        template = environment.get_template("account_output_tf.txt")
-        content = template.render(
-            cicd=cicd,
-            git_type=git_type,
-            vpc=vpc,
-            test_webapp=test_webapp,
-        )
-        acc_out_path = path.join(acc_module_path, "output.tf")
-        with open(acc_out_path, "w", encoding="utf-8") as f:
-            f.write(content)
-
-        # --- TFVARS File ---
-        target_accound_id = acc.account_ids
-        s3_git_bucket_name = f"{tuc.header.org_prefix}-{acc.name.lower()}-s3-git-bucket"
-        codeartifact_domain_name = (
-            f"{tuc.header.org_prefix}-{acc.name.lower()}-ca-domain-1"
-        )
-        codeartifact_repository_name = (
-            f"{tuc.header.org_prefix}-{acc.name.lower()}-ca-repo-1"
-        )
-        codebuild_project_name = f"{tuc.header.org_prefix}-{acc.name.lower()}-build-1"
-        emails = get_review_build_emails_in_account(
-            iam_inputs_path=iam_inputs_path, account=acc
-        )
-
-        # account_cidr_blocks = tuc.vpn_vpc.get_project_cidr_blocks(acc.name)
+            config_slice = get_account_config_slice(tuc, acc.name, access)
+            previous = manifest.accounts.get(acc.name)
+            if (
+                not force
+                and previous is not None
+                and previous.inputs == inputs_digest
+                and all(
+                    file_digest(path.join(acc_module_path, fname)) == digest
+                    for fname, digest in previous.outputs.items()
+                )
+            ):
+                previous.config = config_slice
+                render_span.set(skipped=True)
+                continue
 
-        template = environment.get_template("account_tfvars.txt")
-        content = template.render(
-            target_accound_id=target_accound_id,
-            s3_git_bucket_name=s3_git_bucket_name,
-            review_notification_emails=emails,
-            build_notification_emails=emails,
-            codeartifact_domain_name=codeartifact_domain_name,
-            codeartifact_repository_name=codeartifact_repository_name,
-            codebuild_project_name=codebuild_project_name,
-            vpc_cidr_block=vpc_config.vpc_cidr_block if vpc else None,
-            subnet_cidr_block=vpc_config.subnet_cidr_block if vpc else None,
-            public_subnet_cidr_block=(
-                vpc_config.public_subnet_cidr_block if vpc else None
-            ),
-            client_vpn_endpoint_client_cidr_block=(
-                vpc_config.client_cidr if vpc else None
-            ),
-            cert_common_name=tuc.vpc_header.server_certificate.common_name,
-            cert_organization=tuc.vpc_header.server_certificate.organization,
-            account_alias=acc.name,
-            cicd=cicd,
-            git_type=git_type,
-            github=github,
-            vpc=vpc,
-            test_webapp=test_webapp,
-        )
-        acc_tfvars_path = path.join(acc_module_path, "terraform.tfvars")
-        with open(acc_tfvars_path, "w", encoding="utf-8") as f:
-            f.write(content)
-
-        # --- VPN Client Certificate Generation ---
-        # Find all users who have access to this account and have vpn_access enabled
-        if vpc:
-            vpn_users = []
-            all_users = tuc.iam.users
-            for user in all_users:
-                if not user.vpn_access:
+            outputs = {}
+            modified = False
+            for fname, (template_name, variables) in files.items():
+                template = get_template(template_name)
+                content = template.render(**variables)
+                render_span.add_bytes(len(content))
+                outputs[fname] = sha256_digest(content)
+                fpath = path.join(acc_module_path, fname)
+                if file_digest(fpath) == outputs[fname]:
                     continue
-
-                # Check if any of the user's groups grant access to the current account
-                for group_name in user.groups:
-                    if acc.name in tuc.iam.group_accounts.get(group_name, []):
-                        vpn_users.append(user)
-                        break  # User is added, no need to check other groups
-
-            # Write vpn_clients.tf file
-            if vpn_users:
-                template = environment.get_template("account_vpn_clients_tf.txt")
-                content = template.render(
-                    vpn_users=vpn_users,
-                    account_alias=acc.name,
-                )
-                acc_vpn_clients_path = path.join(acc_module_path, "vpn_clients.tf")
-                with open(acc_vpn_clients_path, "w", encoding="utf-8") as f:
+                with open(fpath, "w", encoding="utf-8") as f:
                     f.write(content)
+                modified = True
+
+            # Remove previously rendered files that are no longer generated, e.g., a
+            # vpn_clients.tf file after the last VPN user lost access to the account
+            if previous is not None:
+                for fname in previous.outputs:
+                    fpath = path.join(acc_module_path, fname)
+                    if fname not in outputs and path.isfile(fpath):
+                        remove(fpath)
+                        modified = True
+
+            manifest.accounts[acc.name] = AccountModuleManifestEntry(
+                inputs=inputs_digest, outputs=outputs, config=config_slice
+            )
+            if modified:
+                changed.append(acc.name)
+
+    account_names = [x.name for x in accounts.accounts]
+    manifest.accounts = {
+        k: v for k, v in manifest.accounts.items() if k in account_names
+    }
+    manifest.applied = {k: v for k, v in manifest.applied.items() if k in account_names}
+    manifest.dirty = sorted(
+        x for x in set(manifest.dirty) | set(changed) if x in account_names
+    )
+    write_account_modules_manifest(accounts_tf_build_dir, manifest)
+
+    print(f"Accounts changed by this run: {', '.join(changed) or 'None'}")
+    print(f"Accounts pending plan/apply (dirty): {', '.join(manifest.dirty) or 'None'}")
+    return manifest.dirty
@@ -0,0 +1,145 @@
+"""Change-impact analysis of user configs.
+
+Each account's slice of the user config (see `get_account_config_slice`) is recorded
+in the account modules manifest when its root module is rendered, and promoted to
+"applied" once the account is successfully applied. Diffing the current config's
+slices against the applied ones yields the minimal set of accounts to plan/apply,
+with the reasons each one is affected; e.g., a user's `vpn_access` change only
+affects the accounts their groups map to in `iam.group_accounts`.
+"""
+
+from os import makedirs, path, replace
+from typing import List
+
+from .access import build_access_index
+from .config import get_account_config_slice, load_terraform_user_config
+from .manifest import load_account_modules_manifest
+from .models import ConfigImpact
+
+SECTION_DESCRIPTIONS = {
+    "header": "header.yaml",
+    "vpc_header": "vpc-vpn-header.yaml",
+    "services": "account services",
+    "reviewers": "review/build notification emails",
+}
+
+
+def diff_dict_keys(old: dict, new: dict) -> List[str]:
+    """Returns the sorted keys whose values differ between two dictionaries."""
+    return sorted(k for k in set(old) | set(new) if old.get(k) != new.get(k))
+
+
+def describe_slice_changes(old: dict, new: dict) -> List[str]:
+    """Describes the changes between two account config slices.
+
+    Args:
+        old (dict): Config slice as of the account's last apply
+        new (dict): Current config slice
+
+    Returns:
+        (List[str]): Human-readable reasons, empty if the slices are equal
+    """
+    reasons = []
+    for section in diff_dict_keys(old, new):
+        if section != "users":
+            desc = SECTION_DESCRIPTIONS.get(section, section)
+            old_section, new_section = old.get(section), new.get(section)
+            if isinstance(old_section, dict) and isinstance(new_section, dict):
+                keys = ", ".join(diff_dict_keys(old_section, new_section))
+                reasons.append(f"{desc} changed ({keys})")
+            else:
+                reasons.append(f"{desc} changed")
+            continue
+        old_users, new_users = old.get("users", {}), new.get("users", {})
+        for user_name in diff_dict_keys(old_users, new_users):
+            if user_name not in old_users:
+                reasons.append(f"user {user_name} gained access")
+            elif user_name not in new_users:
+                reasons.append(f"user {user_name} lost access")
+            else:
+                fields = diff_dict_keys(old_users[user_name], new_users[user_name])
+                reasons.append(f"user {user_name} changed ({', '.join(fields)})")
+    return reasons
+
+
+def analyze_config_impact(
+    config_dir_path: str, tf_modules_dir: str, accounts_tf_build_dir: str
+) -> ConfigImpact:
+    """Determines the accounts affected by user config changes since each account was
+    last successfully applied.
+
+    Args:
+        config_dir_path (str): Absolute path to user-configurations directory
+        tf_modules_dir (str): Absolute path to Terraform modules directory
+        accounts_tf_build_dir (str): Path to Terraform build accounts directory
+
+    Returns:
+        (ConfigImpact): Affected accounts with reasons, and removed accounts
+    """
+    tuc = load_terraform_user_config(config_dir_path, tf_modules_dir)
+    applied = load_account_modules_manifest(accounts_tf_build_dir).applied
+    access = build_access_index(tuc.iam)
+
+    accounts = {}
+    for acc_name in sorted(tuc.header.managed_accounts):
+        if acc_name not in applied:
+            accounts[acc_name] = ["not applied yet"]
+            continue
+        reasons = describe_slice_changes(
+            applied[acc_name], get_account_config_slice(tuc, acc_name, access)
+        )
+        if reasons:
+            accounts[acc_name] = reasons
+    removed = sorted(x for x in applied if x not in tuc.header.managed_accounts)
+    return ConfigImpact(accounts=accounts, removed=removed)
+
+
+def format_config_impact(impact: ConfigImpact) -> str:
+    """Formats a report of the accounts affected by config changes.
+
+    Args:
+        impact (ConfigImpact): Config change impact
+
+    Returns:
+        (str): Report
+    """
+    lines = []
+    for acc_name, reasons in impact.accounts.items():
+        lines.append(f"{acc_name}:")
+        lines += [f"    - {x}" for x in reasons]
+    if impact.removed:
+        lines.append(
+            f"Removed from config (destroy manually): {', '.join(impact.removed)}"
+        )
+    lines.append(
+        f"\nAffected accounts: {', '.join(impact.accounts) or 'None'} "
+        f"({len(impact.accounts)} to plan/apply)"
+    )
+    return "\n".join(lines)
+
+
+def write_account_list(list_path: str, accounts: List[str]) -> None:
+    """Atomically writes account names to a file, one per line.
+
+    Args:
+        list_path (str): Path to account list file
+        accounts (List[str]): Account names
+    """
+    makedirs(path.dirname(path.abspath(list_path)), exist_ok=True)
+    tmp_path = list_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(f"{x}\n" for x in accounts)
+    replace(tmp_path, list_path)
+
+
+def read_account_list(list_path: str) -> List[str]:
+    """Reads account names from a file written by `write_account_list`.
+
+    Args:
+        list_path (str): Path to account list file
+
+    Returns:
+        (List[str]): Account names
+    """
+    with open(list_path, "r", encoding="utf-8") as f:
+        return [x.strip() for x in f if x.strip()]
@@ -0,0 +1,85 @@
+"""Account root module manifest.
+
+Records a digest of each generated account root module's rendering inputs and of
+every file rendered into it, so unchanged accounts can be skipped on regeneration
+and downstream Terraform runs can target only "dirty" accounts.
+"""
+
+from os import path, replace
+from typing import List
+
+from .models import AccountModulesManifest
+
+MANIFEST_FILENAME = ".manifest.json"
+
+
+def get_manifest_path(accounts_tf_build_dir: str) -> str:
+    return path.join(accounts_tf_build_dir, MANIFEST_FILENAME)
+
+
+def load_account_modules_manifest(accounts_tf_build_dir: str) -> AccountModulesManifest:
+    """Loads the account root module manifest, or an empty one if none exists.
+
+    Args:
+        accounts_tf_build_dir (str): Path to Terraform build accounts directory
+
+    Returns:
+        (AccountModulesManifest): Manifest
+    """
+    manifest_path = get_manifest_path(accounts_tf_build_dir)
+    if not path.isfile(manifest_path):
+        return AccountModulesManifest()
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return AccountModulesManifest.model_validate_json(f.read())
+
+
+def write_account_modules_manifest(
+    accounts_tf_build_dir: str, manifest: AccountModulesManifest
+) -> None:
+    """Atomically writes the account root module manifest.
+
+    Args:
+        accounts_tf_build_dir (str): Path to Terraform build accounts directory
+        manifest (AccountModulesManifest): Manifest to write
+    """
+    manifest_path = get_manifest_path(accounts_tf_build_dir)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(manifest.model_dump_json(indent=4))
+    replace(tmp_path, manifest_path)
+
+
+def get_dirty_accounts(accounts_tf_build_dir: str) -> List[str]:
+    """Returns the accounts whose generated files changed since they were last
+    successfully applied.
+
+    Args:
+        accounts_tf_build_dir (str): Path to Terraform build accounts directory
+
+    Returns:
+        (List[str]): Sorted account names
+    """
+    return sorted(load_account_modules_manifest(accounts_tf_build_dir).dirty)
+
+
+def clear_dirty_accounts(accounts_tf_build_dir: str, accounts: List[str]) -> None:
+    """Marks accounts as applied, removing them from the manifest's dirty list and
+    recording the config slices they were rendered from as applied.
+
+    Args:
+        accounts_tf_build_dir (str): Path to Terraform build accounts directory
+        accounts (List[str]): Account names that were successfully applied
+    """
+    manifest = load_account_modules_manifest(accounts_tf_build_dir)
+    remaining = [x for x in manifest.dirty if x not in accounts]
+    applied = {
+        x: manifest.accounts[x].config
+        for x in accounts
+        if x in manifest.accounts and manifest.accounts[x].config
+    }
+    if remaining != manifest.dirty or any(
+        manifest.applied.get(k) != v for k, v in applied.items()
+    ):
+        manifest.dirty = remaining
+        manifest.applied.update(applied)
+        write_account_modules_manifest(accounts_tf_build_dir, manifest)
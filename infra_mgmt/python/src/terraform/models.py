@@ -1,9 +1,9 @@
 """NEW Models."""
 
-from dataclasses import dataclass
-from typing import List, Literal, Optional, Union
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 
 class AwsProfile(BaseModel):
@@ -239,19 +239,83 @@ class Account(BaseModel):
 
 
 class AccountsList(BaseModel):
+    """Accounts created by the org root module, indexed on account name"""
+
     accounts: List[Account]
+    _by_name: Dict[str, Account] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, context):
+        self._by_name = {acc.name: acc for acc in self.accounts}
+        return super().model_post_init(context)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._by_name)
 
-    def get_account_id(self, name) -> str:
-        for acc in self.accounts:
-            if acc.name == name:
-                return acc.account_ids
-        ValueError(f"Account with name {name} not found.")
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
 
-    def get_account_arn(self, name) -> str:
-        for acc in self.accounts:
-            if acc.name == name:
-                return acc.account_arns
-        ValueError(f"Account with name {name} not found.")
+    def get_account(self, name: str) -> Account:
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise ValueError(f"Account with name {name} not found.") from None
+
+    def get_account_id(self, name: str) -> str:
+        return self.get_account(name).account_ids
+
+    def get_account_arn(self, name: str) -> str:
+        return self.get_account(name).account_arns
+
+
+class IamUserOutput(BaseModel):
+    """Identity Center user created by the IAM root module"""
+
+    user_id: str
+    user_name: str
+    display_name: str
+    email: str
+
+
+class IamOutputs(BaseModel):
+    """Outputs of the IAM root module (`iam_output.json`)"""
+
+    iam_groups: Dict[str, str] = {}
+    iam_users: Dict[str, IamUserOutput] = {}
+    iam_group_memberships: Dict[str, str] = {}
+    iam_permission_sets: Dict[str, str] = {}
+    iam_policy_attachments: Dict[str, str] = {}
+    iam_account_assignments: Dict[str, str] = {}
+
+    def get_group_id(self, name: str) -> str:
+        try:
+            return self.iam_groups[name]
+        except KeyError:
+            raise ValueError(f"Group with name {name} not found.") from None
+
+    def get_user(self, user_name: str) -> IamUserOutput:
+        try:
+            return self.iam_users[user_name]
+        except KeyError:
+            raise ValueError(f"User with name {user_name} not found.") from None
+
+
+class AccountOutputs(BaseModel):
+    """Outputs of an individual account root module (`.output/<acct>.json`). Outputs
+    only present when the account has the corresponding service are optional; every
+    output is also available, untyped, in `values`."""
+
+    account_name: str
+    target_account_id: Optional[str] = None
+    s3_git_bucket_name: Optional[str] = None
+    codeartifact_domain_name: Optional[str] = None
+    codeartifact_repository_name: Optional[str] = None
+    codeartifact_region: Optional[Dict[str, Any]] = None
+    codebuild_project_name: Optional[str] = None
+    vpc_id: Optional[str] = None
+    client_vpn_endpoint_id: Optional[str] = None
+    client_vpn_cidr: Optional[str] = None
+    values: Dict[str, Any] = {}
 
 
 @dataclass
@@ -261,6 +325,186 @@ class InitIamParam:
     relative_module_path: str
 
 
+@dataclass
+class TerraformRunResult:
+    """Outcome of running a Terraform action against a single account root module"""
+
+    account: str
+    action: str
+    success: bool
+    duration: float
+    log_path: Optional[str] = None
+    failed_command: Optional[str] = None
+    plugin_cache_hits: Optional[int] = None
+    plugin_downloads: Optional[int] = None
+
+
+@dataclass
+class BackupPathScan:
+    """Files and directories discovered under a single `BACKUP_PATHS` folder, with
+    timings of their discovery and processing (archiving or hashing)"""
+
+    backup_path: str
+    entries: List[Tuple[str, str]]  # Source path, archive member name
+    discover_secs: float
+    num_files: int = 0
+    num_bytes: int = 0
+    process_secs: float = 0.0
+
+
+@dataclass
+class PurgeTarget:
+    """Files and folders removed for a single `PURGE_PATHS` entry"""
+
+    purge_path: str
+    paths: List[str]  # Existing files and folders to remove
+    num_files: int = 0
+    num_bytes: int = 0
+
+
+@dataclass
+class PipelineStageResult:
+    """Outcome of a single bootstrap pipeline stage"""
+
+    stage: str
+    status: Literal["ran", "skipped", "failed", "blocked", "stale", "current"]
+    duration: float = 0.0
+    reason: Optional[str] = None
+
+
+@dataclass
+class ConfigImpact:
+    """Accounts affected by user config changes since they were last applied"""
+
+    accounts: Dict[str, List[str]]  # Account name, reasons it is affected
+    removed: List[str]  # Applied accounts no longer in the config
+
+
+@dataclass
+class ValidationViolation:
+    """A user config rule violation"""
+
+    rule: str
+    message: str
+    severity: Literal["error", "warning"] = "error"
+
+
+@dataclass
+class ValidationReport:
+    """Every rule violation found in a user config"""
+
+    violations: List[ValidationViolation] = field(default_factory=list)
+
+    def add(
+        self,
+        rule: str,
+        message: str,
+        severity: Literal["error", "warning"] = "error",
+    ) -> None:
+        self.violations.append(ValidationViolation(rule, message, severity))
+
+    def extend(self, other: "ValidationReport") -> None:
+        self.violations += other.violations
+
+    @property
+    def errors(self) -> List[ValidationViolation]:
+        return [x for x in self.violations if x.severity == "error"]
+
+    @property
+    def warnings(self) -> List[ValidationViolation]:
+        return [x for x in self.violations if x.severity == "warning"]
+
+
+@dataclass
+class AccessIndex:
+    """Users granted access to each account, through the groups mapped to it in
+    `iam.group_accounts`, keyed on account name"""
+
+    users: Dict[str, List[User]] = field(default_factory=dict)
+    vpn_users: Dict[str, List[User]] = field(default_factory=dict)
+    reviewer_emails: Dict[str, List[str]] = field(default_factory=dict)
+
+    def get_users(self, account_name: str) -> List[User]:
+        return self.users.get(account_name, [])
+
+    def get_vpn_users(self, account_name: str) -> List[User]:
+        return self.vpn_users.get(account_name, [])
+
+    def get_reviewer_emails(self, account_name: str) -> List[str]:
+        return self.reviewer_emails.get(account_name, [])
+
+
+class PipelineState(BaseModel):
+    """Digests of each bootstrap pipeline stage's inputs as of its last successful
+    run, stored in the Terraform `.config` dir"""
+
+    stages: Dict[str, str] = {}
+
+
+class AccountModuleManifestEntry(BaseModel):
+    """Digests of an account root module's rendering inputs and rendered files, and
+    the account's user config slice it was rendered from"""
+
+    inputs: str
+    outputs: Dict[str, str] = {}
+    config: dict = {}
+
+
+class AccountModulesManifest(BaseModel):
+    """Manifest of generated account root modules, stored in the accounts build dir.
+
+    `dirty` lists accounts whose generated files changed since they were last
+    successfully applied, and `applied` holds each account's user config slice as of
+    its last successful apply.
+    """
+
+    accounts: Dict[str, AccountModuleManifestEntry] = {}
+    dirty: List[str] = []
+    applied: Dict[str, dict] = {}
+
+
+class BackupManifestEntry(BaseModel):
+    """A file or directory in a backup, with its path relative to the backup's root.
+    In incremental snapshots, file contents are stored in the backup bucket as a
+    blob keyed on `digest`"""
+
+    path: str
+    size: int = 0
+    digest: Optional[str] = None  # None for directories
+    category: Optional[str] = None
+    account: Optional[str] = None
+
+
+class BackupManifest(BaseModel):
+    """Backup manifest; the manifest of an incremental backup is its snapshot"""
+
+    timestamp: str
+    entries: List[BackupManifestEntry] = []
+
+
+class BackupIndexEntry(BaseModel):
+    """A backup in the backup bucket: either a full .zip archive or an incremental
+    snapshot manifest"""
+
+    timestamp: str
+    key: str
+    kind: Literal["archive", "snapshot"]
+    size: int = 0
+
+
+class BackupIndex(BaseModel):
+    """Time-ordered index of every backup in the backup bucket"""
+
+    entries: List[BackupIndexEntry] = []
+
+
+class LatestBackups(BaseModel):
+    """Pointer to the most recent backup of each kind"""
+
+    archive: Optional[BackupIndexEntry] = None
+    snapshot: Optional[BackupIndexEntry] = None
+
+
 class ReinitConfig(BaseModel):
     aws_profile: AwsProfile
     backup: BackupConfig
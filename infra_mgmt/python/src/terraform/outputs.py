@@ -0,0 +1,190 @@
+"""Typed readers of the Terraform output JSON files the project produces.
+
+`terraform output -json` files map each output name to its value and metadata
+(`{"<output>": {"value": ..., "type": ..., "sensitive": ...}}`). Each file is parsed
+into a typed model once, and memoized on the file's mtime and size, so repeat reads
+within a process are free until the file is rewritten:
+
+- Org outputs (`.config/org/org_output.json`): an `AccountsList` indexed on account
+  name, so account lookups are O(1)
+- IAM outputs (`.config/iam/iam_output.json`): `IamOutputs`
+- Account outputs (`.build/accounts/.output/<acct>.json`): `AccountOutputs`
+"""
+
+import json
+import threading
+from os import listdir, path, stat
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+from .models import Account, AccountOutputs, AccountsList, IamOutputs
+
+T = TypeVar("T")
+
+# Memoized models, keyed on (model kind, absolute path), along with the
+# (mtime, size) of the file they were parsed from
+_OUTPUTS_CACHE: Dict[Tuple[str, str], Tuple[Tuple[int, int], Any]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+class TerraformOutputError(Exception):
+    pass
+
+
+def clear_outputs_cache() -> None:
+    """Clears the memoized output models."""
+    with _CACHE_LOCK:
+        _OUTPUTS_CACHE.clear()
+
+
+def read_terraform_output_values(output_path: str) -> Dict[str, Any]:
+    """Reads a Terraform output JSON file, dropping each output's metadata.
+
+    Args:
+        output_path (str): Path to Terraform output JSON file
+
+    Returns:
+        (Dict[str, Any]): Output names mapped to their values
+
+    Raises:
+        TerraformOutputError: If the file does not exist or is not valid
+    """
+    if not path.isfile(output_path):
+        raise TerraformOutputError(
+            f"No Terraform outputs found at {output_path}; has the root module been "
+            "applied?"
+        )
+    try:
+        with open(output_path, "r", encoding="utf-8") as f:
+            return {k: v["value"] for k, v in json.load(f).items()}
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise TerraformOutputError(
+            f"Invalid Terraform output file {output_path}: {e}"
+        ) from e
+
+
+def _load_memoized(kind: str, output_path: str, parse: Callable[[str], T]) -> T:
+    """Parses an output file with `parse`, unless a model parsed from the file's
+    current version is memoized."""
+    key = (kind, path.abspath(output_path))
+    try:
+        st = stat(output_path)
+        version = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        version = None
+    with _CACHE_LOCK:
+        cached = _OUTPUTS_CACHE.get(key)
+    if version is not None and cached is not None and cached[0] == version:
+        return cached[1]
+    parsed = parse(output_path)
+    if version is not None:
+        with _CACHE_LOCK:
+            _OUTPUTS_CACHE[key] = (version, parsed)
+    return parsed
+
+
+def _parse_org_outputs(output_path: str) -> AccountsList:
+    values = read_terraform_output_values(output_path)
+    fields = [
+        "account_arns",
+        "account_ids",
+        "assumable_role_arns",
+        "landing_parent_ids",
+    ]
+    missing = [x for x in fields if x not in values]
+    if missing:
+        raise TerraformOutputError(
+            f"Org outputs {output_path} are missing {', '.join(missing)}"
+        )
+    try:
+        accounts = [
+            Account(name=name, **{x: values[x][name] for x in fields})
+            for name in values["account_ids"]
+        ]
+    except KeyError as e:
+        raise TerraformOutputError(
+            f"Org outputs {output_path} have no {e} for every account"
+        ) from e
+    return AccountsList(accounts=accounts)
+
+
+def load_org_outputs(org_output_path: str) -> AccountsList:
+    """Loads the accounts created by the org root module.
+
+    The returned model is shared by every caller until the file changes, so must not
+    be modified.
+
+    Args:
+        org_output_path (str): Path to Terraform org_output.json file
+
+    Returns:
+        (AccountsList): Accounts, indexed on account name
+    """
+    return _load_memoized("org", org_output_path, _parse_org_outputs)
+
+
+def _parse_iam_outputs(output_path: str) -> IamOutputs:
+    return IamOutputs(**read_terraform_output_values(output_path))
+
+
+def load_iam_outputs(iam_output_path: str) -> IamOutputs:
+    """Loads the outputs of the IAM root module.
+
+    The returned model is shared by every caller until the file changes, so must not
+    be modified.
+
+    Args:
+        iam_output_path (str): Path to Terraform iam_output.json file
+
+    Returns:
+        (IamOutputs): IAM outputs
+    """
+    return _load_memoized("iam", iam_output_path, _parse_iam_outputs)
+
+
+def get_account_output_path(acc_tf_output_dir: str, account_name: str) -> str:
+    return path.join(acc_tf_output_dir, account_name + ".json")
+
+
+def _parse_account_outputs(output_path: str) -> AccountOutputs:
+    values = read_terraform_output_values(output_path)
+    account_name = path.basename(output_path)[: -len(".json")]
+    fields = set(AccountOutputs.model_fields) - {"account_name", "values"}
+    return AccountOutputs(
+        account_name=account_name,
+        values=values,
+        **{k: v for k, v in values.items() if k in fields},
+    )
+
+
+def load_account_outputs(acc_tf_output_dir: str, account_name: str) -> AccountOutputs:
+    """Loads the outputs of an individual account root module.
+
+    The returned model is shared by every caller until the file changes, so must not
+    be modified.
+
+    Args:
+        acc_tf_output_dir (str): Path to accounts Terraform output directory
+        account_name (str): Account name
+
+    Returns:
+        (AccountOutputs): Account outputs
+    """
+    output_path = get_account_output_path(acc_tf_output_dir, account_name)
+    return _load_memoized("account", output_path, _parse_account_outputs)
+
+
+def load_all_account_outputs(acc_tf_output_dir: str) -> Dict[str, AccountOutputs]:
+    """Loads the outputs of every account root module with an output file.
+
+    Args:
+        acc_tf_output_dir (str): Path to accounts Terraform output directory
+
+    Returns:
+        (Dict[str, AccountOutputs]): Account names mapped to their outputs
+    """
+    if not path.isdir(acc_tf_output_dir):
+        return {}
+    names = sorted(
+        x[: -len(".json")] for x in listdir(acc_tf_output_dir) if x.endswith(".json")
+    )
+    return {x: load_account_outputs(acc_tf_output_dir, x) for x in names}
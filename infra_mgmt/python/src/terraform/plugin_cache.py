@@ -0,0 +1,77 @@
+"""Shared Terraform provider plugin cache.
+
+Every account root module is initialized with the same `TF_PLUGIN_CACHE_DIR`, so a
+provider version is downloaded once and then linked into each module's `.terraform`
+directory. Terraform's plugin cache is not safe for concurrent writes, so it is
+warmed by initializing a single module before the remaining modules are initialized
+in parallel.
+"""
+
+import re
+from os import environ, makedirs, path
+from typing import Dict, Optional, Tuple
+
+CURR_DIR = path.dirname(path.abspath(__file__))  # infra_mgmt/python/src/terraform
+PYTHON_DIR = path.dirname(path.dirname(CURR_DIR))  # infra_mgmt/python
+TF_DIR = path.join(path.dirname(PYTHON_DIR), "terraform")  # infra_mgmt/terraform
+
+# Kept outside `.build`, so purging build files keeps the downloaded providers
+PLUGIN_CACHE_DIR = path.join(TF_DIR, ".plugin-cache")
+
+# `terraform init` output lines of providers linked from the cache, or downloaded
+CACHE_HIT_PATTERN = re.compile(r"^- Using .* from the shared cache directory", re.M)
+DOWNLOAD_PATTERN = re.compile(r"^- Installed ", re.M)
+
+
+def provision_plugin_cache(plugin_cache_dir: str = PLUGIN_CACHE_DIR) -> str:
+    """Creates the shared plugin cache directory, if it does not exist.
+
+    Args:
+        plugin_cache_dir (str, optional): Path to plugin cache directory
+
+    Returns:
+        (str): Absolute path to plugin cache directory
+    """
+    plugin_cache_dir = path.abspath(plugin_cache_dir)
+    makedirs(plugin_cache_dir, exist_ok=True)
+    return plugin_cache_dir
+
+
+def get_plugin_cache_env(plugin_cache_dir: Optional[str]) -> Optional[Dict[str, str]]:
+    """Returns the environment Terraform is run with to use the shared plugin cache.
+
+    Terraform only links providers from the cache when the module's dependency lock
+    file already records their checksums, which is never the case for freshly
+    generated modules; `TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE` lifts that
+    restriction.
+
+    Args:
+        plugin_cache_dir (str, optional): Path to plugin cache directory
+
+    Returns:
+        (Optional[Dict[str, str]]): Environment, or None (i.e., inherit the current
+            environment) if no plugin cache is used
+    """
+    if plugin_cache_dir is None:
+        return None
+    env = dict(environ)
+    env["TF_PLUGIN_CACHE_DIR"] = path.abspath(plugin_cache_dir)
+    env["TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE"] = "true"
+    return env
+
+
+def count_plugin_cache_usage(init_log_path: str) -> Tuple[int, int]:
+    """Counts the providers a `terraform init` run linked from the shared plugin
+    cache, and those it downloaded.
+
+    Args:
+        init_log_path (str): Path to `terraform init` log file
+
+    Returns:
+        (Tuple[int, int]): Number of cache hits and of downloads
+    """
+    if not path.isfile(init_log_path):
+        return 0, 0
+    with open(init_log_path, "r", encoding="utf-8", errors="replace") as f:
+        log = f.read()
+    return len(CACHE_HIT_PATTERN.findall(log)), len(DOWNLOAD_PATTERN.findall(log))
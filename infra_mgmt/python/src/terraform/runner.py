@@ -0,0 +1,330 @@
+"""Parallel Terraform executor for individual account root modules.
+
+Replaces the serial `for dir in $(ALL_ACCOUNT_DIRS)` loops of the Makefile with a
+bounded worker pool, while keeping the same per-account log files
+(`.logs/<acct>/<acct>-<action>.log`) and output files (`.output/<acct>.json`).
+"""
+
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from os import listdir, makedirs, path, replace
+from typing import Dict, List, Optional, Tuple
+
+from ..instrumentation import span
+from .manifest import clear_dirty_accounts, get_dirty_accounts
+from .models import TerraformRunResult
+from .plugin_cache import (
+    count_plugin_cache_usage,
+    get_plugin_cache_env,
+    provision_plugin_cache,
+)
+
+ACTIONS = ["init", "reinit", "plan", "apply", "output"]
+
+# Log filename suffixes, matching those written by the original Makefile targets
+LOG_SUFFIXES = {
+    "init": "init",
+    "reinit": "init",
+    "plan": "planning",
+    "apply": "applying",
+}
+
+
+class RunnerError(Exception):
+    pass
+
+
+def list_account_dirs(accounts_tf_build_dir: str) -> List[str]:
+    """Lists the account root module directory names in the accounts build directory,
+    ignoring hidden directories such as `.output`.
+
+    Args:
+        accounts_tf_build_dir (str): Path to Terraform build accounts directory
+
+    Returns:
+        (List[str]): Sorted account directory names
+    """
+    if not path.isdir(accounts_tf_build_dir):
+        return []
+    return sorted(
+        x
+        for x in listdir(accounts_tf_build_dir)
+        if not x.startswith(".") and path.isdir(path.join(accounts_tf_build_dir, x))
+    )
+
+
+def build_terraform_commands(
+    action: str, account: str, account_dir: str, backend_hcl: Optional[str] = None
+) -> List[Tuple[str, ...]]:
+    """Builds the Terraform command(s) (excluding `output`) run for an action.
+
+    Args:
+        action (str): One of `ACTIONS`
+        account (str): Account name (i.e., account root module directory name)
+        account_dir (str): Path to account root module directory
+        backend_hcl (str, optional): Path to backend.hcl file, required for the
+            `init` and `reinit` actions
+
+    Returns:
+        (List[Tuple[str, ...]]): Commands to run in sequence
+    """
+    chdir = f"-chdir={account_dir}"
+    if action in ["init", "reinit"]:
+        if backend_hcl is None:
+            raise RunnerError(f"A backend.hcl path is required for `{action}`.")
+        command = ["terraform", chdir, "init", "-no-color", "-input=false"]
+        if action == "reinit":
+            command.append("-reconfigure")
+        command += [
+            f"-backend-config={backend_hcl}",
+            f"-backend-config=key=org/{account}/terraform.tfstate",
+        ]
+        return [tuple(command)]
+    if action == "plan":
+        return [("terraform", chdir, "plan", "-no-color", "-input=false")]
+    if action == "apply":
+        return [
+            (
+                "terraform",
+                chdir,
+                "apply",
+                "-auto-approve",
+                "-no-color",
+                "-input=false",
+            )
+        ]
+    if action == "output":
+        return []
+    raise RunnerError(f"Unknown action `{action}`, expecting one of {ACTIONS}")
+
+
+def write_terraform_output(
+    account_dir: str, output_path: str, env: Optional[Dict[str, str]] = None
+) -> bool:
+    """Writes `terraform output -json` for an account root module to a file.
+
+    The file is only replaced when Terraform succeeds, so a failed call never
+    clobbers previously fetched outputs.
+
+    Args:
+        account_dir (str): Path to account root module directory
+        output_path (str): Path to the `.output/<acct>.json` file
+        env (Dict[str, str], optional): Environment to run Terraform with
+
+    Returns:
+        (bool): True if the outputs were fetched and written
+    """
+    result = subprocess.run(
+        ("terraform", f"-chdir={account_dir}", "output", "-json"),
+        capture_output=True,
+        text=True,
+        stdin=subprocess.DEVNULL,
+        env=env,
+    )
+    if result.returncode != 0:
+        return False
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(result.stdout)
+    replace(tmp_path, output_path)
+    return True
+
+
+def run_terraform_account(
+    action: str,
+    account: str,
+    accounts_tf_build_dir: str,
+    logs_dir: str,
+    output_dir: str,
+    backend_hcl: Optional[str] = None,
+    plugin_cache_dir: Optional[str] = None,
+) -> TerraformRunResult:
+    """Runs a Terraform action against a single account root module.
+
+    Args:
+        action (str): One of `ACTIONS`
+        account (str): Account name (i.e., account root module directory name)
+        accounts_tf_build_dir (str): Path to Terraform build accounts directory
+        logs_dir (str): Path to Terraform logs directory
+        output_dir (str): Path to the accounts `.output` directory
+        backend_hcl (str, optional): Path to backend.hcl file
+        plugin_cache_dir (str, optional): Path to shared plugin cache directory
+
+    Returns:
+        (TerraformRunResult): Outcome of the run
+    """
+    start = time.monotonic()
+    account_dir = path.join(accounts_tf_build_dir, account)
+    commands = build_terraform_commands(action, account, account_dir, backend_hcl)
+    env = get_plugin_cache_env(plugin_cache_dir)
+
+    log_path = None
+    if action in LOG_SUFFIXES:
+        account_logs_dir = path.join(logs_dir, account)
+        makedirs(account_logs_dir, exist_ok=True)
+        log_path = path.join(account_logs_dir, f"{account}-{LOG_SUFFIXES[action]}.log")
+
+    def result(success: bool, failed_command: Optional[str] = None):
+        res = TerraformRunResult(
+            account=account,
+            action=action,
+            success=success,
+            duration=time.monotonic() - start,
+            log_path=log_path,
+            failed_command=failed_command,
+        )
+        if plugin_cache_dir is not None and action in ["init", "reinit"]:
+            res.plugin_cache_hits, res.plugin_downloads = count_plugin_cache_usage(
+                log_path
+            )
+        return res
+
+    if commands:
+        with open(log_path, "w", encoding="utf-8") as log:
+            for command in commands:
+                returncode = subprocess.run(
+                    command,
+                    stdout=log,
+                    stderr=subprocess.STDOUT,
+                    stdin=subprocess.DEVNULL,
+                    env=env,
+                ).returncode
+                if returncode != 0:
+                    return result(False, " ".join(command))
+
+    if action in ["reinit", "apply", "output"]:
+        makedirs(output_dir, exist_ok=True)
+        output_path = path.join(output_dir, f"{account}.json")
+        if not write_terraform_output(account_dir, output_path, env):
+            return result(False, f"terraform -chdir={account_dir} output -json")
+
+    return result(True)
+
+
+def run_terraform_accounts(
+    action: str,
+    accounts_tf_build_dir: str,
+    logs_dir: str,
+    output_dir: Optional[str] = None,
+    backend_hcl: Optional[str] = None,
+    accounts: Optional[List[str]] = None,
+    max_workers: int = 4,
+    dirty_only: bool = False,
+    plugin_cache_dir: Optional[str] = None,
+) -> List[TerraformRunResult]:
+    """Runs a Terraform action across account root modules with a bounded worker
+    pool.
+
+    Accounts successfully applied are removed from the account modules manifest's
+    dirty list.
+
+    Args:
+        action (str): One of `ACTIONS`
+        accounts_tf_build_dir (str): Path to Terraform build accounts directory
+        logs_dir (str): Path to Terraform logs directory
+        output_dir (str, optional): Path to the accounts `.output` directory,
+            defaults to `<accounts_tf_build_dir>/.output`
+        backend_hcl (str, optional): Path to backend.hcl file
+        accounts (List[str], optional): Subset of accounts to run against, defaults
+            to every account directory found
+        max_workers (int, default=4): Maximum number of concurrent Terraform runs
+        dirty_only (bool, default=False): Only run against accounts whose generated
+            files changed since they were last applied
+        plugin_cache_dir (str, optional): Path to shared plugin cache directory. When
+            given, `init`/`reinit` first initializes a single account to warm the
+            cache, then initializes the rest in parallel from the cache
+
+    Returns:
+        (List[TerraformRunResult]): Outcomes, in account name order
+    """
+    if action not in ACTIONS:
+        raise RunnerError(f"Unknown action `{action}`, expecting one of {ACTIONS}")
+    if output_dir is None:
+        output_dir = path.join(accounts_tf_build_dir, ".output")
+
+    available = list_account_dirs(accounts_tf_build_dir)
+    if accounts is None:
+        accounts = available
+    missing = [x for x in accounts if x not in available]
+    if missing:
+        raise RunnerError(
+            f"Account directory not found for: {', '.join(missing)} in "
+            f"{accounts_tf_build_dir}"
+        )
+    if dirty_only:
+        dirty = get_dirty_accounts(accounts_tf_build_dir)
+        accounts = [x for x in accounts if x in dirty]
+
+    results = []
+    if not accounts:
+        return results
+
+    def run(acc: str) -> TerraformRunResult:
+        with span(f"terraform_{action}", account=acc) as run_span:
+            res = run_terraform_account(
+                action,
+                acc,
+                accounts_tf_build_dir,
+                logs_dir,
+                output_dir,
+                backend_hcl,
+                plugin_cache_dir,
+            )
+            run_span.set(success=res.success)
+        status = "ok" if res.success else "FAILED"
+        print(f">>> {action} {res.account}: {status} ({res.duration:.1f}s)")
+        return res
+
+    remaining = accounts
+    if plugin_cache_dir is not None:
+        plugin_cache_dir = provision_plugin_cache(plugin_cache_dir)
+        if action in ["init", "reinit"]:
+            # Concurrent inits would race to download into the cache
+            results.append(run(accounts[0]))
+            remaining = accounts[1:]
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [executor.submit(run, acc) for acc in remaining]
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    if action == "apply":
+        clear_dirty_accounts(
+            accounts_tf_build_dir, [x.account for x in results if x.success]
+        )
+
+    return sorted(results, key=lambda x: x.account)
+
+
+def format_run_summary(results: List[TerraformRunResult]) -> str:
+    """Formats a pass/fail and duration summary table of Terraform runs.
+
+    Args:
+        results (List[TerraformRunResult]): Outcomes of Terraform runs
+
+    Returns:
+        (str): Summary table
+    """
+    width = max([len("Account")] + [len(x.account) for x in results])
+    lines = [
+        f"{'Account':<{width}}  {'Action':<7}  {'Status':<6}  {'Duration':>9}  Log",
+        f"{'-' * width}  {'-' * 7}  {'-' * 6}  {'-' * 9}  {'-' * 3}",
+    ]
+    for res in results:
+        status = "pass" if res.success else "FAIL"
+        lines.append(
+            f"{res.account:<{width}}  {res.action:<7}  {status:<6}  "
+            f"{res.duration:>8.1f}s  {res.log_path or ''}"
+        )
+        if res.failed_command:
+            lines.append(f"{'':<{width}}  failed: {res.failed_command}")
+    num_failed = len([x for x in results if not x.success])
+    lines.append(f"\n{len(results) - num_failed} passed, {num_failed} failed")
+    cached = [x for x in results if x.plugin_cache_hits is not None]
+    if cached:
+        lines.append(
+            f"Provider plugins: {sum(x.plugin_cache_hits for x in cached)} from "
+            f"the shared cache, {sum(x.plugin_downloads for x in cached)} downloaded"
+        )
+    return "\n".join(lines)
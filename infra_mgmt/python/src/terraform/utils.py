@@ -1,41 +1,53 @@
+import hashlib
 import json
+from os import path
+from typing import Optional, Union
 
+from pydantic import BaseModel
 
-def quiet_terraform_output_json(filepath: str) -> dict:
-    """Reads a JSON file generated by Terraform for capturing output and reduces its
-    "noise".
 
-    Args:
-        filepath (str): Path to Terraform output JSON file
+def sha256_digest(data: Union[bytes, str]) -> str:
+    """Returns the hex SHA-256 digest of bytes or (UTF-8 encoded) text."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
 
-    Returns
-        (dict): Less noisy dict
-    """
-    noisy_dict = json.load(open(filepath, "r"))
-    quiet_dict = {}
-    for k, v in noisy_dict.items():
-        quiet_dict[k] = noisy_dict[k]["value"]
 
-    return quiet_dict
+def file_digest(filepath: str) -> Optional[str]:
+    """Returns the hex SHA-256 digest of a file's contents, or None if the file does
+    not exist.
+
+    Args:
+        filepath (str): Path to file
 
+    Returns:
+        (Optional[str]): Hex digest
+    """
+    if not path.isfile(filepath):
+        return None
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
-def rearrange_quiet_terraform_output_dict(data: dict) -> dict:
-    """Rearranges dictionary keys of a "quieted" Terraform output dictionary.
 
-    WARNING: Unclear if this will work for every type of Terraform output dictionary.
+def json_digest(data) -> str:
+    """Returns a stable hex SHA-256 digest of JSON-serializable data; pydantic models
+    found in the data are serialized with `model_dump`.
 
     Args:
-        data (dict): Quiet Terraform output dictionary.
+        data: Data to digest
 
     Returns:
-        (dict): Reorganized dict
+        (str): Hex digest
     """
-    keys = list(data.keys())
-    sub_keys = list(data[keys[0]].keys())
-    new_dict = {}
-    for sk in sub_keys:
-        new_dict[sk] = {}
-        for k, v in data.items():
-            new_dict[sk][k] = v[sk]
-
-    return new_dict
+
+    def default(obj):
+        if isinstance(obj, BaseModel):
+            return obj.model_dump(mode="json")
+        raise TypeError(f"Object of type {type(obj).__name__} is not digestible")
+
+    return sha256_digest(
+        json.dumps(data, sort_keys=True, separators=(",", ":"), default=default)
+    )
@@ -0,0 +1,139 @@
+"""Cross-validation of IAM user configurations.
+
+Set indexes of the configured groups and managed accounts are built once, then every
+rule is checked in a single pass over `iam.group_accounts` and `iam.users`, so
+validation is linear in the size of the config. Every violation is collected into a
+`ValidationReport` rather than raising on the first, so a config can be fixed in
+one go; `validate_iam` (config loading) raises on a report's errors, while the
+`validate` CLI prints the whole report, warnings included.
+"""
+
+from typing import Dict
+
+from .models import HeaderConfigModel, IamConfigModel, ValidationReport
+
+RULE_DESCRIPTIONS: Dict[str, str] = {
+    "duplicate_group": "Groups listed more than once",
+    "unknown_group_accounts_group": "Groups in group <> accounts map not in groups "
+    "list",
+    "unknown_group_accounts_account": "Accounts in group <> accounts map not in "
+    "header.yaml managed accounts",
+    "duplicate_user_name": "User names defined more than once",
+    "unknown_user_group": "Groups assigned to users not in groups list",
+    "unmapped_group": "Groups granting access to no account",
+    "empty_group": "Groups with no users",
+    "schema": "Invalid config files",
+    "account_services": "Invalid account-services configs",
+    "vpc_vpn_octets": "Overlapping VPC/VPN octets",
+}
+
+
+def validate_iam_config(
+    header: HeaderConfigModel, iam: IamConfigModel
+) -> ValidationReport:
+    """Cross-checks IAM user configurations, collecting every violation.
+
+    Errors:
+        1. Group names in group <> accounts map match those in groups list
+        2. Account names in group <> accounts map match those listed in header.yaml
+        3. Group names assigned to users match those in groups list
+        4. Group names and user names are unique
+
+    Warnings:
+        5. Groups grant access to at least one account, and have at least one user
+
+    Args:
+        header (HeaderConfigModel): Instantiated `HeaderConfigModel` model
+        iam (IamConfigModel): Instantiated `IamConfigModel` model
+
+    Returns:
+        (ValidationReport): Every violation found
+    """
+    report = ValidationReport()
+
+    group_names = set()
+    for group in iam.groups:
+        if group in group_names:
+            report.add("duplicate_group", f"Group {group} is listed more than once.")
+        group_names.add(group)
+    header_acc_names = set(header.managed_accounts)
+
+    # 1. & 2. Group and account names in group <> accounts map
+    for group, group_accounts in iam.group_accounts.items():
+        if group not in group_names:
+            report.add(
+                "unknown_group_accounts_group",
+                f"Group {group} in group <> accounts map does not exist in main "
+                "groups list.",
+            )
+        for acc in group_accounts:
+            if acc not in header_acc_names:
+                report.add(
+                    "unknown_group_accounts_account",
+                    f"Account {acc} for group {group} not in managed-accounts list.",
+                )
+
+    # 3. & 4. Group names assigned to users, unique user names
+    user_names = set()
+    groups_with_users = set()
+    for user in iam.users:
+        if user.user_name in user_names:
+            report.add(
+                "duplicate_user_name",
+                f"User name {user.user_name} is defined more than once.",
+            )
+        user_names.add(user.user_name)
+        for group in user.groups:
+            if group not in group_names:
+                report.add(
+                    "unknown_user_group",
+                    f"Group {group} assigned to user {user.display_name} does not "
+                    "exist in group list.",
+                )
+            groups_with_users.add(group)
+
+    # 5. Unused groups
+    for group in sorted(group_names):
+        if not iam.group_accounts.get(group):
+            report.add(
+                "unmapped_group",
+                f"Group {group} grants access to no account.",
+                severity="warning",
+            )
+        if group not in groups_with_users:
+            report.add(
+                "empty_group", f"Group {group} has no users.", severity="warning"
+            )
+
+    return report
+
+
+def format_validation_report(report: ValidationReport, warnings: bool = True) -> str:
+    """Formats a validation report, grouping violations by rule.
+
+    Args:
+        report (ValidationReport): Validation report
+        warnings (bool, default=True): Include warnings
+
+    Returns:
+        (str): Report
+    """
+    lines = []
+    for severity, violations in [
+        ("ERROR", report.errors),
+        ("WARNING", report.warnings),
+    ]:
+        if severity == "WARNING" and not warnings:
+            continue
+        by_rule: Dict[str, list] = {}
+        for violation in violations:
+            by_rule.setdefault(violation.rule, []).append(violation)
+        for rule, rule_violations in by_rule.items():
+            desc = RULE_DESCRIPTIONS.get(rule, rule)
+            lines.append(f"{severity}: {desc} ({len(rule_violations)})")
+            lines += [f"    - {x.message}" for x in rule_violations]
+    summary = f"{len(report.errors)} error(s)"
+    if warnings:
+        summary += f", {len(report.warnings)} warning(s)"
+    lines.append(summary)
+    return "\n".join(lines)